@@ -0,0 +1,285 @@
+import subprocess
+import argparse
+import platform
+import shutil
+import json
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "src"))
+
+from Pendulum import Pendulum
+from Chain import PendulumChain
+
+import numpy as np
+import export
+import Chain
+import sim
+
+
+# This file benchmarks the hot paths of the simulator, animation and export.
+# Run `python benchmarks/bench.py --help` for its options, the results are
+# JSON, and can be compared against benchmarks/baseline.json to catch
+# regressions.
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        "baseline.json")
+
+# Initial conditions covering each kind of motion, as length, angle and
+# angular velocity. g is -9.81, so the stable equilibrium is at pi.
+CONDITIONS = {"small": (1, np.pi - 0.1, 0),
+              "separatrix": (1, 0.01, 0),
+              "rotation": (1, np.pi, 10)}
+
+
+def measure(func, repeats, number):
+    """
+    Times a function, calling it number times in a row, repeats times over.
+
+    Parameters
+    ----------
+    func : function
+        The function to time, called without any arguments.
+    repeats : int
+        The number of timings to take.
+    number : int
+        The number of calls in each timing.
+
+    Returns
+    -------
+    float
+        The fastest time of one call, in seconds. The fastest is used as
+        anything else running at the same time can only slow a call down,
+        as recommended by the timeit module.
+    """
+    func()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+
+    return float(min(timings))
+
+
+def benchRungeKutta(repeats):
+    consts = [-9.81, 1.0]
+
+    def step():
+        sim.RungeKutta(sim.dESimplePendulumAngularVelocity,
+                       sim.dESimplePendulumAngle, 0.0125, 1.0, 0.5, consts)
+
+    return {"RungeKutta step": measure(step, repeats, 2000)}
+
+
+def benchSimulate(repeats):
+    results = {}
+    for name, (length, angle, angularVelocity) in CONDITIONS.items():
+        for engine in sim.ENGINES:
+            results[f"simulatePendulum {name} {engine}"] = measure(
+                lambda: sim.simulatePendulum(
+                    Pendulum(length, angle, angularVelocity),
+                    engine = engine),
+                repeats, 3)
+
+    return results
+
+
+def benchAnimation(repeats):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    pendulum = Pendulum(1, 2, 0)
+    trajectory = sim.simulatePendulum(Pendulum(1, 2, 0))
+    fig, ax = plt.subplots(figsize = (5, 5), dpi = 150)
+    ani = sim.produceAnimation(pendulum, trajectory, fig = fig, ax = ax)
+    frames = iter(range(10 ** 9))
+
+    def frame():
+        ani.update(next(frames) % len(trajectory))
+        fig.canvas.draw()
+
+    result = {"produceAnimation frame": measure(frame, repeats, 20)}
+    plt.close(fig)
+
+    return result
+
+
+def benchExport(repeats):
+    trajectory = sim.simulatePendulum(Pendulum(1, 2, 0))
+    renderer = export.FrameRenderer(trajectory.length, trajectory.pendCoor)
+    positions = iter(np.tile(trajectory.positions, (10 ** 4, 1)))
+
+    results = {"FrameRenderer frame": measure(
+        lambda: renderer.render(*next(positions)), repeats, 100)}
+
+    ffmpegPath = shutil.which("ffmpeg")
+    if ffmpegPath is not None:
+        # Time per frame of the whole export, including encoding.
+        filename = os.path.join(os.path.dirname(BASELINE), "bench.mp4")
+        try:
+            results["exportVideo frame"] = measure(
+                lambda: export.exportVideo(trajectory, filename,
+                                           ffmpegPath = ffmpegPath),
+                repeats, 1) / len(trajectory)
+        finally:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+    return results
+
+
+def benchChain(repeats):
+    # Ten seconds of a chaotic double pendulum, alone and as an ensemble.
+    results = {}
+    for count in (1, 100):
+        results[f"simulateChains {count}"] = measure(
+            lambda: Chain.simulateChains(
+                [PendulumChain([1, 1], [2.5, 2 + 1e-3 * i])
+                 for i in range(count)], maxFrames = 800),
+            repeats, 1)
+
+    return results
+
+
+BENCHMARKS = {"rungekutta": benchRungeKutta,
+              "simulate": benchSimulate,
+              "chain": benchChain,
+              "animation": benchAnimation,
+              "export": benchExport}
+
+
+def runBenchmarks(names, repeats):
+    """
+    Runs the chosen groups of benchmarks.
+
+    Parameters
+    ----------
+    names : list of str
+        The groups to run, keys of BENCHMARKS.
+    repeats : int
+        The number of timings taken of each benchmark.
+
+    Returns
+    -------
+    report : dict
+        Details of the machine, and the seconds per call of each benchmark,
+        under "results".
+    """
+    results = {}
+    for name in names:
+        results.update(BENCHMARKS[name](repeats))
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                capture_output = True, text = True,
+                                cwd = os.path.dirname(BASELINE)).stdout
+    except OSError:
+        commit = ""
+
+    return {"python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "processor": platform.processor(),
+            "commit": commit.strip(),
+            "results": results}
+
+
+def compareResults(results, baseline, tolerance):
+    """
+    Compares results against a baseline, printing the ratio of each.
+
+    Parameters
+    ----------
+    results : dict
+        Seconds per call of each benchmark.
+    baseline : dict
+        Seconds per call of each benchmark, for the baseline.
+    tolerance : float
+        How much slower, as a fraction, a benchmark can be before it counts
+        as a regression.
+
+    Returns
+    -------
+    regressions : list of str
+        The names of the benchmarks which have regressed.
+    """
+    regressions = []
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"{name:<{width}}  {seconds * 1e6:12.2f} us  (new)")
+            continue
+
+        ratio = seconds / baseline[name]
+        regressed = ratio > 1 + tolerance
+        if regressed:
+            regressions.append(name)
+        print(f"{name:<{width}}  {seconds * 1e6:12.2f} us  {ratio:6.2f}x"
+              f"{'  REGRESSION' if regressed else ''}")
+
+    return regressions
+
+
+def main(args = None):
+    """
+    Runs the benchmarks from the command line.
+
+    Returns
+    -------
+    int
+        The exit code, one if any benchmark has regressed.
+    """
+    parser = argparse.ArgumentParser(
+        description = "Benchmarks the simulator, animation and export.")
+    parser.add_argument("-b", "--bench", nargs = "+",
+                        choices = list(BENCHMARKS), default = list(BENCHMARKS),
+                        help = "Groups of benchmarks to run, defaults to all.")
+    parser.add_argument("-r", "--repeats", type = int, default = 5,
+                        help = "Number of timings taken of each benchmark.")
+    parser.add_argument("-o", "--output", default = None,
+                        help = "File to write the results to, as JSON.")
+    parser.add_argument("-s", "--save", action = "store_true",
+                        help = "Write the results to benchmarks/baseline.json"
+                        ", making them the new baseline.")
+    parser.add_argument("-c", "--compare", nargs = "?", const = BASELINE,
+                        default = None,
+                        help = "Compare against a results file, defaults to "
+                        "benchmarks/baseline.json.")
+    parser.add_argument("-t", "--tolerance", type = float, default = 0.25,
+                        help = "Fraction slower than the baseline counted as "
+                        "a regression, defaults to 0.25.")
+    parsed = parser.parse_args(args)
+
+    report = runBenchmarks(parsed.bench, parsed.repeats)
+
+    outputs = [parsed.output] if parsed.output is not None else []
+    if parsed.save:
+        outputs.append(BASELINE)
+    for output in outputs:
+        with open(output, "w") as file:
+            json.dump(report, file, indent = 2)
+            file.write("\n")
+
+    if parsed.compare is None:
+        if len(outputs) == 0:
+            print(json.dumps(report, indent = 2))
+        return 0
+
+    with open(parsed.compare) as file:
+        baseline = json.load(file)["results"]
+    regressions = compareResults(report["results"], baseline,
+                                 parsed.tolerance)
+    if regressions:
+        print(f"{len(regressions)} benchmarks regressed by more than "
+              f"{parsed.tolerance:.0%}.")
+
+    return int(len(regressions) > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
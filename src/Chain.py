@@ -0,0 +1,374 @@
+from Pendulum import Pendulum
+
+import numpy as np
+import sim
+
+
+class PendulumChain:
+    """
+    A class representing a chain of point masses joined by rigid strings,
+    each hanging from the one before it, with the first hanging from a fixed
+    point. Two links make a double pendulum. Contains all information
+    required to simulate one, all units are SI. All numbers are numpy
+    float64, and every array holds one value for each link, starting from
+    the fixed point.
+
+    Parameters
+    ----------
+    lengths : array_like, optional
+        Length of each string, should all be positive.
+        The default is [1, 1].
+    angles : array_like, optional
+        Angle of each string, measured in the same way as Pendulum.angle,
+        in radians.
+        The default is -pi/2 for each link.
+    angularVelocities : array_like, optional
+        Angular velocity of each string.
+        The default is 0 for each link.
+    masses : array_like, optional
+        Mass of each point mass, should all be positive.
+        The default is 1 for each link.
+    pendCoor : numpy ndarray of numpy float64, optional
+        The coordinates where the first string originates from.
+        The default is np.array([0, 0], dtype = 'float64').
+    """
+
+    def __init__(
+            self,
+            lengths = (1, 1),
+            angles = None,
+            angularVelocities = None,
+            masses = None,
+            pendCoor = np.array([0, 0], dtype = 'float64')):
+
+        self.lengths = self.convertLinks(lengths, "lengths")
+        links = len(self.lengths)
+        if angles is None:
+            angles = np.full(links, -np.pi / 2)
+        if angularVelocities is None:
+            angularVelocities = np.zeros(links)
+        if masses is None:
+            masses = np.ones(links)
+
+        self.angles = self.convertLinks(angles, "angles", links)
+        self.angularVelocities = self.convertLinks(angularVelocities,
+                                                   "angularVelocities", links)
+        self.masses = self.convertLinks(masses, "masses", links)
+        self.pendCoor = Pendulum.convertArray(pendCoor)
+
+        if np.any(self.lengths <= 0):
+            raise ValueError("The length of every link must be greater than"
+                             " zero.")
+        if np.any(self.masses <= 0):
+            raise ValueError("The mass of every link must be greater than"
+                             " zero.")
+
+        self.normaliseAngles()
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def __str__(self):
+        return (f"Chain Lengths: {self.lengths}, "
+                f"Chain Angles: {self.angles}, "
+                f"Chain Angular Velocities: {self.angularVelocities}, "
+                f"Chain Masses: {self.masses}, "
+                f"Chain Coordinates: {self.pendCoor}.")
+
+    def normaliseAngles(self):
+        """
+        Maps every angle into the range -pi (exclusive) to pi (inclusive),
+        in the same way as Pendulum.normaliseAngle.
+        """
+        self.angles = self.angles - 2 * np.pi * np.ceil(
+            (self.angles - np.pi) / (2 * np.pi))
+
+    def positions(self, angles = None):
+        """
+        Finds the coordinates of every mass in the chain.
+
+        Parameters
+        ----------
+        angles : array_like, optional
+            Angles of the links, with the links along the last axis, for
+            example of shape (frames, links) for a whole simulation. If None,
+            the chain's own angles.
+            The default is None.
+
+        Returns
+        -------
+        numpy ndarray
+            The x and y coordinates of every mass, of shape angles.shape +
+            (2, ).
+        """
+        if angles is None:
+            angles = self.angles
+        angles = np.asarray(angles, dtype = np.float64)
+
+        positions = np.empty(angles.shape + (2, ))
+        positions[..., 0] = (np.cumsum(self.lengths * np.sin(angles), -1) +
+                             self.pendCoor[0])
+        positions[..., 1] = (np.cumsum(self.lengths * np.cos(angles), -1) +
+                             self.pendCoor[1])
+
+        return positions
+
+    def energy(self, angles = None, angularVelocities = None, g = -9.81):
+        """
+        Finds the total energy of the chain, which is conserved while it
+        swings.
+
+        Parameters
+        ----------
+        angles : array_like, optional
+            Angles of the links, with the links along the last axis. If None,
+            the chain's own angles.
+            The default is None.
+        angularVelocities : array_like, optional
+            Angular velocities of the links, of the same shape as angles. If
+            None, the chain's own angular velocities.
+            The default is None.
+        g : float, optional
+            The gravitational acceleration in SI units.
+            The default is -9.81.
+
+        Returns
+        -------
+        numpy ndarray of numpy float64
+            The kinetic plus potential energy, in joules.
+        """
+        if angles is None:
+            angles = self.angles
+        if angularVelocities is None:
+            angularVelocities = self.angularVelocities
+        angles = np.asarray(angles, dtype = np.float64)
+        angularVelocities = np.asarray(angularVelocities, dtype = np.float64)
+
+        # Velocity of each mass, adding up the motion of every link above it.
+        vx = np.cumsum(self.lengths * np.cos(angles) * angularVelocities, -1)
+        vy = np.cumsum(-self.lengths * np.sin(angles) * angularVelocities,
+                       -1)
+        heights = np.cumsum(self.lengths * np.cos(angles), -1)
+
+        return np.sum(self.masses * ((vx ** 2 + vy ** 2) / 2 - g * heights),
+                      -1)
+
+    @staticmethod
+    def convertLinks(ar, name, links = None):
+        """
+        Checks if the parameter ar is capable of being converted into a 1D
+        float64 numpy array, with one value for each link. If so, it will be
+        converted into such.
+
+        Parameters
+        ----------
+        ar : any
+            The variable being tested, should be a list, tuple or ndarray.
+        name : str
+            The name of the parameter, used in error messages.
+        links : int, optional
+            The number of links ar should have a value for. If None, any
+            number of at least one.
+            The default is None.
+        """
+        if not isinstance(ar, (np.ndarray, list, tuple)):
+            raise ValueError(f"{name} must be a list or numpy array, but it's "
+                             f"{type(ar)}.")
+
+        ar = np.array(ar, dtype = np.float64)
+        if ar.ndim != 1 or len(ar) == 0:
+            raise ValueError(f"{name} must be a non empty 1D array, but it "
+                             f"has shape {ar.shape}.")
+        if links is not None and len(ar) != links:
+            raise ValueError(f"{name} must have a value for each of the "
+                             f"{links} links, but it has {len(ar)}.")
+
+        return ar
+
+
+CHAIN_ENGINES = ("rk4", "rk45")
+
+
+def chainConsts(lengths, masses, g = -9.81):
+    """
+    Finds the constants of the equations of motion of chains of pendulums,
+    used by dEChain. They only depend on the chains, so they're found once
+    rather than every step.
+
+    Parameters
+    ----------
+    lengths : numpy ndarray
+        Length of each link, with the links along the last axis, for example
+        of shape (chains, links) for many chains.
+    masses : numpy ndarray
+        Mass of each link, of the same shape as lengths.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+
+    Returns
+    -------
+    consts : list
+        The coupling between each pair of links, the sum of the masses below
+        both of them times both of their lengths, of shape lengths.shape +
+        (links, ), at index 0. Then the gravitational torque on each link,
+        divided by the sine of its angle, at index 1.
+    """
+    # The total mass hanging from each link, including its own.
+    below = np.cumsum(masses[..., ::-1], -1)[..., ::-1]
+    coupling = (np.minimum(below[..., :, None], below[..., None, :]) *
+                lengths[..., :, None] * lengths[..., None, :])
+
+    return [coupling, g * below * lengths]
+
+
+def dEChain(t, state, consts):
+    """
+    The differential equation for chains of pendulums, in vector form. The
+    angular accelerations of the links depend on each other, so they're
+    found by solving the linear system M a = f, with M the mass matrix,
+    for every chain at once.
+
+    Parameters
+    ----------
+    t : float
+        The time, in seconds. Not used, as there's no driving force.
+    state : numpy ndarray
+        The angles at index 0 and the angular velocities at index 1, with
+        the links along the last axis, for example of shape (2, chains,
+        links) for many chains.
+    consts : list
+        As returned by chainConsts.
+
+    Returns
+    -------
+    numpy ndarray
+        The derivative of the state.
+    """
+    coupling, gravity = consts
+    angles, angularVelocities = state
+    differences = angles[..., :, None] - angles[..., None, :]
+
+    massMatrix = coupling * np.cos(differences)
+    forces = (-np.sum(coupling * np.sin(differences) *
+                      angularVelocities[..., None, :] ** 2, -1) -
+              gravity * np.sin(angles))
+    accelerations = np.linalg.solve(massMatrix, forces[..., None])[..., 0]
+
+    return np.array([angularVelocities, accelerations])
+
+
+def simulateChains(chains,
+                   intervalTime = 0.0125,
+                   g = -9.81,
+                   maxFrames = 2000,
+                   engine = "rk45",
+                   rtol = 1e-9,
+                   atol = 1e-12,
+                   progress = None,
+                   cancel = None):
+    """
+    Simulates the motion of chains of pendulums, see PendulumChain.
+    Every chain is advanced together, with the mass matrix of every chain
+    solved in one call each step. The motion of chains is usually chaotic,
+    so maxFrames frames are always simulated, and the default tolerances are
+    tight. Each chain is left in its final state.
+
+    Parameters
+    ----------
+    chains : list of PendulumChain class
+        The chains to simulate, all with the same number of links.
+    intervalTime : float, optional
+        The time bewteen frames, in seconds, and between steps for rk4.
+        The default is 0.0125.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    maxFrames : int, optional
+        The number of frames to simulate.
+        The default is 2000.
+    engine : str, optional
+        The integrator to use, one of CHAIN_ENGINES. rk45 takes steps of
+        whichever size keeps within the tolerances, shared by every chain,
+        and rk4 takes fixed steps with sim.RungeKuttaVector.
+        The default is "rk45".
+    rtol : float, optional
+        The relative tolerance, only used by rk45.
+        The default is 1e-9.
+    atol : float, optional
+        The absolute tolerance, only used by rk45.
+        The default is 1e-12.
+    progress : function, optional
+        Called as progress(done, count) every sim.PROGRESS_FRAMES frames.
+        The default is None.
+    cancel : threading.Event, optional
+        Checked every sim.PROGRESS_FRAMES frames, once set
+        sim.SimulationCancelled is raised.
+        The default is None.
+
+    Returns
+    -------
+    angles : numpy ndarray
+        The normalised angle of every link at every frame, of shape (number
+        of chains, frames, links).
+    angularVelocities : numpy ndarray
+        The angular velocity of every link at every frame, of the same
+        shape.
+    """
+    if len(chains) == 0 or len({len(chain) for chain in chains}) != 1:
+        raise ValueError("There must be at least one chain, and every chain "
+                         "must have the same number of links.")
+    if intervalTime > 0.1:
+        raise ValueError("Time between calculations must be "
+                         "less than or equal to 0.1 seconds, it was "
+                         f"instead {intervalTime} seconds.")
+    if maxFrames <= 0:
+        raise ValueError("Maximum number of frames must be greater than or "
+                         f"equal to zero, yet it's {maxFrames}.")
+    if engine not in CHAIN_ENGINES:
+        raise ValueError(f"engine must be one of {CHAIN_ENGINES}, yet it's "
+                         f"{engine}.")
+
+    count = int(maxFrames)
+    intervalTime = np.float64(intervalTime)
+    consts = chainConsts(np.array([chain.lengths for chain in chains]),
+                         np.array([chain.masses for chain in chains]),
+                         np.float64(g))
+    state = np.array([[chain.angles for chain in chains],
+                      [chain.angularVelocities for chain in chains]])
+
+    if engine == "rk45":
+        frames = sim.adaptiveFrames(dEChain, state, intervalTime, consts, rtol,
+                                atol)
+    else:
+        def fixedFrames(state):
+            while True:
+                # There's no driving force, so the time isn't needed.
+                state = sim.RungeKuttaVector(dEChain, 0, state, intervalTime,
+                                         consts)
+                yield state
+
+        frames = fixedFrames(state)
+
+    # Every frame, and the state after the last, which the chains are left
+    # in.
+    states = np.empty((count, ) + state.shape)
+    for i in range(count):
+        states[i] = state
+        state = next(frames)
+
+        if (i % sim.PROGRESS_FRAMES == sim.PROGRESS_FRAMES - 1 or
+                i == count - 1):
+            if cancel is not None and cancel.is_set():
+                raise sim.SimulationCancelled("Simulation cancelled after "
+                                          f"{i + 1} of {count} frames.")
+            if progress is not None:
+                progress(i + 1, count)
+
+    for i, chain in enumerate(chains):
+        chain.angles = state[0, i].copy()
+        chain.angularVelocities = state[1, i].copy()
+        chain.normaliseAngles()
+
+    return (sim.normaliseAngles(states[:, 0].swapaxes(0, 1)),
+            states[:, 1].swapaxes(0, 1).copy())
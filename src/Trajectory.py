@@ -0,0 +1,193 @@
+import numpy as np
+
+
+class Trajectory:
+    """
+    A class representing the motion of a pendulum over time. Each frame holds
+    the time, angle, angular velocity and the x and y coordinates of the
+    mass, stored in preallocated columns which grow when they run out of
+    space, all units are SI. The columns are returned as views, so reading
+    them never copies the data.
+
+    Parameters
+    ----------
+    length : numpy float64, optional
+        Length of the pendulum string, used to calculate the x and y
+        coordinates.
+        The default is 1.
+    pendCoor : numpy ndarray of numpy float64, optional
+        The coordinates where the string originates from.
+        The default is np.array([0, 0], dtype = 'float64').
+    capacity : int, optional
+        The number of frames to allocate space for up front, ideally the
+        number of frames which will be produced.
+        The default is 256.
+    """
+
+    columns = ("t", "angle", "angularVelocity", "x", "y")
+
+    def __init__(
+            self,
+            length = 1,
+            pendCoor = np.array([0, 0], dtype = 'float64'),
+            capacity = 256):
+
+        self.length = np.float64(length)
+        self.pendCoor = np.float64(pendCoor)
+        self.data = np.empty((len(self.columns), max(int(capacity), 1)))
+        self.size = 0
+        # Number of frames whose x and y coordinates have been calculated,
+        # they're only calculated when asked for, in one go.
+        self.positionsSize = 0
+        # Events found by sim.findEvents, in order of time.
+        self.events = []
+
+    @classmethod
+    def fromData(cls, data, length = 1,
+                 pendCoor = np.array([0, 0], dtype = 'float64')):
+        """
+        Creates a trajectory which uses an existing array for its columns,
+        without copying it.
+
+        Parameters
+        ----------
+        data : numpy ndarray
+            Array of shape (5, frames), holding the columns in the order given
+            by Trajectory.columns.
+        length : numpy float64, optional
+            Length of the pendulum string.
+            The default is 1.
+        pendCoor : numpy ndarray of numpy float64, optional
+            The coordinates where the string originates from.
+            The default is np.array([0, 0], dtype = 'float64').
+
+        Returns
+        -------
+        trajectory : Trajectory class
+            The trajectory, with one frame for each column of data.
+        """
+        if np.ndim(data) != 2 or len(data) != len(cls.columns):
+            raise ValueError(f"Data must have shape ({len(cls.columns)}, "
+                             f"frames), but it's {np.shape(data)}.")
+
+        trajectory = cls(length, pendCoor, 1)
+        trajectory.data = data
+        trajectory.size = data.shape[1]
+        trajectory.positionsSize = data.shape[1]
+
+        return trajectory
+
+    def __len__(self):
+        return self.size
+
+    def __str__(self):
+        return (f"Trajectory Frames: {self.size}, "
+                f"Trajectory Capacity: {self.capacity}.")
+
+    @property
+    def capacity(self):
+        return self.data.shape[1]
+
+    @property
+    def t(self):
+        return self.data[0, :self.size]
+
+    @property
+    def angle(self):
+        return self.data[1, :self.size]
+
+    @property
+    def angularVelocity(self):
+        return self.data[2, :self.size]
+
+    @property
+    def x(self):
+        self.updatePositions()
+        return self.data[3, :self.size]
+
+    @property
+    def y(self):
+        self.updatePositions()
+        return self.data[4, :self.size]
+
+    @property
+    def positions(self):
+        """
+        The x and y coordinates as an array of shape (frames, 2), a view of
+        the x and y columns.
+        """
+        self.updatePositions()
+        return self.data[3:5, :self.size].T
+
+    def reserve(self, capacity):
+        """
+        Makes sure there is space for at least capacity frames, reallocating
+        the columns if there isn't.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of frames which need to fit.
+        """
+        if capacity > self.capacity:
+            data = np.empty((len(self.columns), int(capacity)))
+            data[:, :self.size] = self.data[:, :self.size]
+            self.data = data
+
+    def append(self, t, angle, angularVelocity):
+        """
+        Adds one frame to the end of the trajectory, doubling the capacity if
+        it's full.
+
+        Parameters
+        ----------
+        t : float
+            The time of the frame, in seconds.
+        angle : float
+            The angle of the pendulum, in radians.
+        angularVelocity : float
+            The angular velocity of the pendulum.
+        """
+        if self.size == self.capacity:
+            self.reserve(2 * self.capacity)
+
+        self.data[0, self.size] = t
+        self.data[1, self.size] = angle
+        self.data[2, self.size] = angularVelocity
+        self.size += 1
+
+    def extend(self, t, angle, angularVelocity):
+        """
+        Adds many frames to the end of the trajectory at once.
+
+        Parameters
+        ----------
+        t : array_like
+            The times of the frames, in seconds.
+        angle : array_like
+            The angles of the pendulum, in radians.
+        angularVelocity : array_like
+            The angular velocities of the pendulum.
+        """
+        t = np.float64(t)
+        end = self.size + len(t)
+        self.reserve(max(end, 2 * self.capacity) if end > self.capacity
+                     else end)
+
+        self.data[0, self.size:end] = t
+        self.data[1, self.size:end] = angle
+        self.data[2, self.size:end] = angularVelocity
+        self.size = end
+
+    def updatePositions(self):
+        """
+        Calculates the x and y coordinates of any frames which have been
+        added since the last time they were calculated.
+        """
+        if self.positionsSize < self.size:
+            angle = self.data[1, self.positionsSize:self.size]
+            self.data[3, self.positionsSize:self.size] = (
+                self.length * np.sin(angle) + self.pendCoor[0])
+            self.data[4, self.positionsSize:self.size] = (
+                self.length * np.cos(angle) + self.pendCoor[1])
+            self.positionsSize = self.size
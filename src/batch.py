@@ -0,0 +1,298 @@
+from Pendulum import Pendulum
+
+import multiprocessing
+import argparse
+import storage
+import json
+import csv
+import sim
+import os
+import re
+import sys
+
+
+# This file contains a headless command line interface, which simulates
+# every pendulum in a CSV or JSONL file, without needing PyQt5 or a
+# matplotlib GUI backend. Run `python src/batch.py --help` for its options.
+
+# Every field a configuration can have, with its default.
+FIELDS = {"name": "",
+          "length": 1.0,
+          "angle": -1.5707963267948966,
+          "angularVelocity": 0.0,
+          "x": 0.0,
+          "y": 0.0,
+          "g": -9.81,
+          "intervalTime": 0.0125,
+          "maxFrames": 2000,
+          "engine": "rk4"}
+RESULT_FIELDS = ("index", "name", "period", "energy", "frames", "trajectory",
+                 "error")
+
+
+def readConfigs(filename):
+    """
+    Reads the pendulum configurations from a CSV file, with a header row, or
+    a JSONL file, with one JSON object per line. Any field which is missing
+    or empty takes its default from FIELDS. No two configurations may save
+    their trajectories to the same file, see trajectoryName.
+
+    Parameters
+    ----------
+    filename : str
+        The file to read, JSONL if it ends in .jsonl or .json, otherwise CSV.
+
+    Returns
+    -------
+    configs : list of dict
+        The configurations, in the order they appear in the file.
+    """
+    with open(filename, newline = "") as file:
+        if filename.endswith((".jsonl", ".json")):
+            rows = [json.loads(line) for line in file if line.strip() != ""]
+        else:
+            rows = list(csv.DictReader(file))
+
+    configs = []
+    names = {}
+    for index, row in enumerate(rows):
+        unknown = set(row) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields {sorted(unknown)}, fields must "
+                             f"be from {list(FIELDS)}.")
+
+        config = dict(FIELDS)
+        for key, value in row.items():
+            if value is not None and value != "":
+                config[key] = convertField(key, value)
+
+        # Compared without case, as some file systems ignore it.
+        name = trajectoryName(config, index).lower()
+        if name in names:
+            raise ValueError(f"Configurations {names[name]} and {index} "
+                             "would both save their trajectory to "
+                             f"{trajectoryName(config, index)}, names must "
+                             "be unique.")
+        names[name] = index
+        configs.append(config)
+
+    return configs
+
+
+def convertField(key, value):
+    """
+    Converts a value read from a configuration file to the type of its
+    field in FIELDS. Integer fields accept whole numbers written as floats,
+    such as 2000.0, but not fractional ones.
+
+    Parameters
+    ----------
+    key : str
+        The field.
+    value : any
+        The value, a string from CSV files, or any JSON value.
+
+    Returns
+    -------
+    str, int or float
+        The converted value.
+    """
+    kind = type(FIELDS[key])
+    if kind is not int:
+        return kind(value)
+
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} must be a whole number, yet it's "
+                         f"{value!r}.") from None
+    if isinstance(value, bool) or not number.is_integer():
+        raise ValueError(f"{key} must be a whole number, yet it's "
+                         f"{value!r}.")
+
+    return int(number)
+
+
+def trajectoryName(config, index):
+    """
+    The file name a configuration's trajectory is saved under, its name
+    with anything other than letters, digits, dashes, underscores and dots
+    replaced, so it can't point outside the directory, or its index if it
+    has no name.
+
+    Parameters
+    ----------
+    config : dict
+        The configuration.
+    index : int
+        The position of the configuration in the file.
+
+    Returns
+    -------
+    str
+        The file name, ending in .traj.
+    """
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", config["name"]).lstrip(".")
+
+    return f"{name or index}.traj"
+
+
+def runConfig(task):
+    """
+    Simulates one configuration, finding its period and energy, and
+    optionally saving its trajectory with storage.TrajectoryWriter.
+
+    Parameters
+    ----------
+    task : tuple
+        The index of the configuration, the configuration itself and the
+        directory to save its trajectory in, or None to not save it.
+
+    Returns
+    -------
+    result : dict
+        The fields in RESULT_FIELDS, any without a value are None. Holds an
+        error message instead of results if the configuration couldn't be
+        simulated.
+    """
+    index, config, directory = task
+    result = dict.fromkeys(RESULT_FIELDS)
+    result["index"] = index
+    result["name"] = config["name"]
+
+    try:
+        pendulum = Pendulum(config["length"], config["angle"],
+                            config["angularVelocity"],
+                            [config["x"], config["y"]])
+        result["period"] = sim.pendulumPeriod(
+            pendulum.length, pendulum.angle, pendulum.angularVelocity,
+            config["g"])
+        result["energy"] = sim.pendulumEnergy(
+            pendulum.length, pendulum.angle, pendulum.angularVelocity,
+            config["g"])
+
+        initial = Pendulum(pendulum.length, pendulum.angle,
+                           pendulum.angularVelocity, pendulum.pendCoor)
+        trajectory = sim.simulatePendulum(
+            pendulum, config["intervalTime"], config["g"],
+            config["maxFrames"], config["engine"])
+        result["frames"] = len(trajectory)
+
+        if directory is not None:
+            filename = os.path.join(directory,
+                                    trajectoryName(config, index))
+            with storage.TrajectoryWriter(
+                    filename, initial, config["g"], config["intervalTime"],
+                    config["engine"], capacity = len(trajectory)) as writer:
+                writer.write(trajectory)
+            result["trajectory"] = filename
+    except Exception as e:
+        result["error"] = str(e)
+
+    # Plain floats, so the results can be written as JSON.
+    for key in ("period", "energy"):
+        if result[key] is not None:
+            result[key] = float(result[key])
+
+    return result
+
+
+def runBatch(configs, directory = None, workers = None):
+    """
+    Simulates every configuration, in a pool of processes.
+
+    Parameters
+    ----------
+    configs : list of dict
+        The configurations, as returned by readConfigs.
+    directory : str, optional
+        The directory to save trajectories in, created if needed. If None,
+        trajectories aren't saved.
+        The default is None.
+    workers : int, optional
+        The number of processes to use, if one, everything is simulated in
+        this process. If None, the number of CPUs.
+        The default is None.
+
+    Yields
+    ------
+    result : dict
+        The result of each configuration, in the same order as configs.
+    """
+    if workers is None:
+        workers = os.cpu_count()
+    if directory is not None:
+        os.makedirs(directory, exist_ok = True)
+    tasks = [(index, config, directory)
+             for index, config in enumerate(configs)]
+
+    if workers == 1:
+        yield from map(runConfig, tasks)
+    else:
+        with multiprocessing.Pool(workers) as pool:
+            yield from pool.imap(runConfig, tasks)
+
+
+def main(args = None):
+    """
+    Runs the command line interface.
+
+    Parameters
+    ----------
+    args : list of str, optional
+        The command line arguments. If None, sys.argv is used.
+        The default is None.
+
+    Returns
+    -------
+    int
+        The exit code, one if any configuration failed.
+    """
+    parser = argparse.ArgumentParser(
+        description = "Simulates every pendulum in a CSV or JSONL file of "
+        f"configurations, with the fields {', '.join(FIELDS)}. Angles are "
+        "in radians, and all units are SI.")
+    parser.add_argument("configs", help = "CSV or JSONL file of "
+                        "configurations.")
+    parser.add_argument("-o", "--output", default = "-",
+                        help = "File to write the results to, JSONL if it "
+                        "ends in .jsonl, otherwise CSV. Defaults to standard "
+                        "output, as CSV.")
+    parser.add_argument("-t", "--trajectories", default = None,
+                        help = "Directory to save each trajectory in, as "
+                        "NAME.traj, or INDEX.traj if unnamed. Characters "
+                        "other than letters, digits, -, _ and . in names "
+                        "are replaced with _.")
+    parser.add_argument("-w", "--workers", type = int, default = None,
+                        help = "Number of processes to use. Defaults to the "
+                        "number of CPUs.")
+    parsed = parser.parse_args(args)
+
+    configs = readConfigs(parsed.configs)
+    results = runBatch(configs, parsed.trajectories, parsed.workers)
+
+    if parsed.output == "-":
+        file = sys.stdout
+    else:
+        file = open(parsed.output, "w", newline = "")
+    failed = False
+    try:
+        if parsed.output.endswith(".jsonl"):
+            for result in results:
+                file.write(json.dumps(result) + "\n")
+                failed = failed or result["error"] is not None
+        else:
+            writer = csv.DictWriter(file, RESULT_FIELDS)
+            writer.writeheader()
+            for result in results:
+                writer.writerow(result)
+                failed = failed or result["error"] is not None
+    finally:
+        if file is not sys.stdout:
+            file.close()
+
+    return int(failed)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+from collections import OrderedDict
+from Pendulum import Pendulum
+from Trajectory import Trajectory
+
+import numpy as np
+import threading
+import hashlib
+import sim
+import os
+
+
+# Part of every key, so that results saved by an older version are never
+# found. Increase it whenever a change to the simulator, Trajectory or the
+# files saved would change what's stored.
+CACHE_VERSION = 1
+
+
+class SimulationCache:
+    """
+    A class which remembers the results of simulatePendulum, so that
+    simulating the same pendulum again is instant. Results are kept in
+    memory, least recently used first to be forgotten once they take up
+    more than maxBytes, and optionally also saved to a directory, so that
+    they're remembered across sessions, where the least recently used are
+    deleted once they take up more than maxDiskBytes.
+
+    Trajectories returned by the cache are shared, so are read only. The
+    cache can be used from more than one thread at once.
+
+    Parameters
+    ----------
+    maxBytes : int, optional
+        The most memory the trajectories held in memory can take up, in
+        bytes.
+        The default is 64 * 1024 ** 2.
+    directory : str, optional
+        The directory to save trajectories to, if None they're only kept in
+        memory.
+        The default is None.
+    maxDiskBytes : int, optional
+        The most space the trajectories saved to the directory can take up,
+        in bytes.
+        The default is 1024 ** 3.
+    """
+
+    def __init__(self, maxBytes = 64 * 1024 ** 2, directory = None,
+                 maxDiskBytes = 1024 ** 3):
+        if maxBytes < 0 or maxDiskBytes < 0:
+            raise ValueError("Maximum number of bytes must be greater than or "
+                             f"equal to zero, yet it's {maxBytes} in memory "
+                             f"and {maxDiskBytes} on disk.")
+
+        self.maxBytes = maxBytes
+        self.maxDiskBytes = maxDiskBytes
+        self.directory = directory
+        self.trajectories = OrderedDict()
+        self.lock = threading.RLock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.trajectories)
+
+    def __str__(self):
+        return (f"Cache Trajectories: {len(self)}, "
+                f"Cache Bytes: {self.bytes}, "
+                f"Cache Hits: {self.hits}, "
+                f"Cache Misses: {self.misses}.")
+
+    def simulate(self, pendulum, intervalTime = 0.0125, g = -9.81,
+                 maxFrames = 2000, engine = "rk4", rtol = 1e-6, atol = 1e-9,
+                 progress = None, cancel = None):
+        """
+        Returns the trajectory simulatePendulum would, from the cache if it's
+        been simulated before. Unlike simulatePendulum, the pendulum itself
+        isn't changed. Parameters are the same as simulatePendulum, progress
+        and cancel are only used if it has to be simulated.
+
+        Returns
+        -------
+        trajectory : Trajectory class
+            The time, angle, angular velocity and x and y coordinates of the
+            pendulum at every frame, read only.
+        """
+        if not isinstance(pendulum, Pendulum):
+            raise ValueError("pendulum parameter must be a Pendulum object. "
+                             f"Yet it is {type(pendulum)}")
+
+        key = self.makeKey(pendulum, intervalTime, g, maxFrames, engine,
+                           rtol, atol)
+        trajectory = self.get(key)
+
+        if trajectory is None:
+            with self.lock:
+                self.misses += 1
+            # A copy is simulated, as simulatePendulum moves the pendulum.
+            trajectory = sim.simulatePendulum(
+                Pendulum(pendulum.length, pendulum.angle,
+                         pendulum.angularVelocity, pendulum.pendCoor),
+                intervalTime, g, maxFrames, engine, rtol, atol,
+                progress = progress, cancel = cancel)
+            self.put(key, trajectory)
+        else:
+            with self.lock:
+                self.hits += 1
+
+        return trajectory
+
+    @staticmethod
+    def makeKey(pendulum, intervalTime, g, maxFrames, engine, rtol, atol):
+        """
+        Creates the key a simulation is stored under, from everything which
+        affects its result, including CACHE_VERSION.
+
+        Returns
+        -------
+        tuple
+            The key.
+        """
+        return (CACHE_VERSION, float(pendulum.length), float(pendulum.angle),
+                float(pendulum.angularVelocity),
+                float(pendulum.pendCoor[0]), float(pendulum.pendCoor[1]),
+                float(g), float(intervalTime), int(maxFrames), str(engine),
+                float(rtol), float(atol))
+
+    def get(self, key):
+        """
+        Finds a trajectory in memory, or otherwise on disk.
+
+        Parameters
+        ----------
+        key : tuple
+            The key the trajectory was stored under.
+
+        Returns
+        -------
+        trajectory : Trajectory class or None
+            The trajectory, or None if it isn't in the cache.
+        """
+        with self.lock:
+            if key in self.trajectories:
+                self.trajectories.move_to_end(key)
+                return self.trajectories[key]
+
+        if self.directory is not None:
+            filePath = self.filePath(key)
+            try:
+                with np.load(filePath) as file:
+                    trajectory = Trajectory.fromData(
+                        file['data'], file['length'], file['pendCoor'])
+                # Marks it as recently used, so it's deleted last.
+                os.utime(filePath)
+            except (OSError, KeyError, ValueError):
+                # Missing or unreadable, either way it has to be simulated.
+                return None
+
+            self.remember(key, trajectory)
+            return trajectory
+
+        return None
+
+    def put(self, key, trajectory):
+        """
+        Stores a trajectory in memory, and on disk if there's a directory.
+
+        Parameters
+        ----------
+        key : tuple
+            The key to store the trajectory under.
+        trajectory : Trajectory class
+            The trajectory to store, will be made read only.
+        """
+        trajectory.updatePositions()
+        trajectory.data = trajectory.data[:, :len(trajectory)]
+        self.remember(key, trajectory)
+
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok = True)
+            filePath = self.filePath(key)
+            # Written under a temporary name first, so a half written file
+            # is never read.
+            tempPath = f"{filePath}.{threading.get_ident()}.tmp"
+            with open(tempPath, "wb") as file:
+                np.savez(file, data = trajectory.data,
+                         length = trajectory.length,
+                         pendCoor = trajectory.pendCoor)
+            os.replace(tempPath, filePath)
+            self.trimDirectory()
+
+    def trimDirectory(self):
+        """
+        Deletes the least recently used trajectories saved to the directory,
+        including any from older versions, until they take up no more than
+        maxDiskBytes.
+        """
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".npz"):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        # Deleted by another thread in the meantime.
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.maxDiskBytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def remember(self, key, trajectory):
+        """
+        Holds a trajectory in memory, forgetting the least recently used ones
+        until they all fit within maxBytes.
+
+        Parameters
+        ----------
+        key : tuple
+            The key to store the trajectory under.
+        trajectory : Trajectory class
+            The trajectory to hold.
+        """
+        trajectory.data.flags.writeable = False
+
+        with self.lock:
+            if key in self.trajectories:
+                self.bytes -= self.trajectories.pop(key).data.nbytes
+            if trajectory.data.nbytes > self.maxBytes:
+                return
+
+            self.trajectories[key] = trajectory
+            self.bytes += trajectory.data.nbytes
+
+            while self.bytes > self.maxBytes:
+                _, oldest = self.trajectories.popitem(last = False)
+                self.bytes -= oldest.data.nbytes
+
+    def clear(self):
+        """
+        Forgets every trajectory held in memory, those on disk are kept.
+        """
+        with self.lock:
+            self.trajectories.clear()
+            self.bytes = 0
+
+    def filePath(self, key):
+        """
+        The file a trajectory is saved to on disk, named after a hash of its
+        key.
+
+        Parameters
+        ----------
+        key : tuple
+            The key of the trajectory.
+
+        Returns
+        -------
+        str
+            The file path.
+        """
+        name = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, name + ".npz")
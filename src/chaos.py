@@ -0,0 +1,546 @@
+from Pendulum import Pendulum
+from Trajectory import Trajectory
+
+import numpy as np
+import sim
+
+
+def dEDampedPendulum(t, state, consts):
+    """
+    The differential equation for a pendulum slowed by a damping force
+    proportional to its angular velocity, in vector form:
+    d(omega)/dt = -sin(theta) * g/L - damping * omega
+
+    Parameters
+    ----------
+    t : float
+        The time, in seconds. Not used, as there's no driving force.
+    state : numpy ndarray
+        The angle at index 0 and the angular velocity at index 1, each can
+        be an array of many pendulums.
+    consts : list
+        Holds variables for g, the length of the pendulum and the damping
+        coefficient, all in SI units. g at index 0, length at index 1, and
+        damping at index 2, in 1/s.
+
+    Returns
+    -------
+    numpy ndarray
+        The derivative of the state.
+    """
+    return np.array([state[1], -np.sin(state[0]) * consts[0] / consts[1] -
+                     consts[2] * state[1]])
+
+
+def dEDrivenPendulum(t, state, consts):
+    """
+    The differential equation for a damped pendulum driven by a periodic
+    torque, in vector form:
+    d(omega)/dt = -sin(theta) * g/L - damping * omega
+                  + amplitude * cos(frequency * t)
+
+    Parameters
+    ----------
+    t : float
+        The time, in seconds.
+    state : numpy ndarray
+        The angle at index 0 and the angular velocity at index 1, each can
+        be an array of many pendulums.
+    consts : list
+        Holds variables for g, the length of the pendulum, the damping
+        coefficient, and the amplitude and angular frequency of the driving
+        torque, all in SI units. g at index 0, length at index 1, damping at
+        index 2, in 1/s, amplitude at index 3, as an angular acceleration, in
+        rad/s^2, and frequency at index 4, in rad/s. Each can be an array,
+        one for each pendulum.
+
+    Returns
+    -------
+    numpy ndarray
+        The derivative of the state.
+    """
+    return np.array([state[1], -np.sin(state[0]) * consts[0] / consts[1] -
+                     consts[2] * state[1] + consts[3] * np.cos(consts[4] * t)])
+
+
+def simulateDriven(pendulum,
+                   intervalTime = 0.0125,
+                   g = -9.81,
+                   maxFrames = 2000,
+                   damping = 0.0,
+                   amplitude = 0.0,
+                   frequency = 0.0,
+                   progress = None,
+                   cancel = None):
+    """
+    Simulates the motion of a pendulum with a damping force and a periodic
+    driving torque, see dEDrivenPendulum, using sim.RungeKuttaVector. Unlike
+    sim.simulatePendulum the motion generally isn't periodic, so maxFrames
+    frames are always simulated. The pendulum is left in its final state.
+
+    Parameters
+    ----------
+    pendulum : Pendulum class
+        The pendulum whose motion this function simulates.
+    intervalTime : float, optional
+        The time bewteen calculations, in seconds.
+        The default is 0.0125.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    maxFrames : int, optional
+        The number of frames to simulate.
+        The default is 2000.
+    damping : float, optional
+        The damping coefficient, in 1/s.
+        The default is 0.0.
+    amplitude : float, optional
+        The amplitude of the driving torque, as an angular acceleration, in
+        rad/s^2.
+        The default is 0.0.
+    frequency : float, optional
+        The angular frequency of the driving torque, in rad/s.
+        The default is 0.0.
+    progress : function, optional
+        Called as progress(done, count) every sim.PROGRESS_FRAMES frames.
+        The default is None.
+    cancel : threading.Event, optional
+        Checked every sim.PROGRESS_FRAMES frames, once set
+        sim.SimulationCancelled is raised.
+        The default is None.
+
+    Returns
+    -------
+    trajectory : Trajectory class
+        The time, angle, angular velocity and coordinates at each frame.
+    """
+    if not isinstance(pendulum, Pendulum):
+        raise ValueError("pendulum parameter must be a Pendulum object. Yet "
+                         f"it is {type(pendulum)}")
+    if intervalTime > 0.1:
+        raise ValueError("Time between calculations must be "
+                         "less than or equal to 0.1 seconds, it was "
+                         f"instead {intervalTime} seconds.")
+    if maxFrames <= 0:
+        raise ValueError("Maximum number of frames must be greater than or "
+                         f"equal to zero, yet it's {maxFrames}.")
+    if damping < 0:
+        raise ValueError("The damping coefficient can't be negative, yet "
+                         f"it's {damping}.")
+
+    count = int(maxFrames)
+    intervalTime = np.float64(intervalTime)
+    consts = [np.float64(g), pendulum.length, np.float64(damping),
+              np.float64(amplitude), np.float64(frequency)]
+
+    pendulum.normaliseAngle()
+    times = np.arange(count + 1) * intervalTime
+    states = np.empty((count + 1, 2))
+    states[0] = pendulum.angle, pendulum.angularVelocity
+    for i in range(count):
+        states[i + 1] = sim.RungeKuttaVector(dEDrivenPendulum, times[i],
+                                         states[i], intervalTime, consts)
+
+        if (i % sim.PROGRESS_FRAMES == sim.PROGRESS_FRAMES - 1 or
+                i == count - 1):
+            if cancel is not None and cancel.is_set():
+                raise sim.SimulationCancelled("Simulation cancelled after "
+                                          f"{i + 1} of {count} frames.")
+            if progress is not None:
+                progress(i + 1, count)
+
+    pendulum.angle, pendulum.angularVelocity = states[-1]
+    pendulum.normaliseAngle()
+
+    trajectory = Trajectory(pendulum.length, pendulum.pendCoor, count)
+    trajectory.extend(times[:-1], sim.normaliseAngles(states[:-1, 0]),
+                      states[:-1, 1])
+
+    return trajectory
+
+
+def poincareSection(lengths,
+                    angles,
+                    angularVelocities,
+                    frequency,
+                    g = -9.81,
+                    damping = 0.0,
+                    amplitude = 0.0,
+                    transient = 100,
+                    samples = 100,
+                    stepsPerPeriod = 128):
+    """
+    Samples the state of many driven pendulums once every period of the
+    driving torque, a Poincare section, see dEDrivenPendulum. Every pendulum
+    is stepped together with sim.RungeKuttaVector, and only the samples are
+    kept, so long runs need little memory. The step is a whole fraction of
+    the driving period, so the samples are taken exactly in phase with the
+    drive.
+
+    Parameters
+    ----------
+    lengths : array_like
+        Lengths of the pendulums, should all be positive.
+    angles : array_like
+        Initial angles of the pendulums, in radians.
+    angularVelocities : array_like
+        Initial angular velocities of the pendulums.
+    frequency : array_like
+        The angular frequency of the driving torque, in rad/s, should be
+        positive.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    damping : array_like, optional
+        The damping coefficient, in 1/s.
+        The default is 0.0.
+    amplitude : array_like, optional
+        The amplitude of the driving torque, as an angular acceleration, in
+        rad/s^2.
+        The default is 0.0.
+    transient : int, optional
+        The number of driving periods simulated before sampling, so the
+        pendulums have settled onto their long term motion.
+        The default is 100.
+    samples : int, optional
+        The number of driving periods sampled.
+        The default is 100.
+    stepsPerPeriod : int, optional
+        The number of integration steps in each driving period.
+        The default is 128.
+
+    Returns
+    -------
+    angles : numpy ndarray
+        Normalised angle of each pendulum at the end of each sampled period,
+        of shape (samples, number of pendulums).
+    angularVelocities : numpy ndarray
+        The angular velocity of each pendulum at the same times.
+    """
+    lengths, angles, angularVelocities, frequency, damping, amplitude = (
+        np.broadcast_arrays(*np.atleast_1d(
+            np.float64(lengths), np.float64(angles),
+            np.float64(angularVelocities), np.float64(frequency),
+            np.float64(damping), np.float64(amplitude))))
+    if lengths.ndim != 1:
+        raise ValueError("Pendulum parameters must be 1D, but they're "
+                         f"{lengths.ndim}D.")
+    if np.any(lengths <= 0):
+        raise ValueError("The length of a pendulum must be greater than"
+                         " zero.")
+    if np.any(frequency <= 0):
+        raise ValueError("The driving frequency must be greater than zero.")
+    if transient < 0 or samples <= 0 or stepsPerPeriod <= 0:
+        raise ValueError("transient can't be negative, and samples and "
+                         "stepsPerPeriod must be greater than zero, yet "
+                         f"they're {transient}, {samples} and "
+                         f"{stepsPerPeriod}.")
+
+    h = 2 * np.pi / frequency / stepsPerPeriod
+    consts = [np.float64(g), lengths, damping, amplitude, frequency]
+    state = np.array([angles, angularVelocities])
+    sampledAngles = np.empty((samples, len(lengths)))
+    sampledAngularVelocities = np.empty((samples, len(lengths)))
+
+    for period in range(transient + samples):
+        for step in range(stepsPerPeriod):
+            # Times are counted from the start of each period, as the drive
+            # is periodic, which stops rounding errors building up.
+            state = sim.RungeKuttaVector(dEDrivenPendulum, step * h, state, h,
+                                     consts)
+        # Keeps the angles from growing without bound, for pendulums which
+        # go round and round.
+        state[0] = sim.normaliseAngles(state[0])
+        if period >= transient:
+            sampledAngles[period - transient] = state[0]
+            sampledAngularVelocities[period - transient] = state[1]
+
+    return sampledAngles, sampledAngularVelocities
+
+
+def tangentDrivenPendulum(t, state, tangent, consts):
+    """
+    The variational equation of dEDrivenPendulum, how a small change to the
+    state, the tangent, evolves. It's the Jacobian of dEDrivenPendulum at
+    the state, multiplied by the tangent.
+
+    Parameters
+    ----------
+    t : float
+        The time, in seconds. Not used, as the driving torque doesn't depend
+        on the state.
+    state : numpy ndarray
+        The state, as for dEDrivenPendulum.
+    tangent : numpy ndarray
+        The change to the state, of the same shape.
+    consts : list
+        As for dEDrivenPendulum.
+
+    Returns
+    -------
+    numpy ndarray
+        The derivative of the tangent.
+    """
+    return np.array([tangent[1], -np.cos(state[0]) * consts[0] / consts[1] *
+                     tangent[0] - consts[2] * tangent[1]])
+
+
+# Size of the change, relative to the state, used by directionalDerivative.
+# Central differences are most accurate at around the cube root of the
+# machine epsilon.
+DIRECTIONAL_EPSILON = 1e-5
+
+
+def tangentNorms(tangent):
+    """
+    Finds the length of the tangent of each member of an ensemble, the
+    members being along axis 1, keeping the dimensions so it broadcasts
+    against the tangent.
+    """
+    axes = tuple(axis for axis in range(np.ndim(tangent)) if axis != 1)
+    return np.sqrt(np.sum(tangent ** 2, axis = axes, keepdims = True))
+
+
+def directionalDerivative(func, t, state, tangent, consts):
+    """
+    Approximates the variational equation of any differential equation, the
+    Jacobian of func at the state multiplied by the tangent, by central
+    differences along the tangent. Used for systems without a
+    tangentDrivenPendulum of their own, such as Chain.dEChain.
+
+    Parameters
+    ----------
+    func : function
+        The differential equation, func(t, state, consts).
+    t : float
+        The time, in seconds.
+    state : numpy ndarray
+        The state, with the members of an ensemble along axis 1.
+    tangent : numpy ndarray
+        The change to the state, of the same shape.
+    consts : list
+        List of constants which will be passed into func.
+
+    Returns
+    -------
+    numpy ndarray
+        The derivative of the tangent.
+    """
+    norms = tangentNorms(tangent)
+    epsilon = DIRECTIONAL_EPSILON / np.where(norms == 0, 1, norms)
+
+    return ((func(t, state + epsilon * tangent, consts) -
+             func(t, state - epsilon * tangent, consts)) / (2 * epsilon))
+
+
+def lyapunovExponents(func,
+                      states,
+                      consts,
+                      h = 0.01,
+                      steps = 10000,
+                      transient = 0,
+                      renormaliseEvery = 10,
+                      tangentFunc = None,
+                      progress = None,
+                      cancel = None):
+    """
+    Finds the largest Lyapunov exponent of many systems at once, the rate
+    at which nearby trajectories separate, positive for chaotic motion. Each
+    state is integrated with sim.RungeKuttaVector alongside a tangent, a small
+    change to it which follows the variational equation. The tangent is
+    scaled back to a length of one every renormaliseEvery steps, so it never
+    overflows, and the exponent is the average of the logarithms of its
+    growth. Unlike following two nearby trajectories, the separation never
+    gets large enough to stop being linear, or small enough to be lost to
+    rounding.
+
+    Parameters
+    ----------
+    func : function
+        The differential equation, func(t, state, consts), for example
+        dEDrivenPendulum or Chain.dEChain.
+    states : numpy ndarray
+        The initial states, with the members of the ensemble along axis 1,
+        for example of shape (2, N) for N pendulums, or (2, N, links) for N
+        chains.
+    consts : list
+        List of constants which will be passed into func, each either shared
+        or one for each member.
+    h : float or array_like, optional
+        The time step, in seconds, or one for each member, for example when
+        driven pendulums step a fixed fraction of their own driving period.
+        The default is 0.01.
+    steps : int, optional
+        The number of steps the exponents are averaged over.
+        The default is 10000.
+    transient : int, optional
+        The number of steps taken first, not counted in the exponents, so
+        the states have settled onto their long term motion and the tangents
+        have turned to the direction of fastest growth.
+        The default is 0.
+    renormaliseEvery : int, optional
+        The number of steps between each renormalisation.
+        The default is 10.
+    tangentFunc : function, optional
+        The variational equation, tangentFunc(t, state, tangent, consts),
+        for example tangentDrivenPendulum. If None, it's approximated with
+        directionalDerivative, at three times the cost.
+        The default is None.
+    progress : function, optional
+        Called as progress(done, count) every sim.PROGRESS_FRAMES steps.
+        The default is None.
+    cancel : threading.Event, optional
+        Checked every sim.PROGRESS_FRAMES steps, once set
+        sim.SimulationCancelled is raised.
+        The default is None.
+
+    Returns
+    -------
+    exponents : numpy ndarray
+        The largest Lyapunov exponent of each member, in 1/s.
+    standardErrors : numpy ndarray
+        The standard error of each exponent, from the spread of the growth
+        over each renormalisation.
+    convergence : numpy ndarray
+        How much each exponent changed over the second half of the steps,
+        large when it hasn't converged, as happens near zero, where it only
+        shrinks like log(time)/time.
+    """
+    if steps < renormaliseEvery or renormaliseEvery <= 0 or transient < 0:
+        raise ValueError("steps must be at least renormaliseEvery, which "
+                         "must be greater than zero, and transient can't be "
+                         f"negative, yet they're {steps}, {renormaliseEvery} "
+                         f"and {transient}.")
+    if tangentFunc is None:
+        def tangentFunc(t, state, tangent, consts):
+            return directionalDerivative(func, t, state, tangent, consts)
+
+    def combined(t, y, consts):
+        return np.array([func(t, y[0], consts),
+                         tangentFunc(t, y[0], y[1], consts)])
+
+    states = np.float64(states)
+    # Every tangent starts in the same direction, which only matters until
+    # it turns to the direction of fastest growth.
+    y = np.array([states, np.ones_like(states)])
+    y[1] /= tangentNorms(y[1])
+
+    # Each member's time step lines up with its own axis of the state.
+    h = np.float64(h)
+    interval = np.broadcast_to(h * renormaliseEvery, states.shape[1:2])
+    if h.ndim > 0:
+        h = h.reshape((-1, ) + (1, ) * (states.ndim - 2))
+
+    intervals = steps // renormaliseEvery
+    count = transient + intervals * renormaliseEvery
+    logSum = np.zeros(states.shape[1])
+    squareSum = np.zeros(states.shape[1])
+    halfway = np.zeros(states.shape[1])
+
+    for i in range(count):
+        y = sim.RungeKuttaVector(combined, i * h, y, h, consts)
+
+        # Steps since the transient, the growth is only counted over whole
+        # intervals after it, however many steps it was.
+        done = i + 1 - transient
+        if done <= 0:
+            if (i + 1) % renormaliseEvery == 0 or done == 0:
+                y[1] /= tangentNorms(y[1])
+        elif done % renormaliseEvery == 0:
+            norms = tangentNorms(y[1])
+            y[1] /= norms
+            growth = np.log(norms.reshape(-1)) / interval
+            logSum += growth
+            squareSum += growth ** 2
+            if done == intervals // 2 * renormaliseEvery:
+                halfway = logSum / (intervals // 2)
+
+        if (i % sim.PROGRESS_FRAMES == sim.PROGRESS_FRAMES - 1 or
+                i == count - 1):
+            if cancel is not None and cancel.is_set():
+                raise sim.SimulationCancelled("Simulation cancelled after "
+                                          f"{i + 1} of {count} steps.")
+            if progress is not None:
+                progress(i + 1, count)
+
+    exponents = logSum / intervals
+    variance = np.maximum(squareSum / intervals - exponents ** 2, 0)
+    standardErrors = np.sqrt(variance / intervals)
+    if intervals // 2 == 0:
+        halfway = exponents
+
+    return exponents, standardErrors, np.abs(exponents - halfway)
+
+
+def drivenLyapunovExponents(lengths,
+                            angles,
+                            angularVelocities,
+                            frequency,
+                            g = -9.81,
+                            damping = 0.0,
+                            amplitude = 0.0,
+                            transient = 50,
+                            periods = 200,
+                            stepsPerPeriod = 64,
+                            progress = None,
+                            cancel = None):
+    """
+    Finds the largest Lyapunov exponent of many driven pendulums at once,
+    with lyapunovExponents, for example over a grid of driving amplitudes
+    and frequencies. The parameters are given in the same way as
+    poincareSection, and broadcast together.
+
+    Parameters
+    ----------
+    lengths, angles, angularVelocities, frequency : array_like
+        As for poincareSection, frequency should be positive.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    damping, amplitude : array_like, optional
+        As for poincareSection.
+        The default is 0.0.
+    transient : int, optional
+        The number of driving periods simulated before averaging.
+        The default is 50.
+    periods : int, optional
+        The number of driving periods averaged over.
+        The default is 200.
+    stepsPerPeriod : int, optional
+        The number of integration steps in each driving period, the tangents
+        are renormalised once a period.
+        The default is 64.
+    progress : function, optional
+        Passed on to lyapunovExponents.
+        The default is None.
+    cancel : threading.Event, optional
+        Passed on to lyapunovExponents.
+        The default is None.
+
+    Returns
+    -------
+    exponents, standardErrors, convergence : numpy ndarray
+        As returned by lyapunovExponents, flattened to 1D.
+    """
+    lengths, angles, angularVelocities, frequency, damping, amplitude = (
+        np.broadcast_arrays(*np.atleast_1d(
+            np.float64(lengths), np.float64(angles),
+            np.float64(angularVelocities), np.float64(frequency),
+            np.float64(damping), np.float64(amplitude))))
+    if np.any(lengths <= 0):
+        raise ValueError("The length of a pendulum must be greater than"
+                         " zero.")
+    if np.any(frequency <= 0):
+        raise ValueError("The driving frequency must be greater than zero.")
+
+    # Each pendulum steps through its own driving period, so every one is
+    # renormalised once a period.
+    h = 2 * np.pi / frequency.reshape(-1) / stepsPerPeriod
+    consts = [np.float64(g), lengths.reshape(-1), damping.reshape(-1),
+              amplitude.reshape(-1), frequency.reshape(-1)]
+    states = np.array([angles.reshape(-1), angularVelocities.reshape(-1)])
+
+    return lyapunovExponents(
+        dEDrivenPendulum, states, consts, h, periods * stepsPerPeriod,
+        transient * stepsPerPeriod, stepsPerPeriod, tangentDrivenPendulum,
+        progress, cancel)
@@ -0,0 +1,414 @@
+from Trajectory import Trajectory
+from collections import deque
+
+import multiprocessing
+import numpy as np
+import subprocess
+import os
+
+
+# Set in each worker process by attachRenderer.
+workerState = {}
+
+
+class FrameRenderer:
+    """
+    A class which draws frames of a pendulum's motion straight into a numpy
+    RGB buffer, without going through matplotlib. The same buffer is reused
+    for every frame, and only the pixels around the string and the mass are
+    redrawn, so each frame is cheap.
+
+    Parameters
+    ----------
+    length : numpy float64
+        Length of the pendulum string.
+    pendCoor : numpy ndarray of numpy float64
+        The coordinates where the string originates from.
+    width : int, optional
+        The width of the frames, in pixels.
+        The default is 600.
+    height : int, optional
+        The height of the frames, in pixels.
+        The default is 600.
+    """
+
+    background = (255, 255, 255)
+    massColour = (0, 0, 0)
+    # Brown, as used by produceAnimation.
+    stringColour = (165, 42, 42)
+
+    def __init__(
+            self,
+            length,
+            pendCoor,
+            width = 600,
+            height = 600):
+
+        if width <= 0 or height <= 0:
+            raise ValueError("Width and height must be greater than zero, yet "
+                             f"they're {width} and {height}.")
+
+        self.width = int(width)
+        self.height = int(height)
+        self.pendCoor = np.float64(pendCoor)
+
+        # The same limits as produceAnimation, so that the pendulum is fully
+        # within the frame.
+        m = 1.2 * np.float64(length)
+        self.scale = min(self.width, self.height) / (2 * m)
+        self.massRadius = max(2.0, min(self.width, self.height) / 60)
+        self.stringWidth = max(1.0, min(self.width, self.height) / 300)
+
+        self.buffer = np.empty((self.height, self.width, 3), dtype = np.uint8)
+        self.buffer[:] = self.background
+        self.pivot = self.toPixels(self.pendCoor[0], self.pendCoor[1])
+        # Region drawn over by the previous frame, which needs clearing.
+        self.dirty = None
+
+    def toPixels(self, x, y):
+        """
+        Converts coordinates in metres into pixel coordinates, with the pivot
+        at the centre of the frame and y increasing downwards.
+
+        Returns
+        -------
+        numpy ndarray
+            The column and row of the point, as floats.
+        """
+        return np.array([self.width / 2 + (x - self.pendCoor[0]) * self.scale,
+                         self.height / 2 - (y - self.pendCoor[1]) *
+                         self.scale])
+
+    def render(self, x, y):
+        """
+        Draws one frame, with the mass at x and y.
+
+        Parameters
+        ----------
+        x : float
+            The x coordinate of the mass.
+        y : float
+            The y coordinate of the mass.
+
+        Returns
+        -------
+        buffer : numpy ndarray
+            The frame, of shape (height, width, 3) and dtype uint8. The same
+            array is returned for every frame.
+        """
+        if self.dirty is not None:
+            self.buffer[self.dirty] = self.background
+
+        mass = self.toPixels(x, y)
+        pad = self.massRadius + 1
+        left = int(max(np.floor(min(mass[0], self.pivot[0]) - pad), 0))
+        right = int(min(np.ceil(max(mass[0], self.pivot[0]) + pad),
+                        self.width))
+        top = int(max(np.floor(min(mass[1], self.pivot[1]) - pad), 0))
+        bottom = int(min(np.ceil(max(mass[1], self.pivot[1]) + pad),
+                         self.height))
+        self.dirty = (slice(top, bottom), slice(left, right))
+        if left >= right or top >= bottom:
+            return self.buffer
+
+        # Pixel centres within the region being drawn.
+        cols = np.arange(left, right) + 0.5
+        rows = (np.arange(top, bottom) + 0.5)[:, None]
+        region = self.buffer[self.dirty]
+
+        # Distance from each pixel to the string, a line segment.
+        direction = mass - self.pivot
+        lengthSquared = max(direction @ direction, 1e-12)
+        along = np.clip(((cols - self.pivot[0]) * direction[0] +
+                         (rows - self.pivot[1]) * direction[1]) /
+                        lengthSquared, 0, 1)
+        distance = np.hypot(cols - self.pivot[0] - along * direction[0],
+                            rows - self.pivot[1] - along * direction[1])
+        region[distance <= self.stringWidth / 2] = self.stringColour
+
+        # The mass is drawn on top of the string.
+        region[np.hypot(cols - mass[0], rows - mass[1]) <=
+               self.massRadius] = self.massColour
+
+        return self.buffer
+
+
+def framesPerSecond(trajectory):
+    """
+    The frame rate of a trajectory, from the time between its frames.
+
+    Parameters
+    ----------
+    trajectory : Trajectory class
+        The trajectory, should have at least two frames, otherwise 80 fps is
+        assumed, as used by the GUI.
+
+    Returns
+    -------
+    float
+        The number of frames per second.
+    """
+    if len(trajectory) < 2:
+        return 80.0
+    return float(1 / (trajectory.t[1] - trajectory.t[0]))
+
+
+def ffmpegCommand(ffmpegPath, filename, width, height, fps):
+    """
+    The command which starts ffmpeg, reading raw RGB frames from its standard
+    input and encoding them as H.264, in the same way as matplotlib's
+    FFMpegWriter.
+
+    Returns
+    -------
+    list
+        The command and its arguments.
+    """
+    return [ffmpegPath, "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-vcodec", "rawvideo", "-pix_fmt", "rgb24",
+            "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+            "-vcodec", "h264", "-pix_fmt", "yuv420p", filename]
+
+
+def exportVideo(trajectory,
+                filename,
+                fps = None,
+                width = 600,
+                height = 600,
+                ffmpegPath = None,
+                workers = 1,
+                chunkSize = 16,
+                maxBytes = 64 * 2 ** 20,
+                progress = None,
+                cancel = None):
+    """
+    Saves the motion of a pendulum as a video, by drawing each frame with a
+    FrameRenderer and piping the raw pixels straight into ffmpeg. Much faster
+    than FuncAnimation.save, as nothing is drawn through matplotlib, and it
+    can safely be run on a background thread. With more than one worker, the
+    frames are split into contiguous chunks which are drawn by a pool of
+    processes, then put back in order before being piped into ffmpeg.
+
+    Parameters
+    ----------
+    trajectory : Trajectory class
+        The motion of the pendulum, as produced by simulatePendulum.
+    filename : str
+        The file to save the video to, for example an mp4 file.
+    fps : float, optional
+        The frame rate of the video. If None, the rate the trajectory was
+        simulated at, so the video has the correct duration.
+        The default is None.
+    width : int, optional
+        The width of the video, in pixels.
+        The default is 600.
+    height : int, optional
+        The height of the video, in pixels.
+        The default is 600.
+    ffmpegPath : str, optional
+        The file path of ffmpeg. If None, the path matplotlib has been given
+        is used.
+        The default is None.
+    workers : int, optional
+        The number of processes to draw the frames with, if one, they're
+        drawn in this process. If None, the number of CPUs.
+        The default is 1.
+    chunkSize : int, optional
+        The number of frames drawn by a worker at a time.
+        The default is 16.
+    maxBytes : int, optional
+        The most bytes of drawn frames waiting to be piped into ffmpeg at
+        once, when using more than one worker, at least one chunk is always
+        allowed.
+        The default is 64 * 2 ** 20, 64MiB.
+    progress : function, optional
+        Called as progress(done, total) after each frame, or each chunk when
+        using more than one worker.
+        The default is None.
+    cancel : threading.Event, optional
+        Anything with an is_set method, checked along with progress, once set
+        the export stops and raises sim.SimulationCancelled.
+        The default is None.
+    """
+    if not isinstance(trajectory, Trajectory):
+        raise ValueError("trajectory parameter must be a Trajectory object. "
+                         f"Yet it is {type(trajectory)}")
+    if width <= 0 or height <= 0:
+        raise ValueError("Width and height must be greater than zero, yet "
+                         f"they're {width} and {height}.")
+    if chunkSize <= 0:
+        raise ValueError("Chunk size must be greater than zero, yet it's "
+                         f"{chunkSize}.")
+    if workers is None:
+        workers = os.cpu_count()
+    if fps is None:
+        fps = framesPerSecond(trajectory)
+    if ffmpegPath is None:
+        import matplotlib as mpl
+        ffmpegPath = mpl.rcParams['animation.ffmpeg_path']
+
+    settings = (trajectory.length, trajectory.pendCoor, width, height)
+    positions = trajectory.positions
+    total = len(positions)
+    if workers == 1:
+        frames = renderFrames(positions, settings)
+    else:
+        frames = renderChunks(positions, settings, workers, chunkSize,
+                              maxBytes)
+
+    process = subprocess.Popen(
+        ffmpegCommand(ffmpegPath, filename, int(width), int(height), fps),
+        stdin = subprocess.PIPE, stdout = subprocess.DEVNULL,
+        stderr = subprocess.PIPE)
+    try:
+        done = 0
+        for count, pixels in frames:
+            process.stdin.write(pixels)
+            done += count
+
+            if progress is not None:
+                progress(done, total)
+            if cancel is not None and cancel.is_set():
+                import sim
+                raise sim.SimulationCancelled(
+                    f"Export cancelled after {done} of {total} frames.")
+    except BrokenPipeError:
+        # ffmpeg has stopped early, its error is reported below.
+        pass
+    except BaseException:
+        process.kill()
+        process.wait()
+        raise
+    finally:
+        # Stops any workers which are still drawing.
+        frames.close()
+        if process.stdin is not None and not process.stdin.closed:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    error = process.stderr.read().decode(errors = "replace")
+    process.stderr.close()
+    if process.wait() != 0:
+        raise RuntimeError(f"ffmpeg failed to save {filename}: "
+                           f"{error.strip()}")
+
+
+def renderFrames(positions, settings):
+    """
+    Draws the frames one at a time in this process.
+
+    Parameters
+    ----------
+    positions : numpy ndarray
+        The x and y coordinates of the mass in each frame, of shape
+        (frames, 2).
+    settings : tuple
+        The length, pendCoor, width and height passed to FrameRenderer.
+
+    Yields
+    ------
+    count : int
+        The number of frames drawn, always one.
+    pixels : memoryview
+        The raw RGB pixels of the frame, only valid until the next frame is
+        drawn.
+    """
+    renderer = FrameRenderer(*settings)
+    for x, y in positions:
+        yield 1, renderer.render(x, y).data
+
+
+def renderChunks(positions, settings, workers, chunkSize,
+                 maxBytes = 64 * 2 ** 20):
+    """
+    Draws the frames in a pool of processes, a chunk of contiguous frames at
+    a time. Only as many chunks as fit in maxBytes are in flight at once, so
+    memory use stays bounded when ffmpeg can't keep up with the workers,
+    whatever the size of the frames. The processes are started fresh rather
+    than forked, as forking a process with other threads running, such as
+    the GUI, can deadlock.
+
+    Parameters
+    ----------
+    positions : numpy ndarray
+        The x and y coordinates of the mass in each frame, of shape
+        (frames, 2).
+    settings : tuple
+        The length, pendCoor, width and height passed to FrameRenderer.
+    workers : int
+        The number of processes to use.
+    chunkSize : int
+        The number of frames drawn by a worker at a time.
+    maxBytes : int, optional
+        The most bytes of drawn chunks in flight at once.
+        The default is 64 * 2 ** 20, 64MiB.
+
+    Yields
+    ------
+    count : int
+        The number of frames in the chunk.
+    pixels : bytes
+        The raw RGB pixels of every frame in the chunk, in order.
+    """
+    chunks = iter([positions[start:start + chunkSize]
+                   for start in range(0, len(positions), chunkSize)])
+    pending = deque()
+    width, height = settings[2:4]
+    chunkBytes = chunkSize * int(width) * int(height) * 3
+    inFlight = max(1, min(2 * workers, maxBytes // chunkBytes))
+    context = multiprocessing.get_context("spawn")
+
+    # Leaving the with statement terminates the workers, if the export stops
+    # early.
+    with context.Pool(workers, attachRenderer, (settings, )) as pool:
+        for chunk in chunks:
+            pending.append((len(chunk),
+                            pool.apply_async(renderChunk, (chunk, ))))
+            if len(pending) >= inFlight:
+                break
+
+        while pending:
+            count, result = pending.popleft()
+            pixels = result.get()
+            chunk = next(chunks, None)
+            if chunk is not None:
+                pending.append((len(chunk),
+                                pool.apply_async(renderChunk, (chunk, ))))
+            yield count, pixels
+
+
+def attachRenderer(settings):
+    """
+    Runs once in each worker process, creating the renderer it draws with.
+
+    Parameters
+    ----------
+    settings : tuple
+        The length, pendCoor, width and height passed to FrameRenderer.
+    """
+    workerState["renderer"] = FrameRenderer(*settings)
+
+
+def renderChunk(positions):
+    """
+    Draws a chunk of contiguous frames in a worker process.
+
+    Parameters
+    ----------
+    positions : numpy ndarray
+        The x and y coordinates of the mass in each frame of the chunk.
+
+    Returns
+    -------
+    bytes
+        The raw RGB pixels of every frame, one after the other.
+    """
+    renderer = workerState["renderer"]
+    frames = np.empty((len(positions), ) + renderer.buffer.shape,
+                      dtype = np.uint8)
+    for i, (x, y) in enumerate(positions):
+        frames[i] = renderer.render(x, y)
+
+    return frames.tobytes()
@@ -1,16 +1,218 @@
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-from PyQt5.QtWidgets import QMainWindow, QFileDialog
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtWidgets import QMainWindow, QFileDialog, QProgressBar
 from ui_gui import Ui_MainWindow
-from Pendulum import Pendulum
 from os import mkdir
 
-import matplotlib as mpl
-import numpy as np
+import threading
+import importlib
 import userpaths
-import sim
+import math
 
-mpl.use('Qt5Agg')
+
+# Only PyQt5 is imported up front, so that the window appears as soon as
+# possible. matplotlib, numpy and the simulation modules take far longer to
+# import, so they're imported by a PreloadJob in the background once the
+# window is shown, and where they're needed.
+
+# The most time it should take from starting python to the window being
+# shown, in seconds, checked by tests/test_gui.py.
+STARTUP_TARGET = 0.5
+# The number of processes exports draw their frames with. Kept small, as
+# each one is a fresh python process, and the window has to stay responsive.
+EXPORT_WORKERS = 2
+# The modules imported by preloadModules, those needed for simulating and
+# plotting.
+PRELOAD_MODULES = ("matplotlib.figure", "Pendulum", "cache", "export", "sim")
+
+
+def readSettings(ffmpegFilePath = ""):
+    """
+    Reads settings.ini from the user's my documents, creating it if it
+    doesn't exist.
+
+    Parameters
+    ----------
+    ffmpegFilePath : String, optional
+        If not equal to "", and the file path of ffmpeg hasn't already been
+        set, then it will be written into settings.ini.
+        The default is "".
+
+    Returns
+    -------
+    setting : str
+        The first line of settings.ini, "" if it's empty.
+    """
+    filepath = userpaths.get_my_documents() + "\\Pendulum"
+
+    # If file doesn't exsist create it.
+    try:
+        mkdir(filepath)
+    except FileExistsError:
+        pass
+
+    with open(filepath + "\\settings.ini", "a+") as file:
+        # Sets pointer to start of file.
+        file.seek(0)
+        setting = file.readline()
+
+        if ffmpegFilePath != "" and setting == "":
+            file.write("ffmpegPath = " + ffmpegFilePath)
+            setting = "ffmpegPath = " + ffmpegFilePath
+
+    return setting
+
+
+def preloadModules():
+    """
+    Imports every module in PRELOAD_MODULES, so that importing them again
+    where they're needed is instant.
+    """
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+
+class SimulationSignals(QObject):
+    """
+    Signals sent from a SimulationJob back to the GUI thread, each one
+    starting with the id of the job.
+    """
+    progress = pyqtSignal(int, int, int)
+    finished = pyqtSignal(int, object, object)
+    failed = pyqtSignal(int, str)
+
+
+class StartupSignals(QObject):
+    """
+    Signals sent from a SettingsJob or PreloadJob back to the GUI thread.
+    """
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+
+class PreloadJob(QRunnable):
+    """
+    Imports the modules needed for simulating and plotting on a background
+    thread, so the window can be shown and used while they load.
+    """
+
+    def __init__(self):
+        super(PreloadJob, self).__init__()
+        self.signals = StartupSignals()
+
+    def run(self):
+        try:
+            preloadModules()
+            self.signals.finished.emit("")
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+class SettingsJob(QRunnable):
+    """
+    Reads the settings on a background thread, as the user's documents may
+    be slow to reach, for example on a network drive.
+    """
+
+    def __init__(self):
+        super(SettingsJob, self).__init__()
+        self.signals = StartupSignals()
+
+    def run(self):
+        try:
+            self.signals.finished.emit(readSettings())
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+
+
+class SimulationJob(QRunnable):
+    """
+    Simulates a pendulum on a background thread, so that the GUI stays
+    responsive, reporting back through its signals.
+
+    Parameters
+    ----------
+    jobId : int
+        Identifies the job, so that results of superseded jobs can be
+        ignored.
+    cache : SimulationCache class
+        The cache to simulate through.
+    pendulum : Pendulum class
+        The pendulum to simulate.
+    interval : float
+        The time bewteen calculations, in seconds.
+    g : float
+        The gravitational acceleration in SI units.
+    """
+
+    def __init__(self, jobId, cache, pendulum, interval, g):
+        super(SimulationJob, self).__init__()
+        self.jobId = jobId
+        self.cache = cache
+        self.pendulum = pendulum
+        self.interval = interval
+        self.g = g
+        self.signals = SimulationSignals()
+        self.cancel = threading.Event()
+
+    def run(self):
+        import sim
+
+        try:
+            trajectory = self.cache.simulate(
+                self.pendulum, self.interval, self.g,
+                progress = lambda done, total: self.signals.progress.emit(
+                    self.jobId, done, total),
+                cancel = self.cancel)
+            self.signals.finished.emit(self.jobId, self.pendulum, trajectory)
+        except sim.SimulationCancelled:
+            # A newer job has replaced this one, so nothing needs reporting.
+            pass
+        except Exception as e:
+            self.signals.failed.emit(self.jobId, str(e))
+
+
+class ExportJob(QRunnable):
+    """
+    Saves an animation as a video on a background thread, reporting back
+    through its signals, finished is sent with the filename.
+
+    Parameters
+    ----------
+    jobId : int
+        Identifies the job.
+    trajectory : Trajectory class
+        The motion of the pendulum to save.
+    filename : str
+        The file to save the video to.
+    ffmpegPath : str
+        The file path of ffmpeg.
+    """
+
+    def __init__(self, jobId, trajectory, filename, ffmpegPath):
+        super(ExportJob, self).__init__()
+        self.jobId = jobId
+        self.trajectory = trajectory
+        self.filename = filename
+        self.ffmpegPath = ffmpegPath
+        self.signals = SimulationSignals()
+        self.cancel = threading.Event()
+
+    def run(self):
+        import export
+        import sim
+
+        try:
+            export.exportVideo(
+                self.trajectory, self.filename,
+                ffmpegPath = self.ffmpegPath, workers = EXPORT_WORKERS,
+                progress = lambda done, total: self.signals.progress.emit(
+                    self.jobId, done, total),
+                cancel = self.cancel)
+            self.signals.finished.emit(self.jobId, self.filename, None)
+        except sim.SimulationCancelled:
+            pass
+        except Exception as e:
+            self.signals.failed.emit(self.jobId, str(e))
 
 
 class MainWindow(QMainWindow):
@@ -18,9 +220,32 @@ class MainWindow(QMainWindow):
         super(MainWindow, self).__init__()
         self.ui = Ui_MainWindow()
         self.ui.setupUi(self)
+        # Created by finishStartup.
+        self.canvas = None
+        self.cache = None
 
-        self.canvas = FigureCanvasQTAgg(Figure(figsize = (5, 5), dpi = 150))
-        self.ui.vLayout.addWidget(self.canvas)
+        self.progressBar = QProgressBar(self.ui.widget_4)
+        self.progressBar.setStyleSheet("font: 9pt \"Arial\";")
+        self.progressBar.setVisible(False)
+        self.ui.verticalLayout_3.insertWidget(
+            self.ui.verticalLayout_3.indexOf(self.ui.errorLabel),
+            self.progressBar)
+
+        # Simulations run one at a time on a background thread, only the most
+        # recent job's results are shown.
+        self.threadPool = QThreadPool(self)
+        self.threadPool.setMaxThreadCount(1)
+        self.jobId = 0
+        self.job = None
+        # Videos are saved on their own thread, so that saving doesn't hold
+        # up simulating.
+        self.exportPool = QThreadPool(self)
+        self.exportPool.setMaxThreadCount(1)
+        self.exportJob = None
+        self.trajectory = None
+        # Saving is only possible once the settings, which hold the path of
+        # ffmpeg, have been read.
+        self.settingsRead = False
 
         self.ui.lengthSpinBox.valueChanged['double'].connect(
             lambda: self.toggleButton(self.ui.applyButton, True))
@@ -34,38 +259,116 @@ class MainWindow(QMainWindow):
             lambda: self.toggleButton(self.ui.applyButton, True))
         self.ui.ySpinBox.valueChanged['double'].connect(
             lambda: self.toggleButton(self.ui.applyButton, True))
+        self.ui.intervalSpinBox.valueChanged['double'].connect(
+            lambda: self.toggleButton(self.ui.applyButton, True))
         self.ui.applyButton.clicked.connect(self.simulate)
         self.ui.saveButton.clicked.connect(self.save)
         self.ui.ffmpegButton.clicked.connect(self.changeFfmpegFilePath)
 
-        self.checkFfmpegFilePath()
+        self.setting = ""
+        self.ffmpegPath = ""
+        self.settingsJob = SettingsJob()
+        self.settingsJob.signals.finished.connect(self.applySetting)
+        self.settingsJob.signals.failed.connect(self.ui.errorLabel.setText)
+        # Read on the global pool, so exports can't queue behind it.
+        QThreadPool.globalInstance().start(self.settingsJob)
+
+        # Simulations are queued behind the preloading, on the same thread.
+        self.preloadJob = PreloadJob()
+        self.preloadJob.signals.finished.connect(self.finishStartup)
+        self.preloadJob.signals.failed.connect(self.ui.errorLabel.setText)
+        self.threadPool.start(self.preloadJob)
+
+    def finishStartup(self, _ = ""):
+        """
+        Occurs once the PreloadJob has imported matplotlib and the simulation
+        modules, creating the canvas the animations are shown on, which has
+        to be done on the GUI thread, and the simulation cache. Also called
+        by anything needing them, in case the PreloadJob hasn't finished.
+        """
+        if self.canvas is not None:
+            return
+
+        import matplotlib as mpl
+        mpl.use('Qt5Agg')
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+        from matplotlib.figure import Figure
+        from cache import SimulationCache
+
+        self.canvas = FigureCanvasQTAgg(Figure(figsize = (5, 5), dpi = 150))
+        self.ui.vLayout.addWidget(self.canvas)
+
+        # Remembers previous simulations, including those from previous
+        # sessions, so going back to them is instant.
+        self.cache = SimulationCache(
+            directory = userpaths.get_my_documents() + "\\Pendulum\\cache")
 
     def simulate(self):
         """
-        Occurs when the user clicks the applyButton, this will generate an
-        animation based on the values in the various spin boxes, and then
-        display this animation to the user.
+        Occurs when the user clicks the applyButton, this will start
+        simulating a pendulum based on the values in the various spin boxes
+        on a background thread, cancelling any simulation which is still
+        running. The animation is shown by showAnimation once it's ready.
         """
+        from Pendulum import Pendulum
+
+        self.finishStartup()
         self.toggleButton(self.ui.applyButton, False)
-        self.toggleButton(self.ui.saveButton, True)
         self.ui.errorLabel.setText("")
 
         # Try and except needed in case the user inputs an incorrect value.
         try:
             length = self.ui.lengthSpinBox.value()
             g = self.ui.gSpinBox.value()
-            angle = self.ui.angleSpinBox.value() * np.pi
+            angle = self.ui.angleSpinBox.value() * math.pi
             angularVelocity = self.ui.angularVelocitySpinBox.value()
             pendCoor = [self.ui.xSpinBox.value(), self.ui.ySpinBox.value()]
-            interval = 0.0125
-            # Interval is not changable by the user due to issues with
-            # matplotlibs GUI backends, meaning different intervals in the
-            # animation resulting in the animation running at different
-            # speeds to what it should.
+            interval = self.ui.intervalSpinBox.value()
 
             pen = Pendulum(length, angle, angularVelocity, pendCoor)
-            pos = sim.simulatePendulum(pen, interval, g)
+        except Exception as e:
+            self.ui.errorLabel.setText(str(e))
+            return
+
+        if self.job is not None:
+            self.job.cancel.set()
 
+        self.jobId += 1
+        self.job = SimulationJob(self.jobId, self.cache, pen, interval, g)
+        self.job.signals.progress.connect(self.showProgress)
+        self.job.signals.finished.connect(self.showAnimation)
+        self.job.signals.failed.connect(self.showError)
+
+        self.progressBar.setValue(0)
+        self.progressBar.setVisible(True)
+        self.threadPool.start(self.job)
+
+    def showProgress(self, jobId, done, total):
+        """
+        Occurs when a SimulationJob reports its progress, updating the
+        progress bar.
+        """
+        if jobId == self.jobId:
+            self.progressBar.setMaximum(total)
+            self.progressBar.setValue(done)
+
+    def showAnimation(self, jobId, pen, pos):
+        """
+        Occurs when a SimulationJob finishes, replacing the animation being
+        shown with the new one, unless the job has since been superseded.
+        """
+        import sim
+
+        if jobId != self.jobId:
+            return
+
+        interval = self.job.interval
+        self.job = None
+        self.progressBar.setVisible(False)
+        self.trajectory = pos
+        self.toggleButton(self.ui.saveButton, self.canSave())
+
+        try:
             if hasattr(self, 'ani'):
                 self.canvas.figure.clf()
                 self.ani.pause()
@@ -81,12 +384,44 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.ui.errorLabel.setText(str(e))
 
+    def showError(self, jobId, error):
+        """
+        Occurs when a SimulationJob fails, showing the error to the user.
+        """
+        if jobId == self.jobId:
+            self.job = None
+            self.progressBar.setVisible(False)
+            self.ui.errorLabel.setText(error)
+
+    def showExportProgress(self, jobId, done, total):
+        """
+        Occurs when an ExportJob reports its progress, updating the progress
+        bar, unless it's being used by a simulation.
+        """
+        if self.job is None:
+            self.progressBar.setVisible(True)
+            self.progressBar.setMaximum(total)
+            self.progressBar.setValue(done)
+
+    def showSaved(self, jobId, error = ""):
+        """
+        Occurs when an ExportJob finishes, or fails, allowing another video
+        to be saved.
+        """
+        self.exportJob = None
+        self.toggleButton(self.ui.saveButton, self.canSave())
+        if self.job is None:
+            self.progressBar.setVisible(False)
+        if error != "":
+            self.ui.errorLabel.setText(error)
+
     def save(self):
         """
         Occurs when the user clicks the saveButton, this will save the
         animation which is currently being shown to the user to an mp4 file,
         the name and location of the file will be given by the user through
-        a file dialog window.
+        a file dialog window. The video is saved on a background thread by an
+        ExportJob, showing its progress in the progress bar.
         """
         self.ui.errorLabel.setText("")
 
@@ -101,12 +436,27 @@ class MainWindow(QMainWindow):
 
                 if fileDialog.exec():
                     selectedFiles = fileDialog.selectedFiles()
-                    self.ani.save(selectedFiles[0])
+                    self.startExport(selectedFiles[0])
             else:
                 raise Exception("Needs file path for ffmpeg.exe.")
         except Exception as e:
             self.ui.errorLabel.setText(str(e))
 
+    def startExport(self, filename):
+        """
+        Starts saving the trajectory being shown to filename, through
+        ffmpeg, on a background thread.
+        """
+        self.exportJob = ExportJob(0, self.trajectory, filename,
+                                   self.ffmpegPath)
+        self.exportJob.signals.progress.connect(self.showExportProgress)
+        self.exportJob.signals.finished.connect(
+            lambda jobId, filename, _: self.showSaved(jobId))
+        self.exportJob.signals.failed.connect(self.showSaved)
+
+        self.toggleButton(self.ui.saveButton, False)
+        self.exportPool.start(self.exportJob)
+
     def changeFfmpegFilePath(self):
         """
         Occurs when user clicks ffmpegButton, resulting in a file dialog window
@@ -130,7 +480,7 @@ class MainWindow(QMainWindow):
     def checkFfmpegFilePath(self, ffmpegFilePath = ""):
         """
         Checks to see if the user has previously set the file path of
-        ffmpeg.exe. If they have, then it tells matplotlib the file path.
+        ffmpeg.exe. If they have, then it's used for saving animations.
         Otherwise it creates a settings.ini in the user's my documents.
 
         Parameters
@@ -140,39 +490,57 @@ class MainWindow(QMainWindow):
             path of ffmpeg, which will then be written into settings.ini.
             The default is "".
         """
-        filepath = userpaths.get_my_documents() + "\\Pendulum"
-
-        # If file doesn't exsist create it.
-        try:
-            mkdir(filepath)
-        except FileExistsError:
-            pass
+        self.applySetting(readSettings(ffmpegFilePath))
 
-        file = open(filepath + "\\settings.ini", "a+")
-
-        if ffmpegFilePath != "" and self.setting == "":
-            file.write("ffmpegPath = " + ffmpegFilePath)
-
-        # Sets pointer to start of file.
-        file.seek(0)
-        self.setting = file.readline()
+    def applySetting(self, setting):
+        """
+        Occurs when the settings have been read, either by a SettingsJob when
+        starting up, or by checkFfmpegFilePath.
 
+        Parameters
+        ----------
+        setting : str
+            The first line of settings.ini.
+        """
+        self.setting = setting
         if self.setting != "":
-            filepath = self.setting.split(" = ")[1]
-            mpl.rcParams['animation.ffmpeg_path'] = (filepath)
+            self.ffmpegPath = self.setting.split(" = ")[1]
+        self.settingsRead = True
+        self.toggleButton(self.ui.saveButton, self.canSave())
+
+    def canSave(self):
+        """
+        Whether the saveButton should be enabled, which it is once there's
+        an animation to save and the settings have been read, unless a video
+        is already being saved.
 
-        file.close()
+        Returns
+        -------
+        bool
+            True if a video can be saved.
+        """
+        return (self.settingsRead and self.trajectory is not None and
+                self.exportJob is None)
 
     def closeEvent(self, event):
         """
         For a subclass of QMainWindow, closeEvent will fire when the subclass
         is closed. In this case, it makes sure that animations based on
-        matplotlib are disposed off.
+        matplotlib are disposed off, and stops any running simulation.
         """
+        if self.job is not None:
+            self.job.cancel.set()
+        if self.exportJob is not None:
+            self.exportJob.cancel.set()
+        self.threadPool.waitForDone()
+        self.exportPool.waitForDone()
+        QThreadPool.globalInstance().waitForDone()
+
         if hasattr(self, 'ani'):
             self.ani.pause()
             # Stops animations from continuing in background.
-        self.canvas.figure.clf()
+        if self.canvas is not None:
+            self.canvas.figure.clf()
 
     @staticmethod
     def toggleButton(button, toggle):
@@ -1,10 +1,14 @@
 from PyQt5 import QtWidgets, QtCore
 from gui import MainWindow
 
+import multiprocessing
 import sys
 
 
 if __name__ == "__main__":
+    # Videos are drawn in a pool of processes, which needs this once frozen
+    # into an executable.
+    multiprocessing.freeze_support()
     QtWidgets.QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling,
                                         True)
     app = QtWidgets.QApplication(sys.argv)
@@ -0,0 +1,182 @@
+from collections import deque
+
+import numpy as np
+import time
+
+
+# The most frames per second drawn on screen, any faster and frames are
+# skipped by design rather than because drawing has fallen behind.
+MAX_FPS = 100
+
+
+class PlaybackClock:
+    """
+    A class which decides which frame of a trajectory should be on screen,
+    from the wall-clock time since playback started rather than from how many
+    frames have been drawn. When drawing can't keep up, frames are skipped so
+    that the animation still runs in real time, and the number of frames
+    dropped and the frame rate achieved are kept track of.
+
+    Parameters
+    ----------
+    times : array_like
+        The time of each frame, in seconds, starting at zero and increasing.
+    duration : float, optional
+        How long one run through the frames lasts, in seconds. If None, the
+        time of the last frame plus the time between the last two frames, so
+        that a looping period joins up smoothly.
+        The default is None.
+    loop : bool, optional
+        Whether to start again from the first frame once the duration has
+        passed, otherwise the last frame is held.
+        The default is True.
+    clock : function, optional
+        Returns the current time in seconds, only changed for testing.
+        The default is time.perf_counter.
+    """
+
+    # Number of recent frames the achieved frame rate is averaged over.
+    fpsWindow = 30
+
+    def __init__(
+            self,
+            times,
+            duration = None,
+            loop = True,
+            clock = time.perf_counter):
+
+        self.times = np.asarray(times, dtype = np.float64)
+        if self.times.ndim != 1 or len(self.times) == 0:
+            raise ValueError("times must be a non-empty 1D array, yet it has "
+                             f"shape {self.times.shape}.")
+
+        if duration is None:
+            if len(self.times) > 1:
+                duration = self.times[-1] + self.times[-1] - self.times[-2]
+            else:
+                duration = 0
+        self.duration = float(duration)
+        self.loop = loop
+        self.clock = clock
+        self.start()
+
+    @classmethod
+    def fromInterval(cls, frames, interval, **kwargs):
+        """
+        Creates a clock for frames which are evenly spaced in time.
+
+        Parameters
+        ----------
+        frames : int
+            The number of frames.
+        interval : float
+            The time between frames, in seconds.
+
+        Returns
+        -------
+        clock : PlaybackClock class
+            The clock.
+        """
+        return cls(np.arange(max(int(frames), 1)) * interval, **kwargs)
+
+    def start(self):
+        """
+        Starts, or restarts, playback from the first frame, resetting the
+        counters.
+        """
+        self.startTime = self.clock()
+        self.pausedAt = None
+        self.frame = None
+        self.drawn = 0
+        self.dropped = 0
+        self.drawTimes = deque(maxlen = self.fpsWindow)
+
+    def pause(self):
+        """
+        Stops the clock, so the same frame is shown until resume is called.
+        """
+        if self.pausedAt is None:
+            self.pausedAt = self.clock()
+
+    def resume(self):
+        """
+        Restarts the clock from where it was paused.
+        """
+        if self.pausedAt is not None:
+            self.startTime += self.clock() - self.pausedAt
+            self.pausedAt = None
+
+    @property
+    def elapsed(self):
+        """
+        The time in seconds since playback started, not counting pauses.
+        """
+        now = self.clock() if self.pausedAt is None else self.pausedAt
+        return now - self.startTime
+
+    @property
+    def fps(self):
+        """
+        The frame rate actually achieved, over the most recent frames drawn.
+        """
+        if len(self.drawTimes) < 2 or self.drawTimes[-1] == self.drawTimes[0]:
+            return 0.0
+        return ((len(self.drawTimes) - 1) /
+                (self.drawTimes[-1] - self.drawTimes[0]))
+
+    def frameAt(self, elapsed):
+        """
+        The index of the frame to show, elapsed seconds after playback
+        started.
+
+        Parameters
+        ----------
+        elapsed : float
+            The time since playback started, in seconds.
+
+        Returns
+        -------
+        int
+            The index of the frame.
+        """
+        if self.duration > 0:
+            if self.loop:
+                elapsed = elapsed % self.duration
+            elif elapsed >= self.duration:
+                return len(self.times) - 1
+
+        return max(int(np.searchsorted(self.times, elapsed, "right")) - 1, 0)
+
+    def nextFrame(self):
+        """
+        Picks the frame to draw now, called each time the screen is about to
+        be redrawn. Any frames passed over since the last call are counted
+        as dropped.
+
+        Returns
+        -------
+        int
+            The index of the frame to draw.
+        """
+        now = self.clock()
+        frame = self.frameAt(
+            (now if self.pausedAt is None else self.pausedAt) -
+            self.startTime)
+
+        if self.frame is not None and self.pausedAt is None:
+            skipped = frame - self.frame - 1
+            if frame < self.frame:
+                # Looped back round to the start.
+                skipped += len(self.times)
+            self.dropped += max(skipped, 0)
+
+        if frame != self.frame:
+            self.drawn += 1
+            self.drawTimes.append(now)
+        self.frame = frame
+
+        return frame
+
+    def __str__(self):
+        return (f"Frames Drawn: {self.drawn}, Frames Dropped: "
+                f"{self.dropped}, FPS: {self.fps:.1f}.")
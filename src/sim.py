@@ -1,8 +1,113 @@
 from Pendulum import Pendulum
+from Trajectory import Trajectory
 
-import matplotlib.animation as animation
-import matplotlib.pyplot as plt
 import numpy as np
+import playback
+import time
+
+
+class SimulationCancelled(Exception):
+    """
+    Raised when a simulation is cancelled before it finishes.
+    """
+
+
+class SimulationStats:
+    """
+    A class which records how a simulation went, filled in by
+    simulatePendulum when passed one, for working out why a simulation was
+    slow or didn't cover a whole period.
+
+    Attributes
+    ----------
+    engine : str
+        The integrator used.
+    steps : int
+        The number of integration steps taken, including steps rejected by
+        adaptive engines.
+    rejectedSteps : int
+        The number of steps rejected by adaptive engines.
+    rhsEvaluations : int
+        The number of times the differential equation was evaluated.
+    frames : int
+        The number of frames produced.
+    phases : dict
+        The wall time in seconds spent on each phase, "termination" working
+        out how many frames are needed, "integration", including looking for
+        any events, "normalisation" of the angles, "conversion" into a
+        Trajectory and "diagnostics" finding the energy drift.
+    termination : str
+        Why the simulation stopped, "period" once a whole period was
+        covered, "maxFrames" when the period is longer than maxFrames frames,
+        "infinitePeriod" on the separatrix, where the period is infinite,
+        "static" for a pendulum which doesn't move, and "event" when a
+        terminal Event happened first.
+    maxEnergyDrift : float
+        The largest change in energy from the first frame, relative to the
+        larger of the initial energy and g times the length, the size of the
+        potential energy.
+    """
+
+    def __init__(self):
+        self.engine = ""
+        self.steps = 0
+        self.rejectedSteps = 0
+        self.rhsEvaluations = 0
+        self.frames = 0
+        self.phases = {}
+        self.termination = ""
+        self.maxEnergyDrift = 0.0
+        self.lapTime = time.perf_counter()
+
+    def lap(self, phase = None):
+        """
+        Adds the time since the previous lap to a phase.
+
+        Parameters
+        ----------
+        phase : str, optional
+            The phase which has just finished. If None, the time isn't added
+            to any phase, just starting the next lap.
+            The default is None.
+        """
+        now = time.perf_counter()
+        if phase is not None:
+            self.phases[phase] = (self.phases.get(phase, 0.0) + now -
+                                  self.lapTime)
+        self.lapTime = now
+
+    @property
+    def wallTime(self):
+        """
+        The total wall time of every phase, in seconds.
+        """
+        return sum(self.phases.values())
+
+    def asDict(self):
+        """
+        The statistics as a dictionary, for example to send as metrics.
+        """
+        return {"engine": self.engine,
+                "steps": self.steps,
+                "rejectedSteps": self.rejectedSteps,
+                "rhsEvaluations": self.rhsEvaluations,
+                "frames": self.frames,
+                "phases": dict(self.phases),
+                "termination": self.termination,
+                "maxEnergyDrift": self.maxEnergyDrift}
+
+    def __str__(self):
+        return (f"Engine: {self.engine}, Steps: {self.steps}, "
+                f"RHS Evaluations: {self.rhsEvaluations}, "
+                f"Frames: {self.frames}, Termination: {self.termination}, "
+                f"Max Energy Drift: {self.maxEnergyDrift:.3g}, "
+                f"Wall Time: {self.wallTime:.3g}s.")
+
+
+# Functions called with the SimulationStats of every simulatePendulum call,
+# for example to feed them into metrics. Stats are only recorded while a
+# hook is registered, or one is passed to simulatePendulum.
+statsHooks = []
 
 
 def RungeKutta(func1, func2, h, oldState1, oldState2, consts):
@@ -100,181 +205,2218 @@ def dESimplePendulumAngle(consts, angularVelocity):
     return angularVelocity
 
 
-def simulatePendulum(pendulum,
-                     intervalTime = 0.0125,
-                     g = -9.81,
-                     maxFrames = 2000):
+def VelocityVerlet(func, h, angle, angularVelocity, consts):
     """
-    Simulates the motion of a simple pendulum without a damping or driving
-    force, uses the Runge Kutta algorithm to solve the differential equation
-    for a simple pendulum. Produces x and y coordinates for the motion of the
-    pendulum. It will attempt to return one period of motion.
+    Velocity Verlet algorithm, a second order symplectic integrator for
+    differential equations of the form d^2(x)/dt^2 = f(x). Unlike the Runge
+    Kutta algorithm, the error in the energy stays bounded rather than
+    drifting, however long the simulation runs for.
 
     Parameters
     ----------
-    pendulum : Pendulum class
-        A class representing a point mass attached to a rigid string, the
-        pendulum whose motion this function simulates.
-    intervalTime : float, optional
-        The time bewteen calculations, in seconds.
-        The default is 0.0125.
+    func : function
+        Function to calculate d^2(x)/dt^2 from consts and x, for example
+        dESimplePendulumAngularVelocity.
+    h : float
+        Time interval over which angle and angularVelocity are changing,
+        in seconds.
+    angle : float
+        Most likely x.
+    angularVelocity : float
+        Most likely d(x)/dt.
+    consts : list
+        List of constants which will be passed into func.
+
+    Returns
+    -------
+    newAngle : float
+        Most likely x, after time period h.
+    newAngularVelocity : float
+        Most likely d(x)/dt after time period h.
+    """
+    halfAngularVelocity = angularVelocity + func(consts, angle) * h / 2
+    newAngle = angle + halfAngularVelocity * h
+    newAngularVelocity = halfAngularVelocity + func(consts, newAngle) * h / 2
+
+    return newAngle, newAngularVelocity
+
+
+# Coefficients of Yoshida's fourth order method, also known as the Forest
+# Ruth method, three Verlet steps of sizes w1, w0 and w1.
+YOSHIDA_W1 = 1 / (2 - 2 ** (1 / 3))
+YOSHIDA_W0 = -2 ** (1 / 3) * YOSHIDA_W1
+YOSHIDA_C = (YOSHIDA_W1 / 2, (YOSHIDA_W0 + YOSHIDA_W1) / 2,
+             (YOSHIDA_W0 + YOSHIDA_W1) / 2, YOSHIDA_W1 / 2)
+YOSHIDA_D = (YOSHIDA_W1, YOSHIDA_W0, YOSHIDA_W1)
+
+
+def Yoshida(func, h, angle, angularVelocity, consts):
+    """
+    Yoshida's fourth order symplectic integrator for differential equations
+    of the form d^2(x)/dt^2 = f(x), made by composing three Verlet steps.
+    Keeps the energy error bounded like VelocityVerlet, but is accurate
+    enough to be used at much larger step sizes.
+
+    Parameters
+    ----------
+    func : function
+        Function to calculate d^2(x)/dt^2 from consts and x, for example
+        dESimplePendulumAngularVelocity.
+    h : float
+        Time interval over which angle and angularVelocity are changing,
+        in seconds.
+    angle : float
+        Most likely x.
+    angularVelocity : float
+        Most likely d(x)/dt.
+    consts : list
+        List of constants which will be passed into func.
+
+    Returns
+    -------
+    angle : float
+        Most likely x, after time period h.
+    angularVelocity : float
+        Most likely d(x)/dt after time period h.
+    """
+    for c, d in zip(YOSHIDA_C, YOSHIDA_D):
+        angle = angle + c * angularVelocity * h
+        angularVelocity = angularVelocity + d * func(consts, angle) * h
+    angle = angle + YOSHIDA_C[3] * angularVelocity * h
+
+    return angle, angularVelocity
+
+
+def stepPendulum(engine, h, angle, angularVelocity, consts):
+    """
+    Advances a simple pendulum by one step of a fixed step engine. Works
+    equally on single pendulums and on arrays of them.
+
+    Parameters
+    ----------
+    engine : str
+        The integrator to use, one of FIXED_STEP_ENGINES.
+    h : float
+        The size of the step, in seconds.
+    angle : float or numpy ndarray
+        The angle in radians.
+    angularVelocity : float or numpy ndarray
+        The angular velocity.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+
+    Returns
+    -------
+    angle : float or numpy ndarray
+        The angle after time period h.
+    angularVelocity : float or numpy ndarray
+        The angular velocity after time period h.
+    """
+    if engine == "rk4":
+        return RungeKutta(dESimplePendulumAngularVelocity,
+                          dESimplePendulumAngle, h, angle, angularVelocity,
+                          consts)
+    elif engine == "verlet":
+        return VelocityVerlet(dESimplePendulumAngularVelocity, h, angle,
+                              angularVelocity, consts)
+    elif engine == "yoshida":
+        return Yoshida(dESimplePendulumAngularVelocity, h, angle,
+                       angularVelocity, consts)
+    else:
+        raise ValueError(f"engine must be one of {FIXED_STEP_ENGINES}, yet "
+                         f"it's {engine}.")
+
+
+def pendulumEnergy(length, angle, angularVelocity, g = -9.81):
+    """
+    The total energy of a simple pendulum per unit mass, the kinetic energy
+    plus the potential energy, where the potential energy is zero at the
+    pivot. Constant for an undamped pendulum, so useful for checking how
+    far a simulation has drifted.
+
+    Parameters
+    ----------
+    length : float or numpy ndarray
+        Length of the pendulum string.
+    angle : float or numpy ndarray
+        The angle in radians.
+    angularVelocity : float or numpy ndarray
+        The angular velocity.
     g : float, optional
         The gravitational acceleration in SI units.
         The default is -9.81.
-    maxFrames : int, optional
-        The maximum number of frames to simulate, only used in backup for when
-        the period can't be determined.
-        The default is 2000.
 
     Returns
     -------
-    positions : list
-        List of lists, the list at index 0 contains the x coordinates of
-        the motion of the pendulum, the list at index 1 contains the y
-        coordinates.
+    float or numpy ndarray
+        The energy per unit mass, in J/kg.
     """
-    if not isinstance(pendulum, Pendulum):
-        raise ValueError("pendulum parameter must be a Pendulum object. Yet "
-                         f"it is {type(pendulum)}")
-    # Time between calculations must be small.
-    if intervalTime > 0.1:
-        raise ValueError("Time between calculations must be "
-                         "less than or equal to 0.1 seconds, it was "
-                         f"instead {intervalTime} seconds.")
-    else:
-        intervalTime = np.float64(intervalTime)
-    # maxFrames must be positive.
-    if maxFrames <= 0:
-        raise ValueError("Maximum number of frames must be greater than or "
-                         f"equal to zero, yet it's {maxFrames}.")
-    else:
-        maxFrames = np.int64(maxFrames)
-    g = np.float64(g)
+    return (length ** 2 * angularVelocity ** 2 / 2 -
+            g * length * np.cos(angle))
 
-    positions = []
-    pendulum.normaliseAngle()
-    initialAngle = np.copy(pendulum.angle)
-    initialAngularVelocity = np.copy(pendulum.angularVelocity)
-
-    loop = False
-
-    passedMax = 0
-    passedInit = 0
-    while not loop:
-        oldAngle = np.copy(pendulum.angle)
-        oldAngularVelocity = np.copy(pendulum.angularVelocity)
-
-        x = pendulum.length * np.sin(pendulum.angle) + pendulum.pendCoor[0]
-        y = pendulum.length * np.cos(pendulum.angle) + pendulum.pendCoor[1]
-
-        positions.append([np.float64(x), np.float64(y)])
-
-        pendulum.angle, pendulum.angularVelocity = RungeKutta(
-            dESimplePendulumAngularVelocity, dESimplePendulumAngle,
-            intervalTime, pendulum.angle, pendulum.angularVelocity,
-            [g, pendulum.length])
-
-        # Keeps angles within less than or equal to pi and greater than -pi.
-        # Used to determine when to stop the simulation, because
-        # for certain situations the angle will indefinitely increase, this
-        # stops that.
-        tempAngle = np.copy(pendulum.angle)
-        pendulum.normaliseAngle()
-
-        if ((oldAngularVelocity >= 0 and pendulum.angularVelocity < 0) or
-           (oldAngularVelocity <= 0 and pendulum.angularVelocity > 0)):
-            passedMax += 1
-
-        # Determines when one full period has been completed, and stops
-        # making new frames once this occurs.
-        if len(positions[0]) == maxFrames:
-            # Safeguard if other statements fail.
-            loop = True
-        elif initialAngularVelocity == 0:
-            if (passedMax >= 3 or initialAngle == 0
-               or np.abs(initialAngle) == np.pi or g == 0):
-                # In the last three cases, the pendulum won't move.
-                loop = True
-        elif initialAngularVelocity != 0:
-            if len(positions[0]) != 1 and tempAngle != pendulum.angle:
-                if np.abs(initialAngle) != np.pi:
-                    # Passing pi triggers the if statement below,
-                    # this compensates.
-                    passedInit -= 1
-                else:
-                    # The if statement below never triggers if the inital angle
-                    # is pi, this compenstates.
-                    passedInit += 1
-
-            if ((oldAngle < initialAngle and pendulum.angle > initialAngle) or
-               (oldAngle > initialAngle and pendulum.angle < initialAngle)):
-                passedInit += 1
-
-            if ((passedMax == 0 and passedInit >= 1) or
-               (passedMax >= 1 and passedInit >= 2)):
-                # First case is for a pendulum completing full circles, second
-                # case is for pendulum swinging back and forth.
-                loop = True
-
-    return np.float64(positions)
 
+def dESimplePendulum(t, state, consts):
+    """
+    The differential equation for a simple pendulum in vector form, for
+    integrators which work on the whole state at once rather than on the
+    angle and angular velocity separately.
 
-def produceAnimation(pendulum, positions, interval = 12.5,
-                     fig = None, ax = None):
+    Parameters
+    ----------
+    t : float
+        The time, in seconds. Not used, as there's no driving force.
+    state : numpy ndarray
+        The angle at index 0 and the angular velocity at index 1.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+
+    Returns
+    -------
+    numpy ndarray
+        The derivative of the state, the angular velocity at index 0 and the
+        angular acceleration at index 1.
     """
-    Creates an animation from the x and y coordinates produced by the
-    simulatePendulum function. The animation will appear with both a mass and
-    a string depicted, with a x and y axis.
+    return np.array([state[1], -np.sin(state[0]) * consts[0] / consts[1]])
+
+
+def RungeKuttaVector(func, t, y, h, params):
+    """
+    Runge Kutta algorithm for differential equations of the general form
+    d(y)/dt = f(t, y), where y is a numpy array holding the whole state. As
+    f is given the time, driving forces can be added, and as it's given the
+    whole state at once, it's called four times a step, rather than eight
+    times like RungeKutta. The state can also hold many systems at once,
+    for example an array of shape (2, N) for N pendulums, which are all
+    stepped together.
 
     Parameters
     ----------
-    pendulum : Pendulum class
-        A class representing a point mass attached to a rigid string, the
-        pendulum whose motion is shown in the animation.
-    positions : list
-        List of lists, the list at index 0 contains the x coordinates of
-        the motion of the pendulum, the list at index 1 contains the y
-        coordinates.
-    interval : float, optional
-        The time bewteen frames, in milliseconds.
-        The default is 12.5, so 80fps.
+    func : function
+        The differential equation, func(t, y, params), returning the
+        derivative of y, for example chaos.dEDrivenPendulum.
+    t : float
+        The time at the start of the step, in seconds.
+    y : numpy ndarray
+        The state at the start of the step.
+    h : float or numpy ndarray
+        Time interval over which y is changing, in seconds, or an array of
+        them broadcasting against y, so each system has its own.
+    params : list
+        List of constants which will be passed into func.
 
     Returns
     -------
-    ani : matplotlib.animation.TimedAnimation
-        The animation depicting the motion of the pendulum.
+    numpy ndarray
+        The state after time period h.
     """
-    if fig is None or ax is None:
-        # Specifiying figsize ensures that plot is square when opened in Spyder
-        # IDE.
-        fig, ax = plt.subplots(figsize = (5, 5), dpi = 150)
+    k1 = func(t, y, params)
+    k2 = func(t + h / 2, y + k1 * (h / 2), params)
+    k3 = func(t + h / 2, y + k2 * (h / 2), params)
+    k4 = func(t + h, y + k3 * h, params)
 
-    pendX = pendulum.pendCoor[0]
-    pendY = pendulum.pendCoor[1]
-    # Used to apply limits to the plots used in the animation, so that the
-    # pendulum is fully within the plot.
-    m = pendulum.length + 0.2 * pendulum.length
+    return y + (k1 + 2 * k2 + 2 * k3 + k4) * (h / 6)
 
-    # zorder ensures that the mass appears on top of the string, it would
-    # look weird otherwise.
-    mass = ax.scatter([], [], color = 'black', zorder = 2)
-    string = ax.plot([], [], color = 'brown', linestyle = '-', zorder = 1)[0]
 
-    ax.set(xlim = [-m + pendX, m + pendX], ylim = [-m + pendY, m + pendY])
+# Integrators which simulatePendulum can use, only the fixed step engines can
+# be used on ensembles.
+FIXED_STEP_ENGINES = ("rk4", "verlet", "yoshida")
+# Evaluations of the differential equation in each step of the fixed step
+# engines.
+RHS_EVALUATIONS = {"rk4": 4, "verlet": 2, "yoshida": 3}
+ENGINES = FIXED_STEP_ENGINES + ("rk45", "exact")
 
-    def update(frame):
-        x = positions[frame][0]
-        y = positions[frame][1]
+# Butcher tableau for the Dormand Prince method, DORPRI_E are the differences
+# between the fifth and fourth order weights, used to estimate the error.
+DORPRI_C = np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1])
+DORPRI_A = [
+    np.array([]),
+    np.array([1 / 5]),
+    np.array([3 / 40, 9 / 40]),
+    np.array([44 / 45, -56 / 15, 32 / 9]),
+    np.array([19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729]),
+    np.array([9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176,
+              -5103 / 18656])]
+DORPRI_B = np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784,
+                     11 / 84])
+DORPRI_E = np.array([-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200,
+                     -22 / 525, 1 / 40])
+# Coefficients of the fourth order dense output polynomial.
+DORPRI_P = np.array([
+    [1, -8048581381 / 2820520608, 8663915743 / 2820520608,
+     -12715105075 / 11282082432],
+    [0, 0, 0, 0],
+    [0, 131558114200 / 32700410799, -68118460800 / 10900136933,
+     87487479700 / 32700410799],
+    [0, -1754552775 / 470086768, 14199869525 / 1410260304,
+     -10690763975 / 1880347072],
+    [0, 127303824393 / 49829197408, -318862633887 / 49829197408,
+     701980252875 / 199316789632],
+    [0, -282668133 / 205662961, 2019193451 / 616988883,
+     -1453857185 / 822651844],
+    [0, 40617522 / 29380423, -110615467 / 29380423,
+     69997945 / 29380423]])
 
-        mass.set_offsets([x, y])
-        string.set_xdata([x, pendX])
-        string.set_ydata([y, pendY])
 
-        return (mass, string, )
+def DormandPrince(func, t, oldState, h, consts, k1 = None):
+    """
+    One step of the Dormand Prince method, an embedded Runge Kutta method
+    which gives a fifth order solution alongside an estimate of its error.
+    The last stage is the derivative at the end of the step, so it can be
+    reused as the first stage of the next step.
 
-    ani = animation.FuncAnimation(fig = fig, func = update,
-                                  frames = len(positions),
-                                  interval = interval, blit = True)
+    Parameters
+    ----------
+    func : function
+        The differential equation, func(t, state, consts), returning the
+        derivative of the state.
+    t : float
+        The time at the start of the step, in seconds.
+    oldState : numpy ndarray
+        The state at the start of the step.
+    h : float
+        The size of the step, in seconds.
+    consts : list
+        List of constants which will be passed into func.
+    k1 : numpy ndarray, optional
+        The derivative at the start of the step, if already known.
+        The default is None.
 
-    # Makes sure that the animation appears.
-    return ani
+    Returns
+    -------
+    newState : numpy ndarray
+        The state after time period h.
+    error : numpy ndarray
+        Estimate of the error in newState.
+    ks : numpy ndarray
+        The seven stages of the step, used for dense output.
+    """
+    ks = np.empty((7, ) + np.shape(oldState))
+    ks[0] = func(t, oldState, consts) if k1 is None else k1
+
+    for i in range(1, 6):
+        ks[i] = func(t + DORPRI_C[i] * h,
+                     oldState + h * np.tensordot(DORPRI_A[i], ks[:i], 1),
+                     consts)
+
+    newState = oldState + h * np.tensordot(DORPRI_B, ks[:6], 1)
+    ks[6] = func(t + h, newState, consts)
+    error = h * np.tensordot(DORPRI_E, ks, 1)
+
+    return newState, error, ks
+
+
+def denseOutput(oldState, h, ks, x):
+    """
+    Interpolates the solution within a step of the Dormand Prince method,
+    with a fourth order polynomial which needs no extra evaluations of the
+    differential equation.
+
+    Parameters
+    ----------
+    oldState : numpy ndarray
+        The state at the start of the step.
+    h : float
+        The size of the step, in seconds.
+    ks : numpy ndarray
+        The seven stages of the step, as returned by DormandPrince.
+    x : float
+        The fraction of the step to interpolate at, between 0 and 1.
+
+    Returns
+    -------
+    numpy ndarray
+        The interpolated state.
+    """
+    powers = np.cumprod(np.full(4, x))
+    return oldState + h * np.tensordot(DORPRI_P @ powers, ks, 1)
+
+
+def adaptiveSteps(func, state, consts, rtol = 1e-6, atol = 1e-9,
+                  stats = None):
+    """
+    Integrates a differential equation with the Dormand Prince method,
+    changing the step size to keep the estimated error within the
+    tolerances, yielding every step which is accepted.
+
+    Parameters
+    ----------
+    func : function
+        The differential equation, func(t, state, consts), returning the
+        derivative of the state.
+    state : numpy ndarray
+        The initial state, at a time of zero.
+    consts : list
+        List of constants which will be passed into func.
+    rtol : float, optional
+        The relative tolerance of each step.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance of each step.
+        The default is 1e-9.
+    stats : SimulationStats class, optional
+        Has its steps, rejected steps and evaluations of func counted.
+        The default is None.
+
+    Yields
+    ------
+    t : numpy float64
+        The time at the start of the step.
+    h : numpy float64
+        The size of the step.
+    oldState : numpy ndarray
+        The state at the start of the step.
+    newState : numpy ndarray
+        The state at the end of the step.
+    ks : numpy ndarray
+        The seven stages of the step, used by denseOutput to find the state
+        anywhere within it.
+    """
+    state = np.float64(state)
+    t = np.float64(0)
+    k1 = func(t, state, consts)
+
+    # Initial step size, chosen so that a step of Euler's method would stay
+    # roughly within the tolerances.
+    scale = atol + np.abs(state) * rtol
+    d0 = np.sqrt(np.mean((state / scale) ** 2))
+    d1 = np.sqrt(np.mean((k1 / scale) ** 2))
+    h = 0.01 * d0 / d1 if d0 > 1e-5 and d1 > 1e-5 else 1e-6
+    d2 = np.sqrt(np.mean(((func(t + h, state + h * k1, consts) - k1) /
+                          scale) ** 2)) / h
+    if max(d1, d2) > 1e-15:
+        h = min(100 * h, (0.01 / max(d1, d2)) ** (1 / 5))
+    else:
+        h = max(1e-6, h * 1e-3)
+
+    if stats is not None:
+        stats.rhsEvaluations += 2
+
+    while True:
+        newState, error, ks = DormandPrince(func, t, state, h, consts, k1)
+        scale = atol + np.maximum(np.abs(state), np.abs(newState)) * rtol
+        errorNorm = np.sqrt(np.mean((error / scale) ** 2))
+        if stats is not None:
+            # The first stage is reused from the previous step.
+            stats.steps += 1
+            stats.rhsEvaluations += 6
+            stats.rejectedSteps += errorNorm > 1
+
+        if errorNorm <= 1:
+            yield t, h, state, newState, ks
+
+            t += h
+            state = newState
+            k1 = ks[6]
+            factor = 10 if errorNorm == 0 else min(
+                10, 0.9 * errorNorm ** (-1 / 5))
+        else:
+            factor = max(0.2, 0.9 * errorNorm ** (-1 / 5))
+        h *= factor
+
+
+def adaptiveFrames(func, state, intervalTime, consts, rtol = 1e-6,
+                   atol = 1e-9, stats = None):
+    """
+    Integrates a differential equation with the Dormand Prince method, see
+    adaptiveSteps. Steps aren't tied to the frames, smooth parts of the
+    motion are crossed in large steps, and the frames are interpolated from
+    whichever step they fall in.
+
+    Parameters
+    ----------
+    func : function
+        The differential equation, func(t, state, consts), returning the
+        derivative of the state.
+    state : numpy ndarray
+        The initial state, at a time of zero.
+    intervalTime : float
+        The time bewteen frames, in seconds.
+    consts : list
+        List of constants which will be passed into func.
+    rtol : float, optional
+        The relative tolerance of each step.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance of each step.
+        The default is 1e-9.
+    stats : SimulationStats class, optional
+        Has its steps, rejected steps and evaluations of func counted.
+        The default is None.
+
+    Yields
+    ------
+    numpy ndarray
+        The state at each frame, starting at a time of intervalTime.
+    """
+    frame = 1
+    for t, h, oldState, _, ks in adaptiveSteps(func, state, consts, rtol,
+                                               atol, stats):
+        # Frame times are multiples of intervalTime, rather than being added
+        # up, so that they don't drift.
+        while frame * intervalTime <= t + h:
+            yield denseOutput(oldState, h, ks,
+                              (frame * intervalTime - t) / h)
+            frame += 1
+
+
+def integrateFrames(engine, angle, angularVelocity, intervalTime, consts,
+                    rtol = 1e-6, atol = 1e-9, stats = None):
+    """
+    Integrates the motion of a simple pendulum with the chosen engine,
+    yielding the state at each frame. The angles yielded aren't normalised.
+
+    Parameters
+    ----------
+    engine : str
+        The integrator to use, either one of FIXED_STEP_ENGINES, stepping
+        once per frame, "rk4" for the Runge Kutta algorithm, "verlet" for the
+        velocity Verlet algorithm and "yoshida" for Yoshida's fourth order
+        method, "rk45" for the adaptive step Dormand Prince method, or
+        "exact" for the exact solution from exactPendulum, with no time
+        stepping at all.
+    angle : float
+        The initial angle in radians.
+    angularVelocity : float
+        The initial angular velocity.
+    intervalTime : float
+        The time bewteen frames, in seconds.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+    stats : SimulationStats class, optional
+        Has its steps and evaluations of the differential equation counted.
+        The default is None.
+
+    Yields
+    ------
+    angle : float
+        The angle at each frame, starting at a time of intervalTime.
+    angularVelocity : float
+        The angular velocity at each frame.
+    """
+    if engine in FIXED_STEP_ENGINES:
+        evaluations = RHS_EVALUATIONS[engine]
+        while True:
+            angle, angularVelocity = stepPendulum(
+                engine, intervalTime, angle, angularVelocity, consts)
+            if stats is not None:
+                stats.steps += 1
+                stats.rhsEvaluations += evaluations
+            yield angle, angularVelocity
+    elif engine == "rk45":
+        for state in adaptiveFrames(dESimplePendulum,
+                                    [angle, angularVelocity], intervalTime,
+                                    consts, rtol, atol, stats):
+            yield state[0], state[1]
+    elif engine == "exact":
+        # Frames are found in blocks, as exactPendulum is vectorised.
+        frame = 1
+        while True:
+            times = np.arange(frame, frame + 1024) * intervalTime
+            yield from zip(*exactPendulum(consts[1], angle, angularVelocity,
+                                          times, consts[0]))
+            frame += 1024
+    else:
+        checkEngine(engine)
+
+
+def integrateSteps(engine, angle, angularVelocity, dt, consts, rtol = 1e-6,
+                   atol = 1e-9, stats = None):
+    """
+    Integrates the motion of a simple pendulum with the chosen engine, in
+    the same way as integrateFrames, but yields every step along with the
+    engine's own solution within it, so the state between steps is found as
+    accurately as the steps themselves. The fixed step engines take a
+    shorter step from the start of the step, "rk45" uses denseOutput, and
+    "exact" evaluates exactPendulum. The angles aren't normalised, and
+    don't jump from pi to -pi, even for the exact engine.
+
+    Parameters
+    ----------
+    engine : str
+        The integrator to use, see integrateFrames.
+    angle : float
+        The initial angle in radians.
+    angularVelocity : float
+        The initial angular velocity.
+    dt : float
+        The time bewteen steps, in seconds, for every engine but "rk45",
+        whose steps change to stay within the tolerances.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+    stats : SimulationStats class, optional
+        Has its steps and evaluations of the differential equation counted.
+        The default is None.
+
+    Yields
+    ------
+    t : float
+        The time at the start of the step.
+    h : float
+        The size of the step.
+    angle : float
+        The angle at the end of the step.
+    angularVelocity : float
+        The angular velocity at the end of the step.
+    interpolate : function
+        Called as interpolate(s), returning the angle and angular velocity
+        a time s after the start of the step, where s is from 0 to h.
+    """
+    if engine in FIXED_STEP_ENGINES:
+        evaluations = RHS_EVALUATIONS[engine]
+        step = 0
+        while True:
+            def interpolate(s, start = (angle, angularVelocity)):
+                return stepPendulum(engine, s, *start, consts)
+
+            angle, angularVelocity = stepPendulum(
+                engine, dt, angle, angularVelocity, consts)
+            if stats is not None:
+                stats.steps += 1
+                stats.rhsEvaluations += evaluations
+            yield step * dt, dt, angle, angularVelocity, interpolate
+            step += 1
+    elif engine == "rk45":
+        for t, h, oldState, newState, ks in adaptiveSteps(
+                dESimplePendulum, [angle, angularVelocity], consts, rtol,
+                atol, stats):
+            def interpolate(s, oldState = oldState, h = h, ks = ks):
+                return tuple(denseOutput(oldState, h, ks, s / h))
+
+            yield t, h, newState[0], newState[1], interpolate
+    elif engine == "exact":
+        g, length = consts
+        initial = (angle, angularVelocity)
+        # Steps are found in blocks, as exactPendulum is vectorised, and
+        # unwrapped from the angle before them.
+        step = 0
+        while True:
+            angles, angularVelocities = exactPendulum(
+                length, *initial, np.arange(step + 1, step + 1025) * dt, g)
+            angles = np.unwrap(np.concatenate(([angle], angles)))[1:]
+
+            for i in range(1024):
+                def interpolate(s, t = (step + i) * dt, start = angle):
+                    angle, angularVelocity = exactPendulum(
+                        length, *initial, t + s, g)
+                    return (start + normaliseAngles(angle - start),
+                            angularVelocity)
+
+                angle = angles[i]
+                angularVelocity = angularVelocities[i]
+                yield (step + i) * dt, dt, angle, angularVelocity, interpolate
+            step += 1024
+    else:
+        checkEngine(engine)
+
+
+def checkEngine(engine):
+    """
+    Raises a ValueError if engine isn't one of ENGINES.
+
+    Parameters
+    ----------
+    engine : any
+        The name of the integrator being checked.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"engine must be one of {ENGINES}, yet it's "
+                         f"{engine}.")
+
+
+class Event:
+    """
+    A class representing something to look for during a simulation, an
+    event, which happens whenever function(t, angle, angularVelocity)
+    crosses zero. See turningPoint and angleCrossing.
+
+    Parameters
+    ----------
+    name : str
+        The name the event is logged under.
+    function : function
+        Called as function(t, angle, angularVelocity), the angle not
+        normalised, returning a value which crosses zero at the event. It
+        should be continuous, as a sign change across a jump isn't counted.
+    terminal : bool, optional
+        If True, the simulation stops at the first occurrence.
+        The default is False.
+    direction : int, optional
+        If 1, only occurrences where the function goes from negative to
+        positive are counted, if -1 only positive to negative, and if 0
+        both.
+        The default is 0.
+    """
+
+    def __init__(self, name, function, terminal = False, direction = 0):
+        if direction not in (-1, 0, 1):
+            raise ValueError("direction must be -1, 0 or 1, yet it's "
+                             f"{direction}.")
+
+        self.name = name
+        self.function = function
+        self.terminal = terminal
+        self.direction = direction
+
+    def __str__(self):
+        return (f"Event Name: {self.name}, Event Terminal: {self.terminal}, "
+                f"Event Direction: {self.direction}.")
+
+
+def turningPoint(terminal = False, direction = 0):
+    """
+    An event for when the pendulum stops and turns back, where its angular
+    velocity crosses zero.
+
+    Parameters
+    ----------
+    terminal : bool, optional
+        If True, the simulation stops at the first turning point.
+        The default is False.
+    direction : int, optional
+        As for Event, 1 for the angular velocity going from negative to
+        positive, -1 for positive to negative.
+        The default is 0.
+
+    Returns
+    -------
+    Event class
+        The event, named "turningPoint".
+    """
+    return Event("turningPoint",
+                 lambda t, angle, angularVelocity: angularVelocity,
+                 terminal, direction)
+
+
+def angleCrossing(angle, terminal = False, direction = 0):
+    """
+    An event for when the pendulum passes through an angle, in either
+    direction.
+
+    Parameters
+    ----------
+    angle : float
+        The angle in radians.
+    terminal : bool, optional
+        If True, the simulation stops at the first crossing.
+        The default is False.
+    direction : int, optional
+        As for Event, 1 for crossings with the angle increasing, -1 for
+        crossings with it decreasing.
+        The default is 0.
+
+    Returns
+    -------
+    Event class
+        The event, named "angleCrossing" followed by the angle.
+    """
+    angle = np.float64(angle)
+
+    # The difference wraps from pi to -pi half way round, which isn't a
+    # root, and is ignored by findEvents as it's a jump.
+    return Event(f"angleCrossing {angle}",
+                 lambda t, angles, angularVelocities: normaliseAngles(
+                     angles - angle),
+                 terminal, direction)
+
+
+# Number of bisections used by findEvents, enough to reach the precision of
+# a float64 within a step.
+EVENT_BISECTIONS = 52
+
+
+def findEvents(events, t, h, before, after, interpolate):
+    """
+    Finds every occurrence of each event within one integration step. The
+    step is bracketed by the values of each event function at either end of
+    it, and wherever one changes sign, the time it crosses zero is found by
+    bisection on the integrator's own solution within the step, see
+    integrateSteps, rather than just taking the nearest step.
+
+    Parameters
+    ----------
+    events : list of Event class
+        The events to look for.
+    t : float
+        The time at the start of the step, in seconds.
+    h : float
+        The size of the step, in seconds.
+    before : list of float
+        The value of each event function at the start of the step.
+    after : list of float
+        The value of each event function at the end of the step.
+    interpolate : function
+        Called as interpolate(s), returning the angle, not normalised, and
+        the angular velocity a time s after the start of the step.
+
+    Returns
+    -------
+    log : list of dict
+        Each occurrence, in order of time, with its "name", "t", "angle",
+        normalised, "angularVelocity" and whether it's "terminal". Nothing
+        after the first terminal occurrence is included.
+    """
+    log = []
+    for event, old, new in zip(events, before, after):
+        # An occurrence needs the function to be non zero before, and zero or
+        # the opposite sign after, so a root exactly on a step is only
+        # counted once, and one at the start isn't counted.
+        rising = old < 0 and new >= 0
+        falling = old > 0 and new <= 0
+        if event.direction == 1:
+            crossed = rising
+        elif event.direction == -1:
+            crossed = falling
+        else:
+            crossed = rising or falling
+        if not crossed:
+            continue
+
+        # The sign of the function at the start of the step decides which
+        # half the root is in.
+        sign = np.sign(old)
+        low = 0
+        high = h
+        for _ in range(EVENT_BISECTIONS):
+            middle = (low + high) / 2
+            if np.sign(event.function(t + middle,
+                                      *interpolate(middle))) == sign:
+                low = middle
+            else:
+                high = middle
+
+        angle, angularVelocity = interpolate(high)
+        value = np.abs(event.function(t + high, angle, angularVelocity))
+        # A jump, rather than a root, is still as far from zero as the
+        # steps either side of it. Roots within rounding of the start are
+        # left out too, as the start isn't an event.
+        if (value > 1e-6 * max(np.abs(old), np.abs(new)) + 1e-12 or
+                t + high <= 1e-9 * h):
+            continue
+
+        log.append({"name": event.name,
+                    "t": float(t + high),
+                    "angle": float(normaliseAngles(angle)),
+                    "angularVelocity": float(angularVelocity),
+                    "terminal": bool(event.terminal)})
+
+    log.sort(key = lambda occurrence: occurrence["t"])
+    for i, occurrence in enumerate(log):
+        if occurrence["terminal"]:
+            return log[:i + 1]
+
+    return log
+
+
+def simulatePendulum(pendulum,
+                     intervalTime = 0.0125,
+                     g = -9.81,
+                     maxFrames = 2000,
+                     engine = "rk4",
+                     rtol = 1e-6,
+                     atol = 1e-9,
+                     symmetric = False,
+                     dt = None,
+                     fps = None,
+                     progress = None,
+                     cancel = None,
+                     stats = None,
+                     events = None):
+    """
+    Simulates the motion of a simple pendulum without a damping or driving
+    force, uses the Runge Kutta algorithm to solve the differential equation
+    for a simple pendulum. Produces x and y coordinates for the motion of the
+    pendulum. It will attempt to return one period of motion.
+
+    The time between integration steps, dt, and the time between frames,
+    1 / fps, both default to intervalTime. When they differ, the frames are
+    found from the steps either side of them with hermiteInterpolate, so
+    the pendulum can be integrated finely while only keeping as many frames
+    as are needed for playback, or coarsely while still playing smoothly.
+
+    Parameters
+    ----------
+    pendulum : Pendulum class
+        A class representing a point mass attached to a rigid string, the
+        pendulum whose motion this function simulates.
+    intervalTime : float, optional
+        The time bewteen calculations, in seconds.
+        The default is 0.0125.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    maxFrames : int, optional
+        The maximum number of frames to simulate, only used when the period is
+        longer, or infinite.
+        The default is 2000.
+    engine : str, optional
+        The integrator to use, one of ENGINES, see integrateFrames.
+        The default is "rk4".
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+    symmetric : bool, optional
+        If True, and the pendulum is released from rest while swinging back
+        and forth, only a quarter of the period is integrated and the rest
+        mirrored from it, see mirrorQuarter. Otherwise the whole period is
+        integrated.
+        The default is False.
+    dt : float, optional
+        The time between integration steps, in seconds. If None,
+        intervalTime.
+        The default is None.
+    fps : float, optional
+        The number of frames per second. If None, 1 / intervalTime. maxFrames
+        counts these frames.
+        The default is None.
+    progress : function, optional
+        Called as progress(done, total) every PROGRESS_FRAMES frames
+        integrated.
+        The default is None.
+    cancel : threading.Event, optional
+        Anything with an is_set method, checked every PROGRESS_FRAMES frames,
+        once set the simulation stops and raises SimulationCancelled.
+        The default is None.
+    stats : SimulationStats class, optional
+        Filled in with the number of steps taken, the time spent on each
+        phase, why the simulation stopped and so on. If None, stats are only
+        recorded if there are any statsHooks.
+        The default is None.
+    events : list of Event class, optional
+        Events to look for, such as turningPoint() or angleCrossing(angle),
+        found to within rounding after every integration step by
+        integrateEvents. Every occurrence is logged in the trajectory's
+        events. The simulation stops at the first occurrence of a terminal
+        event, with the pendulum left in its state at that moment, and only
+        the frames before it. As events are looked for while integrating,
+        symmetric is ignored, and frames between steps are found with the
+        engine itself rather than hermiteInterpolate.
+        The default is None.
+
+    Returns
+    -------
+    trajectory : Trajectory class
+        The time, angle, angular velocity and x and y coordinates of the
+        pendulum at every frame.
+    """
+    if not isinstance(pendulum, Pendulum):
+        raise ValueError("pendulum parameter must be a Pendulum object. Yet "
+                         f"it is {type(pendulum)}")
+    checkEngine(engine)
+    if dt is None:
+        dt = intervalTime
+    # Time between calculations must be small.
+    if dt > 0.1:
+        raise ValueError("Time between calculations must be "
+                         "less than or equal to 0.1 seconds, it was "
+                         f"instead {dt} seconds.")
+    else:
+        dt = np.float64(dt)
+    if fps is None:
+        intervalTime = np.float64(intervalTime)
+    elif fps <= 0:
+        raise ValueError("Frames per second must be greater than zero, yet "
+                         f"it's {fps}.")
+    else:
+        intervalTime = np.float64(1 / fps)
+    # maxFrames must be positive.
+    if maxFrames <= 0:
+        raise ValueError("Maximum number of frames must be greater than or "
+                         f"equal to zero, yet it's {maxFrames}.")
+    else:
+        maxFrames = np.int64(maxFrames)
+    g = np.float64(g)
+    if stats is None and statsHooks:
+        stats = SimulationStats()
+    if stats is not None:
+        stats.engine = engine
+        stats.lap()
+
+    pendulum.normaliseAngle()
+    # The period is known up front, so the number of frames is too.
+    frameCount = int(periodFrames(pendulum.length, pendulum.angle,
+                                  pendulum.angularVelocity, intervalTime, g,
+                                  maxFrames))
+    if stats is not None:
+        stats.termination = terminationReason(
+            pendulum.length, pendulum.angle, pendulum.angularVelocity,
+            intervalTime, g, maxFrames)
+        stats.lap("termination")
+    initial = (pendulum.angle, pendulum.angularVelocity)
+
+    # Every frame, and the state after the last.
+    times = np.arange(frameCount + 1) * intervalTime
+    consts = [g, pendulum.length]
+    log = []
+    if events:
+        # The exact engine has no steps of its own, so it's evaluated at
+        # every frame.
+        angles, angularVelocities, log = integrateEvents(
+            engine, pendulum.angle, pendulum.angularVelocity,
+            intervalTime if engine == "exact" else dt, consts, times, events,
+            rtol, atol, progress, cancel, stats)
+        if log and log[-1]["terminal"]:
+            frameCount = len(angles) - 1
+            times = times[:frameCount + 1]
+            if stats is not None:
+                stats.termination = "event"
+    elif engine == "exact":
+        angles, angularVelocities = exactPendulum(
+            pendulum.length, pendulum.angle, pendulum.angularVelocity, times,
+            g)
+    elif symmetric and isMirrorable(pendulum.length, pendulum.angle,
+                                    pendulum.angularVelocity, g):
+        angles, angularVelocities = mirrorQuarter(
+            engine, pendulum.angle, times, dt, consts, rtol, atol,
+            progress, cancel, stats)
+    elif dt == intervalTime:
+        angles, angularVelocities = integrateStates(
+            engine, pendulum.angle, pendulum.angularVelocity, intervalTime,
+            consts, frameCount + 1, rtol, atol, progress, cancel, stats)
+    else:
+        angles, angularVelocities = resampleStates(
+            engine, pendulum.angle, pendulum.angularVelocity, dt, consts,
+            times, rtol, atol, progress, cancel, stats)
+    if stats is not None:
+        stats.lap("integration")
+
+    pendulum.angle = angles[-1]
+    pendulum.angularVelocity = angularVelocities[-1]
+    pendulum.normaliseAngle()
+    normalised = normaliseAngles(angles[:-1])
+    if stats is not None:
+        stats.lap("normalisation")
+
+    trajectory = Trajectory(pendulum.length, pendulum.pendCoor, frameCount)
+    trajectory.extend(times[:-1], normalised, angularVelocities[:-1])
+    trajectory.events = log
+
+    if stats is not None:
+        stats.frames = frameCount
+        stats.lap("conversion")
+
+        energy = pendulumEnergy(pendulum.length, normalised,
+                                angularVelocities[:-1], g)
+        initialEnergy = pendulumEnergy(pendulum.length, *initial, g)
+        scale = max(np.abs(initialEnergy), np.abs(g) * pendulum.length)
+        if scale > 0:
+            stats.maxEnergyDrift = float(
+                np.max(np.abs(energy - initialEnergy)) / scale)
+        stats.lap("diagnostics")
+
+        for hook in statsHooks:
+            hook(stats)
+
+    return trajectory
+
+
+# How often, in frames, simulations report progress and check whether
+# they've been cancelled.
+PROGRESS_FRAMES = 256
+
+
+def integrateStates(engine, angle, angularVelocity, intervalTime, consts,
+                    count, rtol = 1e-6, atol = 1e-9, progress = None,
+                    cancel = None, stats = None):
+    """
+    Integrates the motion of a simple pendulum with the chosen engine,
+    collecting the states at each frame into arrays.
+
+    Parameters
+    ----------
+    engine : str
+        The integrator to use, see integrateFrames.
+    angle : float
+        The initial angle in radians.
+    angularVelocity : float
+        The initial angular velocity.
+    intervalTime : float
+        The time bewteen frames, in seconds.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+    count : int
+        The number of states, including the initial one.
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+    progress : function, optional
+        Called as progress(done, count) every PROGRESS_FRAMES states.
+        The default is None.
+    cancel : threading.Event, optional
+        Checked every PROGRESS_FRAMES states, once set SimulationCancelled is
+        raised.
+        The default is None.
+    stats : SimulationStats class, optional
+        Passed on to integrateFrames.
+        The default is None.
+
+    Returns
+    -------
+    angles : numpy ndarray
+        The angle at each frame, not normalised.
+    angularVelocities : numpy ndarray
+        The angular velocity at each frame.
+    """
+    frames = integrateFrames(engine, angle, angularVelocity, intervalTime,
+                             consts, rtol, atol, stats)
+    angles = np.empty(count)
+    angularVelocities = np.empty(count)
+
+    for i in range(count):
+        angles[i] = angle
+        angularVelocities[i] = angularVelocity
+        if i < count - 1:
+            angle, angularVelocity = next(frames)
+
+        if i % PROGRESS_FRAMES == PROGRESS_FRAMES - 1 or i == count - 1:
+            if cancel is not None and cancel.is_set():
+                raise SimulationCancelled("Simulation cancelled after "
+                                          f"{i + 1} of {count} frames.")
+            if progress is not None:
+                progress(i + 1, count)
+
+    return angles, angularVelocities
+
+
+def resampleStates(engine, angle, angularVelocity, dt, consts, times,
+                   rtol = 1e-6, atol = 1e-9, progress = None, cancel = None,
+                   stats = None):
+    """
+    Integrates the motion of a simple pendulum with the chosen engine, only
+    keeping the states at the given times, which are found with
+    hermiteInterpolate from the integration steps either side of them. Only
+    two steps are held at once, so however small dt is, the memory used
+    only depends on the number of times.
+
+    Parameters
+    ----------
+    engine : str
+        The integrator to use, see integrateFrames.
+    angle : float
+        The initial angle in radians.
+    angularVelocity : float
+        The initial angular velocity.
+    dt : float
+        The time bewteen integration steps, in seconds.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+    times : numpy ndarray
+        The times of the frames, in seconds, increasing from zero.
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+    progress : function, optional
+        Called as progress(done, count), with the number of frames found,
+        every PROGRESS_FRAMES steps.
+        The default is None.
+    cancel : threading.Event, optional
+        Checked every PROGRESS_FRAMES steps, once set SimulationCancelled is
+        raised.
+        The default is None.
+    stats : SimulationStats class, optional
+        Passed on to integrateFrames.
+        The default is None.
+
+    Returns
+    -------
+    angles : numpy ndarray
+        The angle at each time, not normalised.
+    angularVelocities : numpy ndarray
+        The angular velocity at each time.
+    """
+    steps = integrateFrames(engine, angle, angularVelocity, dt, consts, rtol,
+                            atol, stats)
+    count = len(times)
+    angles = np.empty(count)
+    angularVelocities = np.empty(count)
+
+    old = (angle, angularVelocity,
+           dESimplePendulumAngularVelocity(consts, angle))
+    frame = 0
+    step = 0
+    while frame < count:
+        angle, angularVelocity = next(steps)
+        new = (angle, angularVelocity,
+               dESimplePendulumAngularVelocity(consts, angle))
+        step += 1
+
+        end = step * dt
+        if times[frame] < end:
+            last = frame + int(np.searchsorted(times[frame:], end))
+            t = times[frame:last] - (step - 1) * dt
+            angles[frame:last] = hermiteInterpolate(
+                dt, np.array([old[0], new[0]]), np.array([old[1], new[1]]),
+                t)
+            angularVelocities[frame:last] = hermiteInterpolate(
+                dt, np.array([old[1], new[1]]), np.array([old[2], new[2]]),
+                t)
+            frame = last
+        old = new
+
+        if step % PROGRESS_FRAMES == 0 or frame == count:
+            if cancel is not None and cancel.is_set():
+                raise SimulationCancelled("Simulation cancelled after "
+                                          f"{frame} of {count} frames.")
+            if progress is not None:
+                progress(frame, count)
+
+    return angles, angularVelocities
+
+
+def integrateEvents(engine, angle, angularVelocity, dt, consts, times,
+                    events, rtol = 1e-6, atol = 1e-9, progress = None,
+                    cancel = None, stats = None):
+    """
+    Integrates the motion of a simple pendulum with integrateSteps, keeping
+    the states at the given times, while looking for events with findEvents
+    after every step. Integration stops at the first terminal event, so
+    nothing after it is simulated.
+
+    Parameters
+    ----------
+    engine : str
+        The integrator to use, see integrateFrames.
+    angle : float
+        The initial angle in radians.
+    angularVelocity : float
+        The initial angular velocity.
+    dt : float
+        The time bewteen integration steps, in seconds.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+    times : numpy ndarray
+        The times of the frames, in seconds, increasing from zero. Events
+        after the last time aren't looked for.
+    events : list of Event class
+        The events to look for.
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+    progress : function, optional
+        Called as progress(done, count), with the number of frames found,
+        every PROGRESS_FRAMES steps.
+        The default is None.
+    cancel : threading.Event, optional
+        Checked every PROGRESS_FRAMES steps, once set SimulationCancelled is
+        raised.
+        The default is None.
+    stats : SimulationStats class, optional
+        Passed on to integrateSteps.
+        The default is None.
+
+    Returns
+    -------
+    angles : numpy ndarray
+        The angle at each time before the first terminal event, followed by
+        the angle at the event, normalised. If there isn't one, the angle at
+        every time, not normalised.
+    angularVelocities : numpy ndarray
+        The angular velocity at the same times.
+    log : list of dict
+        Every occurrence of the events, as returned by findEvents, ending at
+        the first terminal one.
+    """
+    steps = integrateSteps(engine, angle, angularVelocity, dt, consts, rtol,
+                           atol, stats)
+    count = len(times)
+    angles = np.empty(count)
+    angularVelocities = np.empty(count)
+    angles[0] = angle
+    angularVelocities[0] = angularVelocity
+
+    values = [event.function(times[0], angle, angularVelocity)
+              for event in events]
+    log = []
+    frame = 1
+    step = 0
+    while frame < count:
+        t, h, angle, angularVelocity, interpolate = next(steps)
+        step += 1
+
+        # Frames landing on the end of the step, as they all do when the
+        # steps are the frames, are taken from it directly.
+        end = t + h
+        while frame < count and times[frame] <= end:
+            if times[frame] == end:
+                angles[frame] = angle
+                angularVelocities[frame] = angularVelocity
+            else:
+                angles[frame], angularVelocities[frame] = interpolate(
+                    times[frame] - t)
+            frame += 1
+
+        newValues = [event.function(end, angle, angularVelocity)
+                     for event in events]
+        found = [occurrence for occurrence in
+                 findEvents(events, t, h, values, newValues, interpolate)
+                 if occurrence["t"] <= times[-1]]
+        values = newValues
+        log.extend(found)
+        if found and found[-1]["terminal"]:
+            # The frames before the event, and the state at it.
+            last = int(np.searchsorted(times, found[-1]["t"]))
+            angles[last] = found[-1]["angle"]
+            angularVelocities[last] = found[-1]["angularVelocity"]
+            return angles[:last + 1], angularVelocities[:last + 1], log
+
+        if step % PROGRESS_FRAMES == 0 or frame == count:
+            if cancel is not None and cancel.is_set():
+                raise SimulationCancelled("Simulation cancelled after "
+                                          f"{frame} of {count} frames.")
+            if progress is not None:
+                progress(frame, count)
+
+    return angles, angularVelocities, log
+
+
+def hermiteInterpolate(h, values, derivatives, t):
+    """
+    Cubic Hermite interpolation between samples taken every h seconds, using
+    both the value and its derivative at each sample, which for a pendulum
+    are known anyway, the angular velocity being the derivative of the
+    angle and so on.
+
+    Parameters
+    ----------
+    h : float
+        The time between samples, the first at a time of zero.
+    values : numpy ndarray
+        The value at each sample, needs at least two samples.
+    derivatives : numpy ndarray
+        The derivative of the value at each sample.
+    t : float or numpy ndarray
+        The times to interpolate at, within the samples.
+
+    Returns
+    -------
+    numpy ndarray
+        The interpolated values.
+    """
+    t = np.float64(t)
+    i = np.clip(np.floor(t / h).astype(np.int64), 0, len(values) - 2)
+    x = t / h - i
+    x2 = x * x
+    x3 = x2 * x
+
+    return ((2 * x3 - 3 * x2 + 1) * values[i] +
+            (x3 - 2 * x2 + x) * h * derivatives[i] +
+            (-2 * x3 + 3 * x2) * values[i + 1] +
+            (x3 - x2) * h * derivatives[i + 1])
+
+
+def isMirrorable(length, angle, angularVelocity, g):
+    """
+    Checks whether mirrorQuarter can be used, which needs the pendulum to be
+    released from rest, at a turning point, while swinging back and forth.
+
+    Parameters
+    ----------
+    length : float
+        Length of the pendulum string.
+    angle : float
+        The initial angle in radians, normalised.
+    angularVelocity : float
+        The initial angular velocity.
+    g : float
+        The gravitational acceleration in SI units.
+
+    Returns
+    -------
+    bool
+        True if the motion can be mirrored.
+    """
+    period = pendulumPeriod(length, angle, angularVelocity, g)
+    static = angle == 0 or np.abs(angle) == np.pi
+
+    return bool(angularVelocity == 0 and g != 0 and not static and
+                np.isfinite(period))
+
+
+def mirrorQuarter(engine, angle, times, intervalTime, consts, rtol = 1e-6,
+                  atol = 1e-9, progress = None, cancel = None, stats = None):
+    """
+    Finds the motion of a pendulum released from rest, while swinging back
+    and forth, by only integrating from the turning point down to the
+    bottom, a quarter of the period. The rest of the period is the same
+    quarter reflected about the bottom and reversed in time. Frames which
+    don't land on an integrated step are found with hermiteInterpolate.
+
+    Parameters
+    ----------
+    engine : str
+        The integrator to use, see integrateFrames.
+    angle : float
+        The initial angle in radians, normalised, a turning point.
+    times : numpy ndarray
+        The times of the frames, in seconds.
+    intervalTime : float
+        The time bewteen integration steps, in seconds.
+    consts : list
+        Holds variables for g and the length of the pendulum, both in SI units.
+        g at index 0, and length at index 1.
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+    progress : function, optional
+        Passed on to integrateStates.
+        The default is None.
+    cancel : threading.Event, optional
+        Passed on to integrateStates.
+        The default is None.
+    stats : SimulationStats class, optional
+        Passed on to integrateStates.
+        The default is None.
+
+    Returns
+    -------
+    angles : numpy ndarray
+        The angle at each time, in radians.
+    angularVelocities : numpy ndarray
+        The angular velocity at each time.
+    """
+    g, length = consts
+    quarter = pendulumPeriod(length, angle, 0, g) / 4
+    steps = int(np.ceil(quarter / intervalTime)) + 1
+    quarterAngles, quarterAngularVelocities = integrateStates(
+        engine, angle, 0, intervalTime, consts, steps + 1, rtol, atol,
+        progress, cancel, stats)
+
+    # Angles are measured from the stable equilibrium, about which the
+    # motion is symmetric.
+    stableAngle = 0 if g >= 0 else np.pi
+    quarterAngles = normaliseAngles(quarterAngles - stableAngle)
+    accelerations = dESimplePendulumAngularVelocity(
+        consts, quarterAngles + stableAngle)
+
+    # Each quarter of the period is mirrored from the first, in time and in
+    # angle or angular velocity.
+    times = np.remainder(times, 4 * quarter)
+    second = (times > quarter) & (times <= 2 * quarter)
+    third = (times > 2 * quarter) & (times <= 3 * quarter)
+    fourth = times > 3 * quarter
+    quarterTimes = np.select([second, third, fourth],
+                             [2 * quarter - times, times - 2 * quarter,
+                              4 * quarter - times], times)
+    angleSigns = np.where(second | third, -1, 1)
+    angularVelocitySigns = np.where(third | fourth, -1, 1)
+
+    angles = angleSigns * hermiteInterpolate(
+        intervalTime, quarterAngles, quarterAngularVelocities, quarterTimes)
+    angularVelocities = angularVelocitySigns * hermiteInterpolate(
+        intervalTime, quarterAngularVelocities, accelerations, quarterTimes)
+
+    return normaliseAngles(angles + stableAngle), angularVelocities
+
+
+def iterSimulation(pendulum,
+                   g = -9.81,
+                   intervalTime = 0.0125,
+                   chunkSize = 1024,
+                   engine = "rk4",
+                   rtol = 1e-6,
+                   atol = 1e-9):
+    """
+    Simulates the motion of a simple pendulum indefinitely, in the same way
+    as simulatePendulum, but yields the frames in chunks as they're made
+    instead of stopping after one period. Only one chunk is held at a time,
+    so memory use stays constant however long the simulation runs for. The
+    pendulum itself isn't changed.
+
+    Parameters
+    ----------
+    pendulum : Pendulum class
+        A class representing a point mass attached to a rigid string, the
+        pendulum whose motion this function simulates.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    intervalTime : float, optional
+        The time bewteen calculations, in seconds.
+        The default is 0.0125.
+    chunkSize : int, optional
+        The number of frames in each chunk.
+        The default is 1024.
+    engine : str, optional
+        The integrator to use, one of ENGINES, see integrateFrames.
+        The default is "rk4".
+    rtol : float, optional
+        The relative tolerance, only used by adaptive engines.
+        The default is 1e-6.
+    atol : float, optional
+        The absolute tolerance, only used by adaptive engines.
+        The default is 1e-9.
+
+    Yields
+    ------
+    trajectory : Trajectory class
+        The next chunkSize frames of the motion, times carry on from the
+        previous chunk.
+    """
+    if not isinstance(pendulum, Pendulum):
+        raise ValueError("pendulum parameter must be a Pendulum object. Yet "
+                         f"it is {type(pendulum)}")
+    if intervalTime > 0.1:
+        raise ValueError("Time between calculations must be "
+                         "less than or equal to 0.1 seconds, it was "
+                         f"instead {intervalTime} seconds.")
+    if chunkSize <= 0:
+        raise ValueError("Chunk size must be greater than zero, yet it's "
+                         f"{chunkSize}.")
+    checkEngine(engine)
+    intervalTime = np.float64(intervalTime)
+    g = np.float64(g)
+
+    frames = integrateFrames(engine, pendulum.angle, pendulum.angularVelocity,
+                             intervalTime, [g, pendulum.length], rtol, atol)
+    angle = pendulum.angle
+    angularVelocity = pendulum.angularVelocity
+    frame = 0
+    while True:
+        chunk = Trajectory(pendulum.length, pendulum.pendCoor, chunkSize)
+        for _ in range(chunkSize):
+            chunk.append(frame * intervalTime, angle, angularVelocity)
+            frame += 1
+            angle, angularVelocity = next(frames)
+
+        # Angles are only normalised once per chunk, the engines don't need
+        # them to be.
+        chunk.angle[:] = normaliseAngles(chunk.angle)
+
+        yield chunk
+
+
+def ellipticK(m):
+    """
+    The complete elliptic integral of the first kind, K(m), calculated from
+    the arithmetic geometric mean of 1 and sqrt(1 - m), which converges in a
+    handful of iterations.
+
+    Parameters
+    ----------
+    m : float or numpy ndarray
+        The parameter of the integral, the square of the modulus, should be
+        less than or equal to one.
+
+    Returns
+    -------
+    float or numpy ndarray
+        K(m), which is infinite when m is one.
+    """
+    m = np.float64(m)
+    a = np.ones_like(m)
+    with np.errstate(invalid = 'ignore'):
+        b = np.sqrt(1 - m)
+
+        for _ in range(32):
+            # Comparisons with NaN are False, so invalid m can't stop the loop
+            # from ending.
+            if not np.any(np.abs(a - b) > 1e-15 * a):
+                break
+            a, b = (a + b) / 2, np.sqrt(a * b)
+
+    with np.errstate(divide = 'ignore'):
+        return np.where(m == 1, np.inf, np.pi / (2 * a))
+
+
+# How close to the separatrix, the boundary between swinging back and forth
+# and completing full circles, a pendulum is treated as being on it.
+SEPARATRIX_TOLERANCE = 1e-12
+
+
+def pendulumPeriod(length, angle, angularVelocity, g = -9.81):
+    """
+    The exact period of a simple pendulum, found from its energy using the
+    complete elliptic integral of the first kind. For a pendulum swinging
+    back and forth (libration) this is the time to return to the same
+    state, for a pendulum completing full circles (rotation) it's the time
+    to complete one circle. On the separatrix, where the pendulum takes
+    forever to reach the top, the period is infinite.
+
+    Parameters
+    ----------
+    length : float or numpy ndarray
+        Length of the pendulum string.
+    angle : float or numpy ndarray
+        The angle in radians.
+    angularVelocity : float or numpy ndarray
+        The angular velocity.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+
+    Returns
+    -------
+    float or numpy ndarray
+        The period in seconds.
+    """
+    length = np.float64(length)
+    angle = np.float64(angle)
+    angularVelocity = np.float64(angularVelocity)
+    k = np.abs(g) / length
+    # The stable equilibrium is at an angle of zero when g is positive, and
+    # at pi when g is negative.
+    stableAngle = angle if g >= 0 else angle - np.pi
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        # m is the energy relative to the energy at the separatrix.
+        m = np.sin(stableAngle / 2) ** 2 + angularVelocity ** 2 / (4 * k)
+        libration = 4 * ellipticK(m) / np.sqrt(k)
+        rotation = 2 * ellipticK(1 / m) / np.sqrt(k * m)
+
+        period = np.where(m < 1, libration, rotation)
+        period = np.where(np.abs(m - 1) <= SEPARATRIX_TOLERANCE, np.inf,
+                          period)
+        # Without gravity the pendulum just spins at a constant rate.
+        period = np.where(k == 0, 2 * np.pi / np.abs(angularVelocity),
+                          period)
+
+    return period
+
+
+def carlsonRF(x, y, z):
+    """
+    Carlson's symmetric elliptic integral of the first kind, RF(x, y, z),
+    found by repeatedly applying the duplication theorem until x, y and z
+    are close enough together for a short series to be exact.
+
+    Parameters
+    ----------
+    x, y, z : float or numpy ndarray
+        The arguments, should be non negative, with at most one zero.
+
+    Returns
+    -------
+    float or numpy ndarray
+        RF(x, y, z).
+    """
+    x, y, z = np.broadcast_arrays(np.float64(x), np.float64(y),
+                                  np.float64(z))
+
+    for _ in range(32):
+        mean = (x + y + z) / 3
+        if not np.any(np.maximum(np.maximum(np.abs(mean - x),
+                                            np.abs(mean - y)),
+                                 np.abs(mean - z)) > 1e-4 * mean):
+            break
+        lam = np.sqrt(x * y) + np.sqrt(y * z) + np.sqrt(z * x)
+        x, y, z = (x + lam) / 4, (y + lam) / 4, (z + lam) / 4
+
+    mean = (x + y + z) / 3
+    dx, dy = 1 - x / mean, 1 - y / mean
+    dz = -dx - dy
+    e2 = dx * dy - dz ** 2
+    e3 = dx * dy * dz
+
+    return ((1 - e2 / 10 + e3 / 14 + e2 ** 2 / 24 - 3 * e2 * e3 / 44) /
+            np.sqrt(mean))
+
+
+def ellipticF(phi, m):
+    """
+    The incomplete elliptic integral of the first kind, F(phi, m), the
+    inverse of the Jacobi amplitude.
+
+    Parameters
+    ----------
+    phi : float or numpy ndarray
+        The amplitude, between -pi/2 and pi/2, in radians.
+    m : float or numpy ndarray
+        The parameter, between zero and one.
+
+    Returns
+    -------
+    float or numpy ndarray
+        F(phi, m).
+    """
+    s = np.sin(phi)
+    return s * carlsonRF(np.cos(phi) ** 2, 1 - m * s ** 2, 1)
+
+
+def jacobiElliptic(u, m):
+    """
+    The Jacobi elliptic functions sn, cn and dn, found with the descending
+    Landen transformation, the same arithmetic geometric mean used by
+    ellipticK, followed by a recurrence back down to the amplitude.
+
+    Parameters
+    ----------
+    u : float or numpy ndarray
+        The argument.
+    m : float or numpy ndarray
+        The parameter, between zero and one.
+
+    Returns
+    -------
+    sn, cn, dn : float or numpy ndarray
+        The Jacobi elliptic functions of u.
+    """
+    u, m = np.broadcast_arrays(np.float64(u), np.float64(m))
+    separatrix = np.abs(m - 1) <= SEPARATRIX_TOLERANCE
+    m = np.where(separatrix, 0, m)
+
+    # sn and cn repeat every 4K, reducing u keeps the amplitude small, and
+    # so accurate, far into a simulation.
+    quarter = ellipticK(m)
+    u = np.where(separatrix, u, np.remainder(u, 4 * quarter))
+
+    a = np.ones_like(m)
+    b = np.sqrt(1 - m)
+    ratios = []
+    for _ in range(32):
+        if not np.any(np.abs(a - b) > 1e-15 * a):
+            break
+        ratios.append((a - b) / (a + b))
+        a, b = (a + b) / 2, np.sqrt(a * b)
+
+    amplitude = 2 ** len(ratios) * a * u
+    for ratio in reversed(ratios):
+        # c / a at each level of the mean is (a - b) / (a + b) of the level
+        # above.
+        amplitude = (amplitude + np.arcsin(ratio * np.sin(amplitude))) / 2
+
+    sn = np.sin(amplitude)
+    cn = np.cos(amplitude)
+    dn = np.sqrt(1 - m * sn ** 2)
+
+    # On the separatrix the functions become hyperbolic.
+    sech = 1 / np.cosh(u)
+    sn = np.where(separatrix, np.tanh(u), sn)
+    cn = np.where(separatrix, sech, cn)
+    dn = np.where(separatrix, sech, dn)
+
+    return sn, cn, dn
+
+
+def exactPendulum(length, angle, angularVelocity, t, g = -9.81):
+    """
+    The exact motion of a simple pendulum, without a damping or driving
+    force, from its solution in Jacobi elliptic functions. Every time is
+    evaluated at once, with no time stepping, so any frame can be found
+    directly, and it's a reference for checking the integrators against.
+
+    Parameters
+    ----------
+    length : float
+        Length of the pendulum string.
+    angle : float
+        The initial angle in radians.
+    angularVelocity : float
+        The initial angular velocity.
+    t : float or numpy ndarray
+        The times to find the motion at, in seconds.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+
+    Returns
+    -------
+    angles : numpy ndarray
+        The normalised angle at each time, in radians.
+    angularVelocities : numpy ndarray
+        The angular velocity at each time.
+    """
+    t = np.float64(t)
+    k = np.abs(g) / length
+
+    if k == 0:
+        # Without gravity the pendulum just spins at a constant rate.
+        return (normaliseAngles(angle + angularVelocity * t),
+                np.full_like(t, angularVelocity))
+
+    # The stable equilibrium is at an angle of zero when g is positive, and
+    # at pi when g is negative. Motion with a negative angular velocity is a
+    # mirror image of motion with a positive one.
+    stableAngle = normaliseAngles(angle if g >= 0 else angle - np.pi)
+    direction = -1 if angularVelocity < 0 else 1
+    stableAngle *= direction
+    angularVelocity *= direction
+
+    m = np.sin(stableAngle / 2) ** 2 + angularVelocity ** 2 / (4 * k)
+    if m == 0:
+        # At rest at the stable equilibrium.
+        return (np.full_like(t, normaliseAngles(np.float64(angle))),
+                np.zeros_like(t))
+    elif m < 1 or np.abs(m - 1) <= SEPARATRIX_TOLERANCE:
+        # Swinging back and forth, sin(angle / 2) = sqrt(m) sn(u).
+        modulus = np.sqrt(min(m, 1))
+        start = ellipticF(np.arcsin(np.clip(np.sin(stableAngle / 2) /
+                                            modulus, -1, 1)), min(m, 1))
+        sn, cn, dn = jacobiElliptic(np.sqrt(k) * t + start, min(m, 1))
+        angles = 2 * np.arcsin(modulus * sn)
+        angularVelocities = 2 * modulus * np.sqrt(k) * cn
+    else:
+        # Completing full circles, angle / 2 is the Jacobi amplitude of u.
+        start = ellipticF(stableAngle / 2, 1 / m)
+        sn, cn, dn = jacobiElliptic(np.sqrt(k * m) * t + start, 1 / m)
+        angles = 2 * np.arctan2(sn, cn)
+        angularVelocities = 2 * np.sqrt(k * m) * dn
+
+    angles = direction * angles + (0 if g >= 0 else np.pi)
+
+    return normaliseAngles(angles), direction * angularVelocities
+
+
+def periodFrames(length, angle, angularVelocity, intervalTime, g,
+                 maxFrames):
+    """
+    The number of frames in one period of a simple pendulum, from
+    pendulumPeriod. A pendulum which won't move has one frame, and one
+    whose period is too long or infinite has maxFrames.
+
+    Parameters
+    ----------
+    length : float or numpy ndarray
+        Length of the pendulum string.
+    angle : float or numpy ndarray
+        The angle in radians, normalised.
+    angularVelocity : float or numpy ndarray
+        The angular velocity.
+    intervalTime : float
+        The time bewteen frames, in seconds.
+    g : float
+        The gravitational acceleration in SI units.
+    maxFrames : int
+        The maximum number of frames.
+
+    Returns
+    -------
+    numpy ndarray of numpy int64
+        The number of frames.
+    """
+    period = pendulumPeriod(length, angle, angularVelocity, g)
+    # Pendulums released from rest at an equilibrium, or with no gravity,
+    # won't move.
+    static = ((angularVelocity == 0) &
+              ((angle == 0) | (np.abs(angle) == np.pi) | (g == 0)))
+
+    # The frames cover the period, excluding its end, which would be the
+    # same as the first frame.
+    frames = np.where(np.isfinite(period),
+                      np.ceil(np.minimum(period / intervalTime, maxFrames) -
+                              1e-9),
+                      maxFrames)
+
+    return np.where(static, 1, frames).astype(np.int64)
+
+
+def terminationReason(length, angle, angularVelocity, intervalTime, g,
+                      maxFrames):
+    """
+    Why a simulation of maxFrames frames or fewer stops where it does, in
+    the same way as periodFrames.
+
+    Parameters
+    ----------
+    length : float
+        Length of the pendulum string.
+    angle : float
+        The angle in radians, normalised.
+    angularVelocity : float
+        The angular velocity.
+    intervalTime : float
+        The time bewteen frames, in seconds.
+    g : float
+        The gravitational acceleration in SI units.
+    maxFrames : int
+        The maximum number of frames.
+
+    Returns
+    -------
+    str
+        "static" if the pendulum won't move, "infinitePeriod" if it's on
+        the separatrix, "maxFrames" if its period is longer than maxFrames
+        frames, otherwise "period".
+    """
+    period = pendulumPeriod(length, angle, angularVelocity, g)
+
+    if angularVelocity == 0 and (angle == 0 or np.abs(angle) == np.pi or
+                                 g == 0):
+        return "static"
+    elif not np.isfinite(period):
+        return "infinitePeriod"
+    elif period / intervalTime > maxFrames:
+        return "maxFrames"
+    else:
+        return "period"
+
+
+def normaliseAngles(angles):
+    """
+    Vectorised form of Pendulum.normaliseAngle, maps every angle into the
+    range -pi (exclusive) to pi (inclusive).
+
+    Parameters
+    ----------
+    angles : numpy ndarray of numpy float64
+        The angles to normalise, in radians.
+
+    Returns
+    -------
+    numpy ndarray of numpy float64
+        The normalised angles.
+    """
+    return angles - 2 * np.pi * np.ceil((angles - np.pi) / (2 * np.pi))
+
+
+def simulateEnsembleAngles(lengths,
+                           angles,
+                           angularVelocities,
+                           g = -9.81,
+                           intervalTime = 0.0125,
+                           maxFrames = 2000,
+                           engine = "rk4"):
+    """
+    Simulates many simple pendulums at once, every pendulum is advanced
+    together by one integration step over numpy arrays, rather than looping
+    over simulatePendulum. Each pendulum stops producing frames once it has
+    completed one period, in the same way as simulatePendulum. See
+    simulateEnsemble for the coordinates rather than the angles.
+
+    Parameters
+    ----------
+    lengths : array_like
+        Lengths of the pendulums, should all be positive.
+    angles : array_like
+        Initial angles of the pendulums, in radians.
+    angularVelocities : array_like
+        Initial angular velocities of the pendulums.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    intervalTime : float, optional
+        The time bewteen calculations, in seconds.
+        The default is 0.0125.
+    maxFrames : int, optional
+        The maximum number of frames to simulate for each pendulum, only used
+        when the period is longer, or infinite.
+        The default is 2000.
+    engine : str, optional
+        The integrator to use, one of FIXED_STEP_ENGINES, see
+        integrateFrames.
+        The default is "rk4".
+
+    Returns
+    -------
+    angleFrames : numpy ndarray of numpy float64
+        Array of shape (number of pendulums, frames), holding the normalised
+        angle of every pendulum at every frame. Frames after a pendulum has
+        completed its period are NaN.
+    frameCounts : numpy ndarray of numpy int64
+        The number of valid frames for each pendulum.
+    """
+    if intervalTime > 0.1:
+        raise ValueError("Time between calculations must be "
+                         "less than or equal to 0.1 seconds, it was "
+                         f"instead {intervalTime} seconds.")
+    if maxFrames <= 0:
+        raise ValueError("Maximum number of frames must be greater than or "
+                         f"equal to zero, yet it's {maxFrames}.")
+    if engine not in FIXED_STEP_ENGINES:
+        raise ValueError(f"engine must be one of {FIXED_STEP_ENGINES}, yet "
+                         f"it's {engine}.")
+
+    lengths, angles, angularVelocities = np.broadcast_arrays(
+        np.float64(lengths), np.float64(angles),
+        np.float64(angularVelocities))
+    if lengths.ndim != 1:
+        raise ValueError("Ensemble parameters must be 1D, but they're "
+                         f"{lengths.ndim}D.")
+    if np.any(lengths <= 0):
+        raise ValueError("The length of a pendulum must be greater than"
+                         " zero.")
+    count = len(lengths)
+    intervalTime = np.float64(intervalTime)
+    g = np.float64(g)
+
+    angle = normaliseAngles(angles)
+    angularVelocity = np.copy(angularVelocities)
+    frameCounts = periodFrames(lengths, angle, angularVelocity, intervalTime,
+                               g, maxFrames)
+
+    angleFrames = np.full((np.max(frameCounts, initial = 0), count), np.nan)
+    for frame in range(len(angleFrames)):
+        # Only pendulums which haven't completed their period are stepped.
+        active = frame < frameCounts
+        angleFrames[frame, active] = angle[active]
+        angle[active], angularVelocity[active] = stepPendulum(
+            engine, intervalTime, angle[active], angularVelocity[active],
+            [g, lengths[active]])
+
+    return normaliseAngles(angleFrames.T), frameCounts
+
+
+def simulateEnsemble(lengths,
+                     angles,
+                     angularVelocities,
+                     pendCoors = np.array([0, 0], dtype = 'float64'),
+                     g = -9.81,
+                     intervalTime = 0.0125,
+                     maxFrames = 2000,
+                     engine = "rk4"):
+    """
+    Simulates many simple pendulums at once with simulateEnsembleAngles,
+    giving the coordinates of each at every frame.
+
+    Parameters
+    ----------
+    lengths : array_like
+        Lengths of the pendulums, should all be positive.
+    angles : array_like
+        Initial angles of the pendulums, in radians.
+    angularVelocities : array_like
+        Initial angular velocities of the pendulums.
+    pendCoors : array_like, optional
+        The coordinates where each string originates from, either one pair of
+        coordinates shared by all pendulums or one pair per pendulum.
+        The default is np.array([0, 0], dtype = 'float64').
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    intervalTime : float, optional
+        The time bewteen calculations, in seconds.
+        The default is 0.0125.
+    maxFrames : int, optional
+        The maximum number of frames to simulate for each pendulum, only used
+        when the period is longer, or infinite.
+        The default is 2000.
+    engine : str, optional
+        The integrator to use, one of FIXED_STEP_ENGINES, see
+        integrateFrames.
+        The default is "rk4".
+
+    Returns
+    -------
+    positions : numpy ndarray of numpy float64
+        Array of shape (number of pendulums, frames, 2), holding the x and y
+        coordinates of every pendulum at every frame. Frames after a pendulum
+        has completed its period are NaN.
+    frameCounts : numpy ndarray of numpy int64
+        The number of valid frames for each pendulum.
+    """
+    angleFrames, frameCounts = simulateEnsembleAngles(
+        lengths, angles, angularVelocities, g, intervalTime, maxFrames,
+        engine)
+    lengths = np.broadcast_to(np.float64(lengths), frameCounts.shape)
+    pendCoors = np.broadcast_to(np.float64(pendCoors), (len(lengths), 2))
+
+    positions = np.empty(angleFrames.shape + (2, ))
+    positions[:, :, 0] = (lengths[:, None] * np.sin(angleFrames) +
+                          pendCoors[:, 0, None])
+    positions[:, :, 1] = (lengths[:, None] * np.cos(angleFrames) +
+                          pendCoors[:, 1, None])
+
+    return positions, frameCounts
+
+
+def animateFrames(fig, update, clock, interval):
+    """
+    Creates an animation which draws whichever frame the clock says is due
+    each time the screen is redrawn, shared by produceAnimation and
+    produceChainAnimation. The clock starts when the first frame is drawn,
+    not when the animation is created.
+
+    Parameters
+    ----------
+    fig : matplotlib.figure.Figure
+        The figure the animation is drawn on.
+    update : function
+        Draws the frame with the index it's given, returning the artists it
+        changed.
+    clock : playback.PlaybackClock
+        Decides which frame is drawn.
+    interval : float
+        The time bewteen frames, in milliseconds. The screen is redrawn this
+        often, but no more than playback.MAX_FPS times a second.
+
+    Returns
+    -------
+    ani : matplotlib.animation.TimedAnimation
+        The animation, with the clock as ani.clock and update as ani.update.
+    """
+    import matplotlib.animation as animation
+
+    def frames():
+        clock.start()
+        while True:
+            yield clock.nextFrame()
+
+    ani = animation.FuncAnimation(
+        fig = fig, func = update, frames = frames,
+        interval = max(interval, 1000 / playback.MAX_FPS), blit = True,
+        cache_frame_data = False)
+    ani.clock = clock
+    ani.update = update
+
+    return ani
+
+
+def produceAnimation(pendulum, positions, interval = 12.5,
+                     fig = None, ax = None):
+    """
+    Creates an animation from the x and y coordinates produced by the
+    simulatePendulum function. The animation will appear with both a mass and
+    a string depicted, with a x and y axis. Which frame is drawn is decided
+    by a PlaybackClock from the time since the animation started, so it runs
+    in real time, skipping frames if drawing can't keep up. The clock is
+    available as ani.clock, for its frame rate and dropped frame counters,
+    and ani.update(frame) draws the given frame, returning the artists
+    changed.
+
+    Parameters
+    ----------
+    pendulum : Pendulum class
+        A class representing a point mass attached to a rigid string, the
+        pendulum whose motion is shown in the animation.
+    positions : Trajectory class or numpy ndarray
+        The trajectory produced by simulatePendulum, whose x and y columns
+        are read directly. Otherwise an array of shape (frames, 2), holding
+        the x and y coordinates of each frame.
+    interval : float, optional
+        The time bewteen frames, in milliseconds, only used for arrays of
+        positions, as a trajectory holds the time of each frame. The screen
+        is redrawn this often, but no more than playback.MAX_FPS times a
+        second.
+        The default is 12.5, so 80fps.
+
+    Returns
+    -------
+    ani : matplotlib.animation.TimedAnimation
+        The animation depicting the motion of the pendulum.
+    """
+    # Imported here so that simulating doesn't need matplotlib, or pick a GUI
+    # backend.
+    import matplotlib.pyplot as plt
+
+    if fig is None or ax is None:
+        # Specifiying figsize ensures that plot is square when opened in Spyder
+        # IDE.
+        fig, ax = plt.subplots(figsize = (5, 5), dpi = 150)
+
+    pendX = pendulum.pendCoor[0]
+    pendY = pendulum.pendCoor[1]
+    # Used to apply limits to the plots used in the animation, so that the
+    # pendulum is fully within the plot.
+    m = pendulum.length + 0.2 * pendulum.length
+
+    # zorder ensures that the mass appears on top of the string, it would
+    # look weird otherwise.
+    mass = ax.scatter([], [], color = 'black', zorder = 2)
+    string = ax.plot([], [], color = 'brown', linestyle = '-', zorder = 1)[0]
+
+    ax.set(xlim = [-m + pendX, m + pendX], ylim = [-m + pendY, m + pendY])
+
+    if isinstance(positions, Trajectory):
+        xs = positions.x
+        ys = positions.y
+        clock = playback.PlaybackClock(positions.t - positions.t[0])
+        if len(positions) > 1:
+            interval = (positions.t[1] - positions.t[0]) * 1000
+    else:
+        positions = np.asarray(positions, dtype = np.float64)
+        xs = positions[:, 0]
+        ys = positions[:, 1]
+        clock = playback.PlaybackClock.fromInterval(len(xs), interval / 1000)
+
+    def update(frame):
+        x = xs[frame]
+        y = ys[frame]
+
+        mass.set_offsets([x, y])
+        string.set_xdata([x, pendX])
+        string.set_ydata([y, pendY])
+
+        return (mass, string, )
+
+    # Makes sure that the animation appears.
+    return animateFrames(fig, update, clock, interval)
+
+
+def produceChainAnimation(chain, angles, interval = 12.5, fig = None,
+                          ax = None):
+    """
+    Creates an animation of a chain of pendulums from the angles produced by
+    the Chain.simulateChains function, in the same way as produceAnimation,
+    with each mass and the strings between them depicted, and the same
+    ani.clock and ani.update attributes.
+
+    Parameters
+    ----------
+    chain : PendulumChain class
+        The chain whose motion is shown in the animation.
+    angles : numpy ndarray
+        The angle of every link at every frame, of shape (frames, links),
+        one chain of the output of Chain.simulateChains.
+    interval : float, optional
+        The time bewteen frames, in milliseconds. The screen is redrawn this
+        often, but no more than playback.MAX_FPS times a second.
+        The default is 12.5, so 80fps.
+
+    Returns
+    -------
+    ani : matplotlib.animation.TimedAnimation
+        The animation depicting the motion of the chain.
+    """
+    import matplotlib.pyplot as plt
+
+    if fig is None or ax is None:
+        fig, ax = plt.subplots(figsize = (5, 5), dpi = 150)
+
+    pendX = chain.pendCoor[0]
+    pendY = chain.pendCoor[1]
+    m = 1.2 * np.sum(chain.lengths)
+
+    # Every position is found up front, with the pivot as the first point of
+    # each frame, so each frame only has to be handed to matplotlib.
+    positions = chain.positions(angles)
+    points = np.empty((len(positions), len(chain) + 1, 2))
+    points[:, 0] = chain.pendCoor
+    points[:, 1:] = positions
+
+    masses = ax.scatter([], [], color = 'black', zorder = 2)
+    strings = ax.plot([], [], color = 'brown', linestyle = '-',
+                      zorder = 1)[0]
+
+    ax.set(xlim = [-m + pendX, m + pendX], ylim = [-m + pendY, m + pendY])
+
+    clock = playback.PlaybackClock.fromInterval(len(points), interval / 1000)
+
+    def update(frame):
+        masses.set_offsets(points[frame, 1:])
+        strings.set_data(points[frame, :, 0], points[frame, :, 1])
+
+        return (masses, strings, )
+
+    return animateFrames(fig, update, clock, interval)
@@ -0,0 +1,325 @@
+from Trajectory import Trajectory
+from Pendulum import Pendulum
+
+import numpy as np
+import struct
+import json
+import os
+
+
+# A trajectory file starts with MAGIC, then the format version and the length
+# of the JSON header as little endian unsigned 32 bit integers, then the
+# header itself, padded with spaces so the frames start on a multiple of
+# ALIGNMENT bytes. Then COLUMNS_PREFIX, the capacity and number of frames as
+# little endian unsigned 64 bit integers, padded to ALIGNMENT bytes, and
+# space for capacity frames of each of Trajectory.columns in turn. Each
+# column is contiguous, however many times the file is written to, so the
+# whole file can be memory mapped, and reading one column only touches that
+# column's part of the file.
+MAGIC = b"PENDTRAJ"
+VERSION = 2
+ALIGNMENT = 64
+PREFIX = struct.Struct("<8sII")
+COLUMNS_PREFIX = struct.Struct("<QQ")
+DTYPES = ("float64", "float32")
+# Copied at a time when the columns are moved to make space for more frames.
+MOVE_BYTES = 16 * 2 ** 20
+
+
+class TrajectoryWriter:
+    """
+    A class which writes the frames of a trajectory to a binary file as
+    they're made, so a simulation of any length can be saved while it runs,
+    see readTrajectory for reading it back. Space is reserved in the file
+    for capacity frames of each column, and doubled whenever it runs out,
+    moving the columns apart, so each column stays contiguous however the
+    frames are written. Can be used as a context manager, closing the file
+    at the end.
+
+    Parameters
+    ----------
+    filename : str
+        The file to write to.
+    pendulum : Pendulum class, optional
+        The pendulum at the start of the simulation, stored in the header.
+        Only needed for new files.
+        The default is None.
+    g : float, optional
+        The gravitational acceleration in SI units, stored in the header.
+        The default is -9.81.
+    dt : float, optional
+        The time between integration steps, in seconds, stored in the
+        header.
+        The default is 0.0125.
+    engine : str, optional
+        The integrator used, stored in the header.
+        The default is "rk4".
+    dtype : str, optional
+        The type the frames are stored as, one of DTYPES. float32 halves the
+        size of the file.
+        The default is "float64".
+    append : bool, optional
+        If True and the file already exists, frames are added to the end of
+        it, keeping its header, and the other parameters are ignored.
+        Otherwise the file is replaced.
+        The default is False.
+    capacity : int, optional
+        The number of frames to reserve space for up front, ideally the
+        number which will be written, so the columns never have to be moved.
+        The default is 4096.
+    """
+
+    def __init__(
+            self,
+            filename,
+            pendulum = None,
+            g = -9.81,
+            dt = 0.0125,
+            engine = "rk4",
+            dtype = "float64",
+            append = False,
+            capacity = 4096):
+
+        if append and os.path.exists(filename):
+            self.header = readHeader(filename)
+            self.dtype = np.dtype(self.header["dtype"])
+            self.file = open(filename, "r+b")
+            return
+
+        if not isinstance(pendulum, Pendulum):
+            raise ValueError("pendulum parameter must be a Pendulum object. "
+                             f"Yet it is {type(pendulum)}")
+        if str(dtype) not in DTYPES:
+            raise ValueError(f"dtype must be one of {DTYPES}, yet it's "
+                             f"{dtype}.")
+        if capacity <= 0:
+            raise ValueError("capacity must be greater than zero, yet it's "
+                             f"{capacity}.")
+
+        self.dtype = np.dtype(dtype)
+        self.header = {"length": float(pendulum.length),
+                       "angle": float(pendulum.angle),
+                       "angularVelocity": float(pendulum.angularVelocity),
+                       "pendCoor": [float(c) for c in pendulum.pendCoor],
+                       "g": float(g),
+                       "dt": float(dt),
+                       "engine": str(engine),
+                       "dtype": str(self.dtype),
+                       "columns": list(Trajectory.columns)}
+
+        text = json.dumps(self.header).encode()
+        padding = -(PREFIX.size + len(text)) % ALIGNMENT
+        text += b" " * padding
+        self.file = open(filename, "w+b")
+        self.file.write(PREFIX.pack(MAGIC, VERSION, len(text)))
+        self.file.write(text)
+
+        self.header.update(version = VERSION, capacity = 0, frames = 0,
+                           offset = PREFIX.size + len(text) + ALIGNMENT)
+        self.reserve(capacity)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def columnOffset(self, column, capacity = None):
+        """
+        The position in the file of the start of a column, by its index in
+        Trajectory.columns, for the given capacity, or the file's own.
+        """
+        if capacity is None:
+            capacity = self.header["capacity"]
+        return self.header["offset"] + column * capacity * self.dtype.itemsize
+
+    def reserve(self, capacity):
+        """
+        Makes sure the file has space for at least capacity frames, doubling
+        its capacity if it doesn't, and moving every column but the first to
+        its new place.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of frames which need to fit.
+        """
+        old = self.header["capacity"]
+        if capacity <= old:
+            return
+        # A multiple of ALIGNMENT frames keeps every column aligned.
+        capacity = max(int(capacity), 2 * old)
+        capacity += -capacity % ALIGNMENT
+
+        columns = len(Trajectory.columns)
+        self.file.truncate(self.columnOffset(columns, capacity))
+        # Every column moves further into the file, so they're moved from
+        # the last, and each from its end, to never overwrite anything which
+        # hasn't been moved yet.
+        frames = self.header["frames"]
+        step = MOVE_BYTES // self.dtype.itemsize
+        for column in range(columns - 1, 0, -1):
+            source = self.columnOffset(column)
+            destination = self.columnOffset(column, capacity)
+            for stop in range(frames, 0, -step):
+                start = max(stop - step, 0)
+                self.file.seek(source + start * self.dtype.itemsize)
+                block = self.file.read((stop - start) * self.dtype.itemsize)
+                self.file.seek(destination + start * self.dtype.itemsize)
+                self.file.write(block)
+
+        self.header["capacity"] = capacity
+        self.writeCount()
+
+    def writeCount(self):
+        """
+        Writes the capacity and number of frames to the file.
+        """
+        self.file.seek(self.header["offset"] - ALIGNMENT)
+        self.file.write(COLUMNS_PREFIX.pack(self.header["capacity"],
+                                            self.header["frames"]))
+
+    def write(self, trajectory):
+        """
+        Adds the frames of a trajectory to the end of the file, for example a
+        chunk from sim.iterSimulation.
+
+        Parameters
+        ----------
+        trajectory : Trajectory class
+            The frames to add.
+        """
+        if not isinstance(trajectory, Trajectory):
+            raise ValueError("trajectory parameter must be a Trajectory "
+                             f"object. Yet it is {type(trajectory)}")
+
+        trajectory.updatePositions()
+        frames = self.header["frames"]
+        self.reserve(frames + len(trajectory))
+
+        data = np.array(trajectory.data[:, :len(trajectory)],
+                        dtype = self.dtype)
+        for column in range(len(Trajectory.columns)):
+            self.file.seek(self.columnOffset(column) +
+                           frames * self.dtype.itemsize)
+            self.file.write(data[column].data)
+
+        # The frames only count once they've all been written.
+        self.header["frames"] = frames + len(trajectory)
+        self.writeCount()
+
+    def flush(self):
+        """
+        Makes sure everything written so far is in the file, so it can be
+        read while still being written to.
+        """
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def readHeader(filename):
+    """
+    Reads the header of a trajectory file.
+
+    Parameters
+    ----------
+    filename : str
+        The file to read.
+
+    Returns
+    -------
+    header : dict
+        The pendulum, g, dt, engine and dtype the file was written with, its
+        "version", the "capacity" and number of "frames" of its columns, and
+        the "offset" in bytes of the first column.
+    """
+    with open(filename, "rb") as file:
+        prefix = file.read(PREFIX.size)
+        if len(prefix) < PREFIX.size or prefix[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{filename} isn't a trajectory file.")
+
+        _, version, length = PREFIX.unpack(prefix)
+        if version != VERSION:
+            raise ValueError(f"{filename} is version {version} of the "
+                             f"trajectory format, only version {VERSION} "
+                             "can be read.")
+        header = json.loads(file.read(length).decode())
+
+        counts = file.read(COLUMNS_PREFIX.size)
+        if len(counts) < COLUMNS_PREFIX.size:
+            raise ValueError(f"{filename} has been cut short.")
+        capacity, frames = COLUMNS_PREFIX.unpack(counts)
+
+    header.update(version = version, capacity = capacity, frames = frames,
+                  offset = PREFIX.size + length + ALIGNMENT)
+    return header
+
+
+def readTrajectory(filename):
+    """
+    Opens a trajectory file written by TrajectoryWriter. The file is memory
+    mapped rather than read, so even very large files open instantly, and
+    only the parts which are sliced are loaded, see readColumn for reading
+    part of one column instead. The frames are read only.
+
+    Parameters
+    ----------
+    filename : str
+        The file to read.
+
+    Returns
+    -------
+    trajectory : Trajectory class
+        The frames, with columns which are views of the memory mapped file.
+    header : dict
+        The pendulum, g, dt, engine and dtype the file was written with, see
+        readHeader.
+    """
+    header = readHeader(filename)
+    data = np.memmap(filename, dtype = header["dtype"], mode = "r",
+                     offset = header["offset"],
+                     shape = (len(Trajectory.columns), header["capacity"]))
+
+    trajectory = Trajectory.fromData(data[:, :header["frames"]],
+                                     header["length"], header["pendCoor"])
+    return trajectory, header
+
+
+def readColumn(filename, column, start = 0, stop = None):
+    """
+    Reads part of one column of a trajectory file, only loading the frames
+    asked for.
+
+    Parameters
+    ----------
+    filename : str
+        The file to read.
+    column : str
+        One of Trajectory.columns.
+    start : int, optional
+        The first frame to read.
+        The default is 0.
+    stop : int, optional
+        One past the last frame to read. If None, the end of the file.
+        The default is None.
+
+    Returns
+    -------
+    numpy ndarray
+        The values of the column.
+    """
+    if column not in Trajectory.columns:
+        raise ValueError(f"column must be one of {Trajectory.columns}, yet "
+                         f"it's {column}.")
+    index = Trajectory.columns.index(column)
+    header = readHeader(filename)
+    start, stop, _ = slice(start, stop).indices(header["frames"])
+    if stop <= start:
+        return np.empty(0, dtype = header["dtype"])
+
+    itemsize = np.dtype(header["dtype"]).itemsize
+    offset = header["offset"] + (index * header["capacity"] + start) * itemsize
+    return np.array(np.memmap(filename, dtype = header["dtype"], mode = "r",
+                              offset = offset, shape = (stop - start, )))
@@ -0,0 +1,420 @@
+from multiprocessing import shared_memory
+from Pendulum import Pendulum
+
+import multiprocessing
+import numpy as np
+import chaos
+import sim
+import os
+
+
+# Set in each worker process by attachWorker.
+workerState = {}
+
+
+def sweepPendulums(angles,
+                   angularVelocities,
+                   lengths,
+                   g = -9.81,
+                   intervalTime = 0.0125,
+                   maxFrames = 2000,
+                   engine = "rk4",
+                   workers = None,
+                   chunkSize = 64,
+                   progress = None,
+                   cancel = None):
+    """
+    Simulates a pendulum for every combination of initial angle, angular
+    velocity and length, finding the period and the largest amplitude of
+    each. The grid is split into chunks which are shared between a pool of
+    processes, each of which writes its results straight into shared memory,
+    so no trajectories are sent back between processes.
+
+    Parameters
+    ----------
+    angles : array_like
+        The initial angles to sweep over, in radians.
+    angularVelocities : array_like
+        The initial angular velocities to sweep over.
+    lengths : array_like
+        The lengths to sweep over, should all be positive.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    intervalTime : float, optional
+        The time bewteen calculations, in seconds.
+        The default is 0.0125.
+    maxFrames : int, optional
+        The maximum number of frames to simulate for each pendulum.
+        The default is 2000.
+    engine : str, optional
+        The integrator to use, one of sim.ENGINES.
+        The default is "rk4".
+    workers : int, optional
+        The number of processes to use, if one, everything is simulated in
+        this process. If None, the number of CPUs.
+        The default is None.
+    chunkSize : int, optional
+        The number of pendulums simulated by a worker at a time.
+        The default is 64.
+    progress : function, optional
+        Called as progress(done, total) each time a chunk is finished.
+        The default is None.
+    cancel : threading.Event, optional
+        Anything with an is_set method, checked each time a chunk is finished,
+        once set the sweep stops and raises sim.SimulationCancelled.
+        The default is None.
+
+    Returns
+    -------
+    periods : numpy ndarray
+        The period of each pendulum in seconds, of shape (len(angles),
+        len(angularVelocities), len(lengths)).
+    amplitudes : numpy ndarray
+        The largest angle each pendulum reaches from its stable equilibrium,
+        close to pi for pendulums completing full circles, of the same
+        shape.
+    """
+    axes = [np.atleast_1d(np.float64(axis))
+            for axis in (angles, angularVelocities, lengths)]
+    if np.any(axes[2] <= 0):
+        raise ValueError("The length of a pendulum must be greater than"
+                         " zero.")
+    if chunkSize <= 0:
+        raise ValueError("Chunk size must be greater than zero, yet it's "
+                         f"{chunkSize}.")
+    sim.checkEngine(engine)
+    if workers is None:
+        workers = os.cpu_count()
+
+    shape = (2, ) + tuple(len(axis) for axis in axes)
+    total = int(np.prod(shape[1:]))
+    chunks = [(start, min(start + chunkSize, total))
+              for start in range(0, total, chunkSize)]
+    settings = (axes, g, intervalTime, maxFrames, engine)
+
+    memory = shared_memory.SharedMemory(
+        create = True, size = max(int(np.prod(shape)) * 8, 1))
+    try:
+        results = np.ndarray(shape, dtype = np.float64, buffer = memory.buf)
+        results[:] = np.nan
+
+        if workers == 1:
+            attachWorker(memory.name, shape, settings)
+            try:
+                completed = map(sweepChunk, chunks)
+                runChunks(completed, total, progress, cancel)
+            finally:
+                detachWorker()
+        else:
+            with multiprocessing.Pool(workers, attachWorker,
+                                      (memory.name, shape, settings)) as pool:
+                completed = pool.imap_unordered(sweepChunk, chunks)
+                # Leaving the with statement terminates any workers which
+                # are still going, if cancelled.
+                runChunks(completed, total, progress, cancel)
+
+        periods = results[0].copy()
+        amplitudes = results[1].copy()
+        del results
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return periods, amplitudes
+
+
+def runChunks(completed, total, progress, cancel):
+    """
+    Waits for each chunk to be completed, reporting progress and checking
+    for cancellation in between.
+
+    Parameters
+    ----------
+    completed : iterator
+        Yields the number of pendulums in each chunk once it's completed.
+    total : int
+        The total number of pendulums.
+    progress : function or None
+        Called as progress(done, total).
+    cancel : threading.Event or None
+        Raises sim.SimulationCancelled once set.
+    """
+    done = 0
+    for count in completed:
+        done += count
+        if progress is not None:
+            progress(done, total)
+        if cancel is not None and cancel.is_set():
+            raise sim.SimulationCancelled("Sweep cancelled after "
+                                          f"{done} of {total} pendulums.")
+
+
+def attachWorker(name, shape, settings):
+    """
+    Runs once in each worker process, attaching it to the shared results.
+
+    Parameters
+    ----------
+    name : str
+        The name of the shared memory holding the results.
+    shape : tuple
+        The shape of the results.
+    settings : tuple
+        The settings of the sweep, for sweepPendulums the axes of the grid,
+        g, intervalTime, maxFrames and engine.
+    """
+    if "memory" in workerState:
+        workerState["memory"].close()
+    memory = shared_memory.SharedMemory(name = name)
+    workerState["memory"] = memory
+    workerState["results"] = np.ndarray(shape, dtype = np.float64,
+                                        buffer = memory.buf)
+    workerState["settings"] = settings
+
+
+def detachWorker():
+    """
+    Undoes attachWorker, closing the shared results, used when the chunks
+    are run in this process so nothing is left pointing at them.
+    """
+    if "memory" in workerState:
+        # Views of the memory have to go before it can be closed.
+        workerState.pop("results", None)
+        workerState["memory"].close()
+    workerState.clear()
+
+
+def sweepChunk(chunk):
+    """
+    Simulates one chunk of the grid in a worker process, writing the period
+    and amplitude of each pendulum into the shared results. Fixed step
+    engines simulate the whole chunk together with
+    sim.simulateEnsembleAngles, other engines one pendulum at a time.
+
+    Parameters
+    ----------
+    chunk : tuple
+        The first and one past the last index of the chunk, into the
+        flattened grid.
+
+    Returns
+    -------
+    int
+        The number of pendulums simulated.
+    """
+    results = workerState["results"]
+    axes, g, intervalTime, maxFrames, engine = workerState["settings"]
+    periods = results[0].reshape(-1)
+    amplitudes = results[1].reshape(-1)
+    # The stable equilibrium is at an angle of zero when g is positive, and
+    # at pi when g is negative.
+    stableAngle = 0 if g >= 0 else np.pi
+
+    i, j, k = np.unravel_index(np.arange(*chunk), results.shape[1:])
+    lengths = axes[2][k]
+    angles = sim.normaliseAngles(axes[0][i])
+    angularVelocities = axes[1][j]
+    periods[chunk[0]:chunk[1]] = sim.pendulumPeriod(lengths, angles,
+                                                    angularVelocities, g)
+
+    if engine in sim.FIXED_STEP_ENGINES:
+        angleFrames, _ = sim.simulateEnsembleAngles(
+            lengths, angles, angularVelocities, g, intervalTime, maxFrames,
+            engine)
+        amplitudes[chunk[0]:chunk[1]] = np.nanmax(np.abs(sim.normaliseAngles(
+            angleFrames - stableAngle)), axis = 1)
+    else:
+        for index in range(len(lengths)):
+            trajectory = sim.simulatePendulum(
+                Pendulum(lengths[index], angles[index],
+                         angularVelocities[index]),
+                intervalTime, g, maxFrames, engine)
+            amplitudes[chunk[0] + index] = np.max(np.abs(
+                sim.normaliseAngles(trajectory.angle - stableAngle)))
+
+    return chunk[1] - chunk[0]
+
+
+# The parameters of a driven pendulum which bifurcationDiagram can sweep.
+DRIVEN_PARAMETERS = ("length", "damping", "amplitude", "frequency")
+
+
+def bifurcationDiagram(values,
+                       parameter = "amplitude",
+                       angle = 3.0,
+                       angularVelocity = 0.0,
+                       length = 1.0,
+                       frequency = 2.0,
+                       g = -9.81,
+                       damping = 0.0,
+                       amplitude = 0.0,
+                       transient = 100,
+                       samples = 100,
+                       stepsPerPeriod = 128,
+                       workers = None,
+                       chunkSize = 16,
+                       progress = None,
+                       cancel = None):
+    """
+    Finds the points of a bifurcation diagram for a driven pendulum, by
+    sweeping one of its parameters and sampling a Poincare section at each
+    value with chaos.poincareSection. The values are split into chunks which
+    are shared between a pool of processes, each of which writes its samples
+    straight into shared memory, in the same way as sweepPendulums.
+
+    Parameters
+    ----------
+    values : array_like
+        The values of the parameter to sweep over.
+    parameter : str, optional
+        The parameter to sweep, one of DRIVEN_PARAMETERS, its own argument is
+        ignored.
+        The default is "amplitude".
+    angle : float, optional
+        The initial angle of every pendulum, in radians.
+        The default is 3.0.
+    angularVelocity : float, optional
+        The initial angular velocity of every pendulum.
+        The default is 0.0.
+    length : float, optional
+        The length of the pendulum.
+        The default is 1.0.
+    frequency : float, optional
+        The angular frequency of the driving torque, in rad/s.
+        The default is 2.0.
+    g : float, optional
+        The gravitational acceleration in SI units.
+        The default is -9.81.
+    damping : float, optional
+        The damping coefficient, in 1/s.
+        The default is 0.0.
+    amplitude : float, optional
+        The amplitude of the driving torque, as an angular acceleration, in
+        rad/s^2.
+        The default is 0.0.
+    transient : int, optional
+        The number of driving periods simulated before sampling.
+        The default is 100.
+    samples : int, optional
+        The number of driving periods sampled at each value.
+        The default is 100.
+    stepsPerPeriod : int, optional
+        The number of integration steps in each driving period.
+        The default is 128.
+    workers : int, optional
+        The number of processes to use, if one, everything is simulated in
+        this process. If None, the number of CPUs.
+        The default is None.
+    chunkSize : int, optional
+        The number of values simulated together by a worker at a time.
+        The default is 16.
+    progress : function, optional
+        Called as progress(done, total) each time a chunk is finished.
+        The default is None.
+    cancel : threading.Event, optional
+        Anything with an is_set method, checked each time a chunk is finished,
+        once set the sweep stops and raises sim.SimulationCancelled.
+        The default is None.
+
+    Returns
+    -------
+    points : numpy ndarray
+        Array of shape (len(values) * samples, 3), holding the parameter
+        value, angle and angular velocity of each sample, with the samples
+        of each value together, in the order of values.
+    """
+    if parameter not in DRIVEN_PARAMETERS:
+        raise ValueError(f"parameter must be one of {DRIVEN_PARAMETERS}, yet "
+                         f"it's {parameter}.")
+    if chunkSize <= 0:
+        raise ValueError("Chunk size must be greater than zero, yet it's "
+                         f"{chunkSize}.")
+    values = np.atleast_1d(np.float64(values))
+    if values.ndim != 1:
+        raise ValueError(f"values must be 1D, but they're {values.ndim}D.")
+    if workers is None:
+        workers = os.cpu_count()
+
+    drive = {"length": length, "damping": damping, "amplitude": amplitude,
+             "frequency": frequency}
+    drive[parameter] = values
+    # Checks the pendulums up front, with a single step, rather than in the
+    # workers.
+    chaos.poincareSection(drive["length"], angle, angularVelocity,
+                        drive["frequency"], g, drive["damping"],
+                        drive["amplitude"], 0, 1, 1)
+    if transient < 0 or samples <= 0 or stepsPerPeriod <= 0:
+        raise ValueError("transient can't be negative, and samples and "
+                         "stepsPerPeriod must be greater than zero, yet "
+                         f"they're {transient}, {samples} and "
+                         f"{stepsPerPeriod}.")
+
+    total = len(values)
+    shape = (2, total, samples)
+    chunks = [(start, min(start + chunkSize, total))
+              for start in range(0, total, chunkSize)]
+    settings = (drive, angle, angularVelocity, g, transient, samples,
+                stepsPerPeriod)
+
+    memory = shared_memory.SharedMemory(
+        create = True, size = max(int(np.prod(shape)) * 8, 1))
+    try:
+        results = np.ndarray(shape, dtype = np.float64, buffer = memory.buf)
+        results[:] = np.nan
+
+        if workers == 1:
+            attachWorker(memory.name, shape, settings)
+            try:
+                completed = map(bifurcationChunk, chunks)
+                runChunks(completed, total, progress, cancel)
+            finally:
+                detachWorker()
+        else:
+            with multiprocessing.Pool(workers, attachWorker,
+                                      (memory.name, shape, settings)) as pool:
+                completed = pool.imap_unordered(bifurcationChunk, chunks)
+                runChunks(completed, total, progress, cancel)
+
+        points = np.empty((total, samples, 3))
+        points[:, :, 0] = values[:, None]
+        points[:, :, 1] = results[0]
+        points[:, :, 2] = results[1]
+        del results
+    finally:
+        memory.close()
+        memory.unlink()
+
+    return points.reshape(-1, 3)
+
+
+def bifurcationChunk(chunk):
+    """
+    Samples the Poincare sections of one chunk of values in a worker
+    process, stepping them all together, and writes them into the shared
+    results.
+
+    Parameters
+    ----------
+    chunk : tuple
+        The first and one past the last index of the chunk, into values.
+
+    Returns
+    -------
+    int
+        The number of values simulated.
+    """
+    results = workerState["results"]
+    (drive, angle, angularVelocity, g, transient, samples,
+     stepsPerPeriod) = workerState["settings"]
+    part = {key: value[chunk[0]:chunk[1]] if np.ndim(value) else value
+            for key, value in drive.items()}
+
+    angles, angularVelocities = chaos.poincareSection(
+        part["length"], angle, angularVelocity, part["frequency"], g,
+        part["damping"], part["amplitude"], transient, samples,
+        stepsPerPeriod)
+    results[0, chunk[0]:chunk[1]] = angles.T
+    results[1, chunk[0]:chunk[1]] = angularVelocities.T
+
+    return chunk[1] - chunk[0]
@@ -1,9 +1,9 @@
 from Pendulum import Pendulum
 
 import matplotlib.pyplot as plt
-import matplotlib as mpl
 import numpy as np
 import userpaths
+import export
 import sim
 import os
 
@@ -82,7 +82,6 @@ if save != "":
         file.write("ffmpegPath = " + mpeg)
     file.close()
 
-    mpl.rcParams['animation.ffmpeg_path'] = (mpeg)
-    ani.save(save)
+    export.exportVideo(pos, save, ffmpegPath = mpeg)
 
 plt.show()
@@ -141,6 +141,19 @@ class Ui_MainWindow(object):
         self.label_3.setStyleSheet("font: 9pt \"Arial\";")
         self.label_3.setObjectName("label_3")
         self.gridLayout.addWidget(self.label_3, 4, 0, 1, 1)
+        self.intervalLabel = QtWidgets.QLabel(self.widget_21)
+        self.intervalLabel.setStyleSheet("font: 9pt \"Arial\";")
+        self.intervalLabel.setObjectName("intervalLabel")
+        self.gridLayout.addWidget(self.intervalLabel, 6, 0, 1, 1)
+        self.intervalSpinBox = QtWidgets.QDoubleSpinBox(self.widget_21)
+        self.intervalSpinBox.setStyleSheet("font: 9pt \"Arial\";")
+        self.intervalSpinBox.setDecimals(4)
+        self.intervalSpinBox.setMinimum(0.001)
+        self.intervalSpinBox.setMaximum(0.1)
+        self.intervalSpinBox.setSingleStep(0.0025)
+        self.intervalSpinBox.setProperty("value", 0.0125)
+        self.intervalSpinBox.setObjectName("intervalSpinBox")
+        self.gridLayout.addWidget(self.intervalSpinBox, 6, 1, 1, 1)
         self.verticalLayout_2.addWidget(self.widget_21)
         self.widget_4 = QtWidgets.QWidget(self.frame_3)
         self.widget_4.setObjectName("widget_4")
@@ -216,6 +229,7 @@ class Ui_MainWindow(object):
         self.label_2.setText(_translate("MainWindow", "Initial Angle (in terms of pi):"))
         self.label_5.setText(_translate("MainWindow", "Gravitational Accleration:"))
         self.label_3.setText(_translate("MainWindow", "Initial Angular Velocity:"))
+        self.intervalLabel.setText(_translate("MainWindow", "Time Interval:"))
         self.applyButton.setText(_translate("MainWindow", "Simulate"))
         self.saveButton.setText(_translate("MainWindow", "Save"))
         self.ffmpegButton.setText(_translate("MainWindow", "Change File Path of ffmpeg.exe"))
@@ -0,0 +1,67 @@
+import subprocess
+import json
+import sys
+import pytest
+import numpy.testing as nt
+import batch
+import storage
+import sim
+
+
+def test_main(tmp_path):
+    configs = tmp_path / "configs.csv"
+    configs.write_text("name,length,angle,angularVelocity,engine\n"
+                       "swing,2,1,0,\n"
+                       "spin,1,0,10,verlet\n"
+                       "bad,-1,0,0,\n")
+    output = tmp_path / "results.jsonl"
+
+    code = batch.main([str(configs), "-o", str(output), "-w", "2",
+                       "-t", str(tmp_path / "trajectories")])
+    results = [json.loads(line) for line in output.read_text().splitlines()]
+
+    # The bad configuration is reported, without stopping the others.
+    assert code == 1
+    assert [result["name"] for result in results] == ["swing", "spin", "bad"]
+    assert results[2]["period"] is None and "length" in results[2]["error"]
+    nt.assert_allclose(results[0]["period"], sim.pendulumPeriod(2, 1, 0))
+    nt.assert_allclose(results[1]["energy"], sim.pendulumEnergy(1, 0, 10))
+
+    traj, header = storage.readTrajectory(results[1]["trajectory"])
+    assert len(traj) == results[1]["frames"]
+    assert header["engine"] == "verlet" and header["angularVelocity"] == 10
+
+
+def test_headless(tmp_path):
+    configs = tmp_path / "configs.jsonl"
+    configs.write_text('{"length": 1, "angle": 2}\n')
+
+    # Neither Qt nor matplotlib are imported when running a batch.
+    code = ("import sys, batch\n"
+            f"assert batch.main([{str(configs)!r}, '-w', '1']) == 0\n"
+            "assert not any(name.startswith(('PyQt5', 'matplotlib'))\n"
+            "               for name in sys.modules)\n")
+    subprocess.run([sys.executable, "-c", code], check = True,
+                   cwd = batch.__file__.rsplit("batch.py", 1)[0],
+                   stdout = subprocess.DEVNULL)
+
+
+def test_readConfigs(tmp_path):
+    configs = tmp_path / "configs.csv"
+    configs.write_text("name,maxFrames\nwhole,2000.0\n")
+    assert batch.readConfigs(str(configs))[0]["maxFrames"] == 2000
+
+    # Fractional frame counts are rejected rather than truncated.
+    configs = tmp_path / "configs.jsonl"
+    for line in ('{"maxFrames": 150.7}', '{"maxFrames": "many"}'):
+        configs.write_text(line + "\n")
+        with pytest.raises(ValueError, match = "maxFrames"):
+            batch.readConfigs(str(configs))
+
+    # Names can't leave the trajectory directory, or share a file.
+    config = dict(batch.FIELDS, name = "../up/../out")
+    assert batch.trajectoryName(config, 3) == "_up_.._out.traj"
+    assert batch.trajectoryName(dict(config, name = ".."), 3) == "3.traj"
+    configs.write_text('{"name": "a/b"}\n{"name": "A_B"}\n')
+    with pytest.raises(ValueError, match = "unique"):
+        batch.readConfigs(str(configs))
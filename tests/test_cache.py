@@ -0,0 +1,95 @@
+import numpy as np
+import os
+import numpy.testing as nt
+from Pendulum import Pendulum
+from cache import SimulationCache
+import cache as cacheModule
+import sim
+
+
+def test_simulate():
+    cache = SimulationCache()
+    pen = Pendulum(2, 1, 0.5)
+
+    traj = cache.simulate(pen, 0.01)
+    # The pendulum isn't moved, unlike with simulatePendulum.
+    assert pen.angle == 1
+    nt.assert_equal(traj.positions,
+                    sim.simulatePendulum(Pendulum(2, 1, 0.5), 0.01).positions)
+
+    assert cache.simulate(pen, 0.01) is traj
+    assert cache.hits == 1 and cache.misses == 1
+    # Anything which changes the result changes the key.
+    assert cache.simulate(pen, 0.01, engine = "exact") is not traj
+    assert cache.simulate(pen, 0.02) is not traj
+    assert cache.simulate(Pendulum(2, 1, 0.6), 0.01) is not traj
+    assert cache.misses == 4
+
+    # Cached trajectories are read only.
+    nt.assert_raises(ValueError, traj.angle.__setitem__, 0, 2)
+
+
+def test_maxBytes():
+    traj = sim.simulatePendulum(Pendulum(1, 1, 0))
+    cache = SimulationCache(maxBytes = 2 * traj.data.nbytes)
+
+    for angle in [1, 1.1, 1.2]:
+        cache.simulate(Pendulum(1, angle, 0))
+    # The least recently used trajectory is forgotten.
+    assert len(cache) == 2
+    assert cache.bytes <= cache.maxBytes
+    cache.simulate(Pendulum(1, 1.2, 0))
+    assert cache.hits == 1
+    cache.simulate(Pendulum(1, 1, 0))
+    assert cache.misses == 4
+
+    nt.assert_raises(ValueError, SimulationCache, -1)
+
+
+def test_directory(tmp_path):
+    pen = Pendulum(1, -np.pi / 2, 0, np.array([1, 2], dtype = 'float64'))
+    traj = SimulationCache(directory = str(tmp_path)).simulate(pen)
+
+    # A new cache, as in a new session, finds the saved trajectory.
+    cache = SimulationCache(directory = str(tmp_path))
+    loaded = cache.simulate(pen)
+    assert cache.hits == 1
+    nt.assert_equal(loaded.data, traj.data)
+    nt.assert_equal(loaded.pendCoor, [1, 2])
+
+    # Unreadable files are simulated again.
+    with open(cache.filePath(cache.makeKey(pen, 0.0125, -9.81, 2000, "rk4",
+                                           1e-6, 1e-9)), "wb") as file:
+        file.write(b"corrupt")
+    cache.clear()
+    nt.assert_equal(cache.simulate(pen).data, traj.data)
+    assert cache.misses == 1
+
+
+def test_maxDiskBytes(tmp_path, monkeypatch):
+    # Frames are limited so every file is the same size.
+    def filePath(cache, angle):
+        return cache.filePath(cache.makeKey(Pendulum(1, angle, 0), 0.0125,
+                                            -9.81, 100, "rk4", 1e-6, 1e-9))
+
+    cache = SimulationCache(directory = str(tmp_path))
+    for i, angle in enumerate([1, 1.1]):
+        cache.simulate(Pendulum(1, angle, 0), maxFrames = 100)
+        os.utime(filePath(cache, angle), (i, i))
+    size = os.path.getsize(filePath(cache, 1))
+
+    # Loading a trajectory from disk marks it as recently used, so the other
+    # is deleted to make space for a third.
+    cache = SimulationCache(directory = str(tmp_path),
+                            maxDiskBytes = 2.5 * size)
+    cache.simulate(Pendulum(1, 1, 0), maxFrames = 100)
+    cache.simulate(Pendulum(1, 1.2, 0), maxFrames = 100)
+    assert cache.hits == 1 and len(os.listdir(tmp_path)) == 2
+    assert not os.path.exists(filePath(cache, 1.1))
+
+    # Results saved by an older version aren't found.
+    monkeypatch.setattr(cacheModule, "CACHE_VERSION",
+                        cacheModule.CACHE_VERSION + 1)
+    cache = SimulationCache(directory = str(tmp_path))
+    cache.simulate(Pendulum(1, 1, 0), maxFrames = 100)
+    assert cache.misses == 1
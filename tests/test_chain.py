@@ -0,0 +1,53 @@
+import numpy as np
+import numpy.testing as nt
+from Chain import PendulumChain
+from Pendulum import Pendulum
+import Chain
+import sim
+
+
+def test_init():
+    chain = PendulumChain([1, 2, 0.5], [7, 0, -4], masses = [1, 2, 3])
+    assert len(chain) == 3
+    nt.assert_allclose(chain.angles, [7 - 2 * np.pi, 0, 2 * np.pi - 4])
+    nt.assert_equal(chain.angularVelocities, [0, 0, 0])
+
+    nt.assert_raises(ValueError, PendulumChain, [1, 0])
+    nt.assert_raises(ValueError, PendulumChain, [1, 1], [0, 1, 2])
+    nt.assert_raises(ValueError, PendulumChain, [1, 1], masses = [1, -1])
+    nt.assert_raises(ValueError, PendulumChain, 1)
+
+
+def test_positions():
+    chain = PendulumChain([1, 2], [np.pi / 2, np.pi], pendCoor = [1, 1])
+    nt.assert_allclose(chain.positions(), [[2, 1], [2, -1]], atol = 1e-12)
+    positions = chain.positions(np.zeros((5, 2)))
+    assert positions.shape == (5, 2, 2)
+    nt.assert_allclose(positions[:, 1], [[1, 4]] * 5)
+
+
+def test_simulateChains():
+    # A chain with one link is a simple pendulum.
+    traj = sim.simulatePendulum(Pendulum(1.5, 2, 0.5), maxFrames = 300)
+    for engine in Chain.CHAIN_ENGINES:
+        angles, angularVelocities = Chain.simulateChains(
+            [PendulumChain([1.5], [2], [0.5])], maxFrames = len(traj),
+            engine = engine)
+        nt.assert_allclose(angles[0, :, 0], traj.angle, atol = 1e-6)
+
+    # Energy is conserved by a chaotic double pendulum, and by every chain
+    # when they're simulated together.
+    chains = [PendulumChain([1, 0.5], [2.5, 2], masses = [1, 2]),
+              PendulumChain([1, 0.5], [0.3, -1], [1, 4])]
+    energy = [chain.energy() for chain in chains]
+    angles, angularVelocities = Chain.simulateChains(chains, maxFrames = 800)
+    assert angles.shape == (2, 800, 2)
+    for i, chain in enumerate(chains):
+        nt.assert_allclose(chain.energy(angles[i], angularVelocities[i]),
+                           energy[i], atol = 1e-6)
+        nt.assert_allclose(chain.energy(), energy[i], atol = 1e-6)
+
+    nt.assert_raises(ValueError, Chain.simulateChains,
+                     [PendulumChain([1]), PendulumChain([1, 1])])
+    nt.assert_raises(ValueError, Chain.simulateChains, [PendulumChain()],
+                     engine = "exact")
@@ -0,0 +1,109 @@
+import numpy as np
+import numpy.testing as nt
+from Pendulum import Pendulum
+import chaos
+import Chain
+import sim
+
+
+def test_dEDampedPendulum():
+    # Small swings about the stable equilibrium at pi decay as exp(-bt/2),
+    # oscillating at the damped frequency.
+    g, length, damping = -9.81, 1.5, np.array([0.1, 0.5, 2])
+    h, steps, swing = 0.005, 1000, 1e-4
+    state = np.array([np.full(3, np.pi + swing), np.zeros(3)])
+    for i in range(steps):
+        state = sim.RungeKuttaVector(chaos.dEDampedPendulum, i * h, state, h,
+                                     [g, length, damping])
+
+    t = steps * h
+    frequency = np.sqrt(-g / length - damping ** 2 / 4)
+    expected = swing * np.exp(-damping * t / 2) * (
+        np.cos(frequency * t) +
+        damping / (2 * frequency) * np.sin(frequency * t))
+    nt.assert_allclose(state[0] - np.pi, expected, rtol = 1e-5,
+                       atol = 1e-12)
+
+
+def test_simulateDriven():
+    # Without damping or driving it matches the rk4 engine.
+    traj = sim.simulatePendulum(Pendulum(1, 2, 0.5))
+    pen = Pendulum(1, 2, 0.5)
+    driven = chaos.simulateDriven(pen, maxFrames = len(traj))
+    nt.assert_allclose(driven.angle, traj.angle, atol = 1e-10)
+    nt.assert_allclose(driven.angularVelocity, traj.angularVelocity,
+                       atol = 1e-10)
+
+    # Damping only ever takes energy away.
+    pen = Pendulum(1, 2, 0.5)
+    damped = chaos.simulateDriven(pen, damping = 0.5)
+    energy = sim.pendulumEnergy(1, damped.angle, damped.angularVelocity)
+    assert np.all(np.diff(energy) < 0)
+    assert sim.pendulumEnergy(1, pen.angle, pen.angularVelocity) < energy[-1]
+
+    # A weak drive at the natural frequency resonates with the small swings.
+    pen = Pendulum(1, np.pi, 0)
+    driven = chaos.simulateDriven(pen, amplitude = 0.05,
+                                frequency = np.sqrt(9.81))
+    assert np.max(np.abs(np.pi - np.abs(driven.angle))) > 0.1
+
+    nt.assert_raises(ValueError, chaos.simulateDriven, Pendulum(1, 2, 0),
+                     damping = -1)
+
+
+def test_lyapunovExponents():
+    # Locked to the drive, then chaotic, for the classic driven pendulum
+    # scaled so its natural frequency is one rather than sqrt(9.81).
+    scale = np.sqrt(9.81)
+    amplitudes = np.array([0.9, 1.15]) * 9.81
+    exponents, standardErrors, convergence = chaos.drivenLyapunovExponents(
+        1, np.pi - 0.2, 0, 2 / 3 * scale, damping = 0.5 * scale,
+        amplitude = amplitudes, transient = 20, periods = 100)
+    # A stable periodic orbit shrinks every change at half the damping.
+    nt.assert_allclose(exponents[0], -0.25 * scale, 1e-2)
+    assert exponents[1] > 0.1 and np.all(standardErrors < 0.1)
+    assert convergence[0] < 0.01
+
+    # Finite differences along the tangent give the same exponents.
+    h = 2 * np.pi / (2 / 3 * scale) / 64
+    states = np.array([np.full(2, np.pi - 0.2), np.zeros(2)])
+    approximate = chaos.lyapunovExponents(
+        chaos.dEDrivenPendulum, states,
+        [-9.81, 1, 0.5 * scale, amplitudes, 2 / 3 * scale], h, 6400, 1280,
+        64)
+    nt.assert_allclose(approximate[0], exponents, atol = 1e-6)
+
+    # A transient which isn't a whole number of intervals doesn't bias the
+    # first interval averaged over.
+    misaligned = chaos.lyapunovExponents(
+        chaos.dEDrivenPendulum, states,
+        [-9.81, 1, 0.5 * scale, amplitudes, 2 / 3 * scale], h, 6400, 1285,
+        64, chaos.tangentDrivenPendulum)
+    nt.assert_allclose(misaligned[0][0], exponents[0], 1e-2)
+    assert misaligned[2][0] < 0.01
+
+    # Each pendulum steps through its own driving period, so a grid of
+    # frequencies gives the same exponents as one at a time.
+    frequencies = np.array([0.6, 2 / 3]) * scale
+    grid = chaos.drivenLyapunovExponents(
+        1, np.pi - 0.2, 0, frequencies, damping = 0.5 * scale,
+        amplitude = amplitudes[0], transient = 20, periods = 100)
+    for i, frequency in enumerate(frequencies):
+        single = chaos.drivenLyapunovExponents(
+            1, np.pi - 0.2, 0, frequency, damping = 0.5 * scale,
+            amplitude = amplitudes[0], transient = 20, periods = 100)
+        nt.assert_allclose(grid[0][i], single[0][0], 1e-10)
+
+    # A double pendulum making small swings isn't chaotic, while one
+    # released from high up is.
+    states = np.array([[[np.pi - 0.05, np.pi - 0.05], [1, 0.5]],
+                       np.zeros((2, 2))])
+    consts = Chain.chainConsts(np.ones((2, 2)), np.ones((2, 2)))
+    exponents, _, _ = chaos.lyapunovExponents(Chain.dEChain, states, consts,
+                                            steps = 3000)
+    assert abs(exponents[0]) < 0.1 and exponents[1] > 0.5
+
+    nt.assert_raises(ValueError, chaos.lyapunovExponents, Chain.dEChain,
+                     states, consts, steps = 5)
+    nt.assert_raises(ValueError, chaos.drivenLyapunovExponents, 1, 0, 0,
+                     [1, 0])
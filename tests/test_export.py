@@ -0,0 +1,66 @@
+import shutil
+import numpy as np
+import numpy.testing as nt
+import pytest
+from Pendulum import Pendulum
+import export
+import sim
+
+
+def test_render():
+    renderer = export.FrameRenderer(1, [0, 0], 120, 100)
+    frame = renderer.render(0, -1)
+
+    assert frame.shape == (100, 120, 3) and frame.dtype == np.uint8
+    # The mass hangs directly below the pivot, at the centre of the frame.
+    mass = renderer.toPixels(0, -1).astype(int)
+    nt.assert_equal(frame[mass[1], mass[0]], renderer.massColour)
+    nt.assert_equal(frame[50, 60], renderer.stringColour)
+    nt.assert_equal(frame[10, 10], renderer.background)
+
+    # The same buffer is reused, with the previous frame cleared.
+    assert renderer.render(1, 0) is frame
+    nt.assert_equal(frame[mass[1], mass[0]], renderer.background)
+    rows, cols = np.nonzero((frame != renderer.background).any(axis = 2))
+    assert rows.min() >= 44 and rows.max() <= 56 and cols.min() >= 59
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None,
+                    reason = "ffmpeg is not installed")
+def test_exportVideo(tmp_path):
+    traj = sim.simulatePendulum(Pendulum(1, 1, 0), 0.05)
+    calls = []
+    export.exportVideo(traj, str(tmp_path / "pendulum.mp4"), width = 64,
+                       height = 64, ffmpegPath = shutil.which("ffmpeg"),
+                       progress = lambda done, total: calls.append(done))
+
+    assert (tmp_path / "pendulum.mp4").stat().st_size > 0
+    assert calls == list(range(1, len(traj) + 1))
+
+    calls = []
+    export.exportVideo(traj, str(tmp_path / "parallel.mp4"), width = 64,
+                       height = 64, ffmpegPath = shutil.which("ffmpeg"),
+                       workers = 2, chunkSize = 8,
+                       progress = lambda done, total: calls.append(done))
+    assert (tmp_path / "parallel.mp4").stat().st_size > 0
+    assert calls[-1] == len(traj) and calls[0] == 8
+
+    with pytest.raises(ValueError):
+        export.exportVideo(traj.positions, str(tmp_path / "bad.mp4"))
+
+
+def test_renderChunks():
+    traj = sim.simulatePendulum(Pendulum(1, 2, 1), 0.05)
+    settings = (traj.length, traj.pendCoor, 48, 40)
+
+    serial = b"".join(bytes(pixels) for _, pixels in
+                      export.renderFrames(traj.positions, settings))
+    chunks = list(export.renderChunks(traj.positions, settings, 2, 5))
+    # Chunks come back in order, drawing exactly the same frames.
+    assert [count for count, _ in chunks[:-1]] == [5] * (len(chunks) - 1)
+    assert sum(count for count, _ in chunks) == len(traj)
+    assert b"".join(pixels for _, pixels in chunks) == serial
+
+    # However little memory is allowed, one chunk is always in flight.
+    limited = list(export.renderChunks(traj.positions, settings, 2, 5, 1))
+    assert b"".join(pixels for _, pixels in limited) == serial
@@ -0,0 +1,50 @@
+import subprocess
+import json
+import sys
+import os
+import pytest
+
+pytest.importorskip("PyQt5")
+
+# Run in a new process, so that nothing has been imported beforehand.
+STARTUP = """
+import time
+start = time.perf_counter()
+import sys
+from PyQt5.QtWidgets import QApplication
+app = QApplication(sys.argv)
+import gui
+window = gui.MainWindow()
+window.show()
+shown = time.perf_counter() - start
+heavy = [name for name in ("matplotlib", "numpy", "sim")
+         if name in sys.modules]
+
+# Everything else loads in the background, without the window being blocked.
+while ((window.canvas is None or not window.settingsRead) and
+       time.perf_counter() - start < 60):
+    app.processEvents()
+    time.sleep(0.001)
+# Nothing can be saved until something has been simulated.
+saveEnabled = window.ui.saveButton.isEnabled()
+window.close()
+print(json.dumps({"shown": shown, "target": gui.STARTUP_TARGET,
+                  "heavy": heavy, "ready": window.canvas is not None,
+                  "settingsRead": window.settingsRead,
+                  "saveEnabled": saveEnabled}))
+"""
+
+
+def test_startup(tmp_path):
+    env = dict(os.environ, QT_QPA_PLATFORM = "offscreen", HOME = str(tmp_path),
+               USERPROFILE = str(tmp_path))
+    result = subprocess.run(
+        [sys.executable, "-c", "import json\n" + STARTUP],
+        cwd = os.path.join(os.path.dirname(__file__), "..", "src"), env = env,
+        capture_output = True, text = True, timeout = 120, check = True)
+    startup = json.loads(result.stdout.splitlines()[-1])
+
+    assert startup["heavy"] == []
+    assert startup["shown"] < startup["target"]
+    assert startup["ready"] and startup["settingsRead"]
+    assert not startup["saveEnabled"]
@@ -0,0 +1,50 @@
+import numpy as np
+import numpy.testing as nt
+from playback import PlaybackClock
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_nextFrame():
+    time = FakeClock()
+    clock = PlaybackClock.fromInterval(10, 0.1, clock = time)
+    assert clock.duration == 1.0
+
+    frames = []
+    for now in [0, 0.05, 0.1, 0.45, 0.5, 1.05]:
+        time.now = now
+        frames.append(clock.nextFrame())
+    # Frames are picked by time, skipping any which were passed over, and
+    # looping round to the start.
+    assert frames == [0, 0, 1, 4, 5, 0]
+    assert clock.dropped == 2 + 4
+    assert clock.drawn == 5
+    nt.assert_allclose(clock.fps, 4 / 1.05)
+    assert str(clock) == "Frames Drawn: 5, Frames Dropped: 6, FPS: 3.8."
+
+
+def test_pause():
+    time = FakeClock()
+    clock = PlaybackClock(np.array([0, 0.5, 1.5]), loop = False,
+                          clock = time)
+    time.now = 0.6
+    assert clock.nextFrame() == 1
+    clock.pause()
+    time.now = 5
+    assert clock.nextFrame() == 1 and clock.elapsed == 0.6
+    clock.resume()
+    time.now = 6
+    assert clock.nextFrame() == 2
+    # Without looping, the last frame is held.
+    time.now = 100
+    assert clock.nextFrame() == 2
+
+    clock.start()
+    assert clock.drawn == 0 and clock.nextFrame() == 0
+    nt.assert_raises(ValueError, PlaybackClock, [])
@@ -0,0 +1,390 @@
+import threading
+import numpy as np
+import numpy.testing as nt
+from Pendulum import Pendulum
+import sim
+
+
+def test_normaliseAngles():
+    angles = np.array([np.pi / 3, -3 * np.pi / 4, -np.pi, np.pi,
+                       7 * np.pi / 3, -24 * np.pi / 5])
+    expected = [Pendulum(angle = a).angle for a in angles]
+    nt.assert_allclose(sim.normaliseAngles(angles), expected, 1e-10)
+
+
+def test_simulatePendulum():
+    pen = Pendulum(2, np.pi / 3, 0, np.array([1, 1], dtype = 'float64'))
+    traj = sim.simulatePendulum(pen, 0.01)
+
+    nt.assert_allclose(traj.t, np.arange(len(traj)) * 0.01, 1e-10)
+    nt.assert_allclose(traj.angle[0], np.pi / 3, 1e-10)
+    nt.assert_allclose(traj.x, 2 * np.sin(traj.angle) + 1, 1e-10)
+    # One period should end close to where it started.
+    nt.assert_allclose(traj.positions[-1], traj.positions[0], atol = 0.05)
+
+    nt.assert_raises(ValueError, sim.simulatePendulum, "pendulum")
+    nt.assert_raises(ValueError, sim.simulatePendulum, pen, 0.2)
+    nt.assert_raises(ValueError, sim.simulatePendulum, pen, maxFrames = 0)
+
+
+def test_simulateEnsemble():
+    lengths = np.array([1, 2, 0.5, 3, 1, 1])
+    angles = np.array([-np.pi / 2, 0.3, 2.5, -1, np.pi, 0])
+    angularVelocities = np.array([0, 0, 1, 8, 2, 0])
+    pendCoors = np.array([[0, 0], [1, 2], [-1, 0], [0, 3], [0, 0], [2, 2]])
+
+    positions, frameCounts = sim.simulateEnsemble(
+        lengths, angles, angularVelocities, pendCoors)
+
+    # Each member of the ensemble should match a separate simulation.
+    for i in range(len(lengths)):
+        pen = Pendulum(lengths[i], angles[i], angularVelocities[i],
+                       pendCoors[i])
+        pos = sim.simulatePendulum(pen).positions
+        assert frameCounts[i] == len(pos)
+        nt.assert_allclose(positions[i, :frameCounts[i]], pos, 1e-10)
+        assert np.all(np.isnan(positions[i, frameCounts[i]:]))
+
+    # A pendulum at rest at an equilibrium has only one frame.
+    assert frameCounts[-1] == 1
+
+    nt.assert_raises(ValueError, sim.simulateEnsemble, [1, 0], 0, 0)
+    nt.assert_raises(ValueError, sim.simulateEnsemble, 1, [0, 1], 0,
+                     intervalTime = 0.2)
+
+
+def test_iterSimulation():
+    pen = Pendulum(1, 1, 0.5)
+    traj = sim.simulatePendulum(Pendulum(1, 1, 0.5), maxFrames = 300)
+    chunks = sim.iterSimulation(pen, chunkSize = 64)
+
+    angles = np.concatenate([next(chunks).angle for _ in range(4)])
+    last = next(chunks)
+    assert len(last) == 64
+    nt.assert_allclose(last.t[0], 4 * 64 * 0.0125, 1e-10)
+    # The pendulum being simulated isn't changed.
+    assert pen.angle == 1
+    nt.assert_allclose(angles[:len(traj)], traj.angle, atol = 1e-10)
+
+
+def test_DormandPrince():
+    def growth(t, state, consts):
+        return consts[0] * state
+
+    state = np.array([1.0, 2.0])
+    newState, error, ks = sim.DormandPrince(growth, 0, state, 0.1, [0.5])
+    nt.assert_allclose(newState, state * np.exp(0.05), 1e-9)
+    assert np.all(np.abs(error) < 1e-8)
+
+    # Dense output matches both ends of the step, and is accurate within it.
+    nt.assert_allclose(sim.denseOutput(state, 0.1, ks, 0), state, 1e-12)
+    nt.assert_allclose(sim.denseOutput(state, 0.1, ks, 1), newState, 1e-12)
+    nt.assert_allclose(sim.denseOutput(state, 0.1, ks, 0.3),
+                       state * np.exp(0.015), 1e-8)
+
+
+def test_engines():
+    for angle in [-np.pi / 2, 3, 0.3]:
+        rk4 = sim.simulatePendulum(Pendulum(1, angle, 0), maxFrames = 5000)
+        rk45 = sim.simulatePendulum(Pendulum(1, angle, 0), maxFrames = 5000,
+                                    engine = "rk45", rtol = 1e-8,
+                                    atol = 1e-10)
+        assert len(rk4) == len(rk45)
+        nt.assert_allclose(rk45.angle, rk4.angle, atol = 1e-5)
+
+    nt.assert_raises(ValueError, sim.simulatePendulum, Pendulum(),
+                     engine = "euler")
+
+
+def test_symplectic():
+    def maxEnergyError(engine, steps = 5000, h = 0.1):
+        angle, angularVelocity = -np.pi / 2, 0
+        energy = sim.pendulumEnergy(1, angle, angularVelocity)
+        errors = []
+        for _ in range(steps):
+            angle, angularVelocity = sim.stepPendulum(
+                engine, h, angle, angularVelocity, [-9.81, 1])
+            errors.append(sim.pendulumEnergy(1, angle, angularVelocity) -
+                          energy)
+        return np.max(np.abs(errors))
+
+    # Runge Kutta drifts at large steps, symplectic engines stay bounded.
+    assert maxEnergyError("rk4", 20000) > 1
+    assert maxEnergyError("verlet", 20000) < 0.3
+    assert maxEnergyError("yoshida", 20000) < 0.01
+
+    for engine in ["verlet", "yoshida"]:
+        traj = sim.simulatePendulum(Pendulum(1, 0.5, 0), engine = engine)
+        rk4 = sim.simulatePendulum(Pendulum(1, 0.5, 0))
+        assert abs(len(traj) - len(rk4)) <= 1
+        positions, frameCounts = sim.simulateEnsemble(
+            [1, 2], [0.5, 1], 0, engine = engine)
+        assert frameCounts[0] == len(traj)
+        nt.assert_allclose(positions[0, :len(traj)], traj.positions, 1e-10)
+
+    nt.assert_raises(ValueError, sim.simulateEnsemble, 1, 1, 0,
+                     engine = "rk45")
+
+
+def test_pendulumPeriod():
+    nt.assert_allclose(sim.ellipticK(0), np.pi / 2, 1e-12)
+    nt.assert_allclose(sim.ellipticK(0.5), 1.8540746773013719, 1e-12)
+    assert sim.ellipticK(1) == np.inf
+
+    # Small swings have the small angle period, and g's sign decides which
+    # equilibrium is stable.
+    nt.assert_allclose(sim.pendulumPeriod(2, np.pi - 1e-4, 0),
+                       2 * np.pi * np.sqrt(2 / 9.81), 1e-7)
+    nt.assert_allclose(sim.pendulumPeriod(2, 1e-4, 0, 9.81),
+                       2 * np.pi * np.sqrt(2 / 9.81), 1e-7)
+    # Released from horizontal, the period is 4K(1/2) / sqrt(g/L).
+    nt.assert_allclose(sim.pendulumPeriod(1, -np.pi / 2, 0),
+                       4 * 1.8540746773013719 / np.sqrt(9.81), 1e-12)
+    # Without gravity the pendulum spins at a constant rate.
+    nt.assert_allclose(sim.pendulumPeriod(1, 1, 2, 0), np.pi, 1e-12)
+    # On the separatrix the period is infinite.
+    assert sim.pendulumPeriod(1, np.pi, 2 * np.sqrt(9.81)) == np.inf
+
+    def measuredPeriod(angle, angularVelocity, h = 1e-4):
+        # Steps until the pendulum has gone round once, or has turned back
+        # twice.
+        state = (angle, angularVelocity)
+        t = 0
+        turns = 0
+        while np.abs(state[0] - angle) < 2 * np.pi and turns < 3:
+            old = state
+            state = sim.stepPendulum("rk4", h, *state, [-9.81, 1])
+            turns += (old[1] <= 0) != (state[1] <= 0)
+            t += h
+        return t
+
+    nt.assert_allclose(sim.pendulumPeriod(1, np.pi, 8),
+                       measuredPeriod(np.pi, 8), 1e-3)
+    nt.assert_allclose(sim.pendulumPeriod(1, 0.5, 0), measuredPeriod(0.5, 0),
+                       1e-3)
+
+    # simulatePendulum covers one period, excluding its end.
+    traj = sim.simulatePendulum(Pendulum(1, 0.5, 0))
+    assert len(traj) == np.ceil(sim.pendulumPeriod(1, 0.5, 0) / 0.0125)
+    assert len(sim.simulatePendulum(Pendulum(1, np.pi, 0))) == 1
+    assert len(sim.simulatePendulum(Pendulum(1, np.pi, 2 * np.sqrt(9.81)),
+                                    maxFrames = 300)) == 300
+
+
+def test_jacobiElliptic():
+    u = np.linspace(-10, 10, 41)
+    for m in [0, 0.5, 0.99]:
+        sn, cn, dn = sim.jacobiElliptic(u, m)
+        nt.assert_allclose(sn ** 2 + cn ** 2, 1, 1e-12)
+        nt.assert_allclose(dn ** 2 + m * sn ** 2, 1, 1e-12)
+        # sn reaches one at a quarter period, and F inverts the amplitude.
+        nt.assert_allclose(sim.jacobiElliptic(sim.ellipticK(m), m)[0], 1,
+                           1e-12)
+        phi = np.linspace(-1.5, 1.5, 7)
+        nt.assert_allclose(sim.jacobiElliptic(sim.ellipticF(phi, m), m)[0],
+                           np.sin(phi), atol = 1e-12)
+
+    nt.assert_allclose(sim.jacobiElliptic(u, 0)[0], np.sin(u), atol = 1e-12)
+    nt.assert_allclose(sim.jacobiElliptic(u, 1)[0], np.tanh(u), 1e-12)
+    nt.assert_allclose(sim.ellipticF(np.pi / 2, 0.5), sim.ellipticK(0.5),
+                       1e-12)
+
+
+def test_exactEngine():
+    # Swinging, near the top, completing circles in both directions, with g
+    # either way round, and without gravity.
+    cases = [(1, -np.pi / 2, 0, -9.81), (1, 0.3, 0, -9.81),
+             (2, 3, 1, -9.81), (1, np.pi, 8, -9.81), (1, np.pi, -8, -9.81),
+             (1, 0.5, -7, 9.81), (1, 2, 3, 0)]
+    for length, angle, angularVelocity, g in cases:
+        rk4 = sim.simulatePendulum(Pendulum(length, angle, angularVelocity),
+                                   0.001, g, 20000)
+        exact = sim.simulatePendulum(
+            Pendulum(length, angle, angularVelocity), 0.001, g, 20000,
+            engine = "exact")
+        assert len(rk4) == len(exact)
+        nt.assert_allclose(sim.normaliseAngles(rk4.angle - exact.angle), 0,
+                           atol = 1e-9)
+        nt.assert_allclose(rk4.angularVelocity, exact.angularVelocity,
+                           atol = 1e-9)
+
+    # Any frame can be found directly.
+    angles, angularVelocities = sim.exactPendulum(1, 1, 0, [0, 1e4])
+    nt.assert_allclose(angles[0], 1, 1e-12)
+    nt.assert_allclose(angularVelocities[0], 0, atol = 1e-12)
+    nt.assert_allclose(sim.pendulumEnergy(1, angles, angularVelocities),
+                       sim.pendulumEnergy(1, 1, 0), 1e-9)
+
+
+def test_symmetric():
+    for angle, g in [(-np.pi / 2, -9.81), (0.3, -9.81), (1, 9.81)]:
+        full = sim.simulatePendulum(Pendulum(1, angle, 0), g = g)
+        mirrored = sim.simulatePendulum(Pendulum(1, angle, 0), g = g,
+                                        symmetric = True)
+        assert len(full) == len(mirrored)
+        nt.assert_allclose(sim.normaliseAngles(full.angle - mirrored.angle),
+                           0, atol = 1e-6)
+        nt.assert_allclose(full.angularVelocity, mirrored.angularVelocity,
+                           atol = 1e-6)
+        # The first quarter is integrated the same way as the full run.
+        quarter = len(full) // 4
+        nt.assert_allclose(mirrored.angle[:quarter], full.angle[:quarter],
+                           atol = 1e-12)
+
+    # Rotating, or not released from rest, falls back to full integration.
+    assert not sim.isMirrorable(1, np.pi, 8, -9.81)
+    assert not sim.isMirrorable(1, 1, 0.5, -9.81)
+    assert not sim.isMirrorable(1, np.pi, 0, -9.81)
+    nt.assert_equal(
+        sim.simulatePendulum(Pendulum(1, 1, 0.5), symmetric = True).positions,
+        sim.simulatePendulum(Pendulum(1, 1, 0.5)).positions)
+
+
+def test_resample():
+    exact = sim.simulatePendulum(Pendulum(1, 2, 0), fps = 30,
+                                 engine = "exact")
+    # Integrating finely, or coarsely, both give 30 frames a second.
+    for dt, tolerance in [(0.001, 1e-10), (0.05, 1e-4)]:
+        traj = sim.simulatePendulum(Pendulum(1, 2, 0), dt = dt, fps = 30)
+        assert len(traj) == len(exact)
+        nt.assert_allclose(traj.t, np.arange(len(traj)) / 30)
+        nt.assert_allclose(sim.normaliseAngles(traj.angle - exact.angle), 0,
+                           atol = tolerance)
+
+    # Frames landing on integration steps are the steps themselves.
+    nt.assert_equal(
+        sim.simulatePendulum(Pendulum(1, 2, 0), dt = 0.005, fps = 100,
+                             engine = "verlet").angle,
+        sim.simulatePendulum(Pendulum(1, 2, 0), 0.005,
+                             engine = "verlet").angle[::2])
+    nt.assert_raises(ValueError, sim.simulatePendulum, Pendulum(), fps = 0)
+
+
+def test_hermiteInterpolate():
+    h = 0.1
+    t = np.arange(11) * h
+    query = np.linspace(0, 1, 37)
+    nt.assert_allclose(sim.hermiteInterpolate(h, np.sin(t), np.cos(t), query),
+                       np.sin(query), atol = 1e-6)
+    # Samples are returned as they are.
+    nt.assert_allclose(sim.hermiteInterpolate(h, t ** 2, 2 * t, t), t ** 2,
+                       1e-12)
+
+
+def test_progress():
+    calls = []
+    traj = sim.simulatePendulum(
+        Pendulum(1, 0.3, 0), progress = lambda done, total: calls.append(
+            (done, total)))
+    assert calls[-1] == (len(traj) + 1, len(traj) + 1)
+    assert len(calls) == np.ceil((len(traj) + 1) / sim.PROGRESS_FRAMES)
+
+    cancel = threading.Event()
+    cancel.set()
+    nt.assert_raises(sim.SimulationCancelled, sim.simulatePendulum,
+                     Pendulum(1, 0.3, 0), cancel = cancel)
+    nt.assert_raises(sim.SimulationCancelled, sim.simulatePendulum,
+                     Pendulum(1, 0.3, 0), symmetric = True, cancel = cancel)
+
+
+def test_stats():
+    stats = sim.SimulationStats()
+    traj = sim.simulatePendulum(Pendulum(1, 2, 0), stats = stats)
+    assert stats.steps == len(traj) and stats.rhsEvaluations == 4 * len(traj)
+    assert stats.frames == len(traj) and stats.termination == "period"
+    assert set(stats.phases) == {"termination", "integration",
+                                 "normalisation", "conversion", "diagnostics"}
+    assert 0 < stats.maxEnergyDrift < 1e-6
+
+    # Adaptive engines count their rejected steps too, and the first stage of
+    # each step is reused from the previous one.
+    stats = sim.SimulationStats()
+    sim.simulatePendulum(Pendulum(1, 2, 0), engine = "rk45", stats = stats)
+    assert stats.rhsEvaluations == 2 + 6 * stats.steps
+    assert stats.steps < len(traj) / 2
+
+    # Each way a simulation can stop, reported to any hooks.
+    reports = []
+    sim.statsHooks.append(reports.append)
+    try:
+        sim.simulatePendulum(Pendulum(1, np.pi, 0))
+        sim.simulatePendulum(Pendulum(1, np.pi, 2 * np.sqrt(9.81)))
+        sim.simulatePendulum(Pendulum(1, 0.001, 0), maxFrames = 100)
+    finally:
+        sim.statsHooks.remove(reports.append)
+    assert [stats.termination for stats in reports] == [
+        "static", "infinitePeriod", "maxFrames"]
+    assert reports[2].asDict()["frames"] == 100
+
+
+def test_RungeKuttaVector():
+    consts = [-9.81, 1.5]
+    angles = np.array([0.3, 2, -1, np.pi])
+    angularVelocities = np.array([0, 1, -2, 5])
+
+    # Stepping many pendulums at once matches stepping each with RungeKutta.
+    state = np.array([angles, angularVelocities])
+    for _ in range(100):
+        state = sim.RungeKuttaVector(sim.dESimplePendulum, 0, state, 0.0125,
+                                     consts)
+    for i in range(len(angles)):
+        angle, angularVelocity = angles[i], angularVelocities[i]
+        for _ in range(100):
+            angle, angularVelocity = sim.RungeKutta(
+                sim.dESimplePendulumAngularVelocity,
+                sim.dESimplePendulumAngle, 0.0125, angle, angularVelocity,
+                consts)
+        nt.assert_allclose(state[:, i], [angle, angularVelocity], 1e-12)
+
+
+def test_events():
+    # Released from rest, a swing crosses the bottom a quarter of the way
+    # through its period, and turns back half way.
+    period = sim.pendulumPeriod(1, 2, 0)
+    events = [sim.turningPoint(), sim.angleCrossing(np.pi, direction = 1)]
+    traj = sim.simulatePendulum(Pendulum(1, 2, 0), engine = "exact",
+                                events = events)
+    assert [event["name"] for event in traj.events] == [
+        "angleCrossing 3.141592653589793", "turningPoint", "turningPoint"]
+    nt.assert_allclose([event["t"] for event in traj.events],
+                       np.array([0.25, 0.5, 1]) * period, 1e-9)
+    nt.assert_allclose(traj.events[1]["angle"], -2, 1e-9)
+
+    # A terminal event stops the simulation, leaving the pendulum where the
+    # event happened.
+    pen = Pendulum(1, 2, 0)
+    stats = sim.SimulationStats()
+    traj = sim.simulatePendulum(
+        pen, stats = stats,
+        events = [sim.turningPoint(terminal = True), sim.angleCrossing(3)])
+    assert stats.termination == "event" and len(traj.events) == 2
+    assert traj.t[-1] < traj.events[-1]["t"] < traj.t[-1] + 0.0125
+    nt.assert_allclose(traj.events[-1]["t"], period / 2, 1e-7)
+    nt.assert_allclose([pen.angle, pen.angularVelocity],
+                       [-2, 0], atol = 1e-7)
+
+    # Roots are refined on each engine's own solution within a step, rather
+    # than between frames, so long frames don't make them less accurate.
+    for engine, tolerance in (("exact", 1e-12), ("rk45", 1e-9)):
+        traj = sim.simulatePendulum(
+            Pendulum(1, 2, 0), intervalTime = 0.05, engine = engine,
+            rtol = 1e-10, atol = 1e-12,
+            events = [sim.turningPoint(terminal = True)])
+        nt.assert_allclose(traj.events[-1]["t"], period / 2,
+                           atol = tolerance)
+
+    # Nothing after a terminal event is integrated.
+    stats = sim.SimulationStats()
+    traj = sim.simulatePendulum(Pendulum(1, 2, 0), intervalTime = 0.05,
+                                stats = stats,
+                                events = [sim.turningPoint(terminal = True)])
+    assert stats.steps == len(traj) == np.ceil(period / 2 / 0.05)
+
+    # Angles are crossed going round and round too, including where they
+    # wrap from pi to -pi.
+    traj = sim.simulatePendulum(Pendulum(1, np.pi, 10),
+                                events = [sim.angleCrossing(0)])
+    nt.assert_allclose([event["t"] for event in traj.events],
+                       sim.pendulumPeriod(1, np.pi, 10) / 2, 1e-7)
+
+    nt.assert_raises(ValueError, sim.turningPoint, direction = 2)
@@ -0,0 +1,88 @@
+import numpy as np
+import numpy.testing as nt
+import pytest
+from Trajectory import Trajectory
+from Pendulum import Pendulum
+import storage
+import sim
+
+
+def test_roundTrip(tmp_path):
+    filename = str(tmp_path / "run.traj")
+    pen = Pendulum(2, 1, 0.5, [1, 2])
+    chunks = sim.iterSimulation(pen, chunkSize = 100, engine = "verlet")
+
+    with storage.TrajectoryWriter(filename, pen, dt = 0.0125,
+                                  engine = "verlet") as writer:
+        first = next(chunks)
+        writer.write(first)
+    # Appending keeps the original header.
+    with storage.TrajectoryWriter(filename, append = True) as writer:
+        second = next(chunks)
+        writer.write(second)
+
+    traj, header = storage.readTrajectory(filename)
+    assert len(traj) == 200 and isinstance(traj.data, np.memmap)
+    assert header["engine"] == "verlet" and header["angle"] == 1
+    nt.assert_equal(traj.angle[:100], first.angle)
+    nt.assert_equal(traj.t[100:], second.t)
+    nt.assert_equal(traj.positions[100:], second.positions)
+    nt.assert_equal(traj.pendCoor, [1, 2])
+
+    # Columns can be read across appends, without reading the others.
+    nt.assert_equal(storage.readColumn(filename, "angle", 50, 150),
+                    traj.angle[50:150])
+    nt.assert_equal(storage.readColumn(filename, "t"), traj.t)
+    with pytest.raises(ValueError):
+        storage.readColumn(filename, "energy")
+
+
+def test_streamed(tmp_path):
+    filename = str(tmp_path / "run.traj")
+    traj = sim.simulatePendulum(Pendulum(1, 2, 0))
+    with storage.TrajectoryWriter(filename, Pendulum(1, 2, 0),
+                                  capacity = 64) as writer:
+        for start in range(0, len(traj), 10):
+            chunk = Trajectory()
+            chunk.extend(traj.t[start:start + 10],
+                         traj.angle[start:start + 10],
+                         traj.angularVelocity[start:start + 10])
+            writer.write(chunk)
+            # Frames can be read as soon as they're written.
+            if start == 70:
+                writer.flush()
+                assert len(storage.readTrajectory(filename)[0]) == 80
+
+    # The columns are moved apart as the file grows, so however many pieces
+    # it was written in, it's still memory mapped as a whole.
+    read, header = storage.readTrajectory(filename)
+    assert header["capacity"] >= len(traj) and header["capacity"] % 64 == 0
+    assert isinstance(read.data, np.memmap)
+    nt.assert_equal(read.angle, traj.angle)
+    nt.assert_equal(read.positions, traj.positions)
+
+
+def test_float32(tmp_path):
+    filename = str(tmp_path / "run.traj")
+    traj = sim.simulatePendulum(Pendulum(1, 2, 0))
+    with storage.TrajectoryWriter(filename, Pendulum(1, 2, 0),
+                                  dtype = "float32") as writer:
+        writer.write(traj)
+        # Frames which were only partly written aren't counted.
+        writer.file.seek(writer.columnOffset(0) + len(traj) * 4)
+        writer.file.write(b"\1" * 100)
+
+    read, header = storage.readTrajectory(filename)
+    assert read.data.dtype == np.float32 and len(read) == len(traj)
+    nt.assert_allclose(read.angle, traj.angle, rtol = 1e-6)
+
+    # Files without any frames can still be read.
+    storage.TrajectoryWriter(filename, Pendulum()).close()
+    assert len(storage.readTrajectory(filename)[0]) == 0
+
+    with pytest.raises(ValueError):
+        storage.TrajectoryWriter(filename, Pendulum(), dtype = "int8")
+    with open(filename, "wb") as file:
+        file.write(b"not a trajectory")
+    with pytest.raises(ValueError):
+        storage.readTrajectory(filename)
@@ -0,0 +1,87 @@
+import threading
+import numpy as np
+import numpy.testing as nt
+import chaos
+import sim
+import sweep
+
+
+def test_sweepPendulums():
+    angles = [np.pi - 0.1, np.pi / 2, 0.2]
+    angularVelocities = [0, 1, 9]
+    lengths = [1, 2]
+    calls = []
+
+    periods, amplitudes = sweep.sweepPendulums(
+        angles, angularVelocities, lengths, workers = 2, chunkSize = 4,
+        progress = lambda done, total: calls.append((done, total)))
+
+    assert periods.shape == (3, 3, 2)
+    assert calls[-1] == (18, 18)
+    nt.assert_allclose(periods[1, 1, 0],
+                       sim.pendulumPeriod(1, np.pi / 2, 1), 1e-12)
+    # Small swings barely move from where they started, while fast
+    # pendulums go all the way round.
+    nt.assert_allclose(amplitudes[0, 0], 0.1, 1e-3)
+    assert np.all(amplitudes[:, 2] > 3)
+
+    # The same results without a process pool.
+    serial = sweep.sweepPendulums(angles, angularVelocities, lengths,
+                                  workers = 1)
+    nt.assert_equal(serial[0], periods)
+    nt.assert_equal(serial[1], amplitudes)
+
+    # Engines which can't simulate a chunk together give the same results.
+    exact = sweep.sweepPendulums(angles, angularVelocities, lengths,
+                                 engine = "exact", workers = 1)
+    nt.assert_equal(exact[0], periods)
+    nt.assert_allclose(exact[1], amplitudes, atol = 1e-6)
+
+
+def test_cancel():
+    cancel = threading.Event()
+    cancel.set()
+    nt.assert_raises(sim.SimulationCancelled, sweep.sweepPendulums,
+                     [0.1, 0.2], [0, 1], [1], workers = 1, chunkSize = 1,
+                     cancel = cancel)
+    # Nothing is left attached to the shared memory of the cancelled sweep.
+    assert sweep.workerState == {}
+    nt.assert_raises(ValueError, sweep.sweepPendulums, [0.1], [0], [0])
+
+
+def test_bifurcationDiagram():
+    # The classic route to chaos, scaled so the natural frequency is one
+    # rather than sqrt(9.81).
+    scale = np.sqrt(9.81)
+    amplitudes = np.array([0.9, 1.07, 1.15]) * 9.81
+    settings = dict(angle = np.pi - 0.2, frequency = 2 / 3 * scale,
+                    damping = 0.5 * scale, transient = 50, samples = 16)
+    calls = []
+
+    points = sweep.bifurcationDiagram(
+        amplitudes, workers = 2, chunkSize = 2,
+        progress = lambda done, total: calls.append((done, total)),
+        **settings)
+
+    assert points.shape == (3 * 16, 3) and calls[-1] == (3, 3)
+    nt.assert_equal(points[:, 0], np.repeat(amplitudes, 16))
+    # One distinct point once the pendulum is locked to the drive, then two
+    # after the period doubles, and then many once it's chaotic.
+    distinct = [len(np.unique(np.round(points[i * 16:(i + 1) * 16, 1], 6)))
+                for i in range(3)]
+    assert distinct[:2] == [1, 2] and distinct[2] > 8
+
+    # The same samples without a process pool, and by stepping each
+    # pendulum on its own.
+    serial = sweep.bifurcationDiagram(amplitudes, workers = 1, **settings)
+    nt.assert_equal(serial, points)
+    angles, angularVelocities = chaos.poincareSection(
+        1, np.pi - 0.2, 0, 2 / 3 * scale, damping = 0.5 * scale,
+        amplitude = amplitudes[1], transient = 50, samples = 16)
+    nt.assert_allclose(points[16:32, 1:], np.c_[angles, angularVelocities],
+                       atol = 1e-9)
+
+    nt.assert_raises(ValueError, sweep.bifurcationDiagram, [1],
+                     parameter = "g")
+    nt.assert_raises(ValueError, sweep.bifurcationDiagram, [1],
+                     frequency = 0)
@@ -0,0 +1,34 @@
+import numpy as np
+import numpy.testing as nt
+from Trajectory import Trajectory
+
+
+def test_append():
+    traj = Trajectory(2, np.array([1, -1], dtype = 'float64'), capacity = 2)
+    angles = np.linspace(-np.pi, np.pi, 5)
+    for i, angle in enumerate(angles):
+        traj.append(i * 0.5, angle, -angle)
+
+    # Capacity doubles whenever it is reached.
+    assert len(traj) == 5
+    assert traj.capacity == 8
+    nt.assert_equal(traj.t, np.arange(5) * 0.5)
+    nt.assert_equal(traj.angle, angles)
+    nt.assert_equal(traj.angularVelocity, -angles)
+    nt.assert_allclose(traj.x, 2 * np.sin(angles) + 1, 1e-10)
+    nt.assert_allclose(traj.y, 2 * np.cos(angles) - 1, 1e-10)
+
+
+def test_views():
+    traj = Trajectory(capacity = 4)
+    traj.extend(np.arange(3), [0, 1, 2], [3, 4, 5])
+
+    # Columns are views of the same preallocated block.
+    assert np.shares_memory(traj.positions, traj.data)
+    assert np.shares_memory(traj.x, traj.data)
+    assert traj.positions.shape == (3, 2)
+    nt.assert_equal(traj.positions[:, 0], traj.x)
+
+    # Positions of frames added later are calculated when next read.
+    traj.extend([3, 4], [np.pi, 0], [0, 0])
+    nt.assert_allclose(traj.y, np.cos([0, 1, 2, np.pi, 0]), 1e-10)